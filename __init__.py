@@ -60,7 +60,8 @@ class GlobalUpdateSettings(bpy.types.PropertyGroup):
 class DeveloperSettings(bpy.types.PropertyGroup):
     printUpdateTime = BoolProperty(default = False, name = "Print Global Update Time")
     printGenerationTime = BoolProperty(default = False, name = "Print Script Generation Time")
-    executionProfiling = BoolProperty(default = False, name = "Node Execution Profiling", update = nodeTreeChanged)
+    printUnitExecutionTimes = BoolProperty(default = False, name = "Print Unit Execution Times", description = "Print the execution time of every unit after each update")
+    executionProfiling = BoolProperty(default = False, name = "Node Execution Profiling", description = "Record time, calls and output size of every node in the last updates", update = nodeTreeChanged)
 
 class Keyframes(bpy.types.PropertyGroup):
     name = StringProperty(default = "", name = "Keyframe Name")
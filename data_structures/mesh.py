@@ -1,18 +1,81 @@
 import bpy, bmesh
 from mathutils import Vector
 from .. mn_utils import *
+from .. utils.mn_mesh_utils import *
 
+# the data can either be stored in lists of vectors and index tuples or in flat arrays,
+# the arrays are converted to lists the first time they are accessed, because then
+# they may be changed, so copies of array-backed mesh data can share the arrays
 class MeshData:
     def __init__(self,
                 vertices = [],
                 edges = [],
                 polygons = []):
-        self.vertices = vertices
-        self.edges = edges
-        self.polygons = polygons
+        self._vertices = vertices
+        self._edges = edges
+        self._polygons = polygons
+        self.locationArray = None
+        self.edgeArray = None
+        self.polygonArrays = None
         
+    @classmethod
+    def fromArrays(cls, locationArray, edgeArray, polygonArrays):
+        meshData = cls(None, None, None)
+        meshData.locationArray = locationArray
+        meshData.edgeArray = edgeArray
+        meshData.polygonArrays = polygonArrays
+        return meshData
+        
+    @property
+    def vertices(self):
+        if self._vertices is None:
+            self._vertices = vectorsFromArray(self.locationArray)
+            self.locationArray = None
+        return self._vertices
+    @vertices.setter
+    def vertices(self, vertices):
+        self._vertices = vertices
+        self.locationArray = None
+        
+    @property
+    def edges(self):
+        if self._edges is None:
+            self._edges = tuplesFromArray(self.edgeArray, 2)
+            self.edgeArray = None
+        return self._edges
+    @edges.setter
+    def edges(self, edges):
+        self._edges = edges
+        self.edgeArray = None
+        
+    @property
+    def polygons(self):
+        if self._polygons is None:
+            self._polygons = polygonIndicesFromLoopArrays(*self.polygonArrays)
+            self.polygonArrays = None
+        return self._polygons
+    @polygons.setter
+    def polygons(self, polygons):
+        self._polygons = polygons
+        self.polygonArrays = None
+        
+    def getLocationArray(self):
+        if self.locationArray is not None: return self.locationArray
+        return arrayFromVectors(self._vertices)
+    def getEdgeArray(self):
+        if self.edgeArray is not None: return self.edgeArray
+        return arrayFromTuples(self._edges)
+    def getPolygonArrays(self):
+        if self.polygonArrays is not None: return self.polygonArrays
+        return loopArraysFromPolygonIndices(self._polygons)
+        
+    def getVertexAmount(self):
+        if self.locationArray is not None: return len(self.locationArray) // 3
+        return len(self._vertices)
+        
+    # arrays are never changed, so they can be shared with the copy
     def copy(self):
-        return MeshData(self.getVerticesCopy(), self.getEdgesCopy(), self.getPolygonsCopy())
+        return MeshData.fromArrays(self.getLocationArray(), self.getEdgeArray(), self.getPolygonArrays())
 
     def getVerticesCopy(self):
         return [vertex.copy() for vertex in self.vertices]
@@ -190,6 +190,7 @@ class MeshMenu(bpy.types.Menu):
         layout.separator()                                    
         insertNode(layout, "mn_CreateMeshFromData", "Mesh from Data")                                   
         insertNode(layout, "mn_SetMeshOnObject", "Set Mesh on Object")
+        insertNode(layout, "mn_SetMeshDataOnObject", "Set Mesh Data on Object")
         layout.menu("mn.mesh_finalizing_menu", text = "Mesh Finalizing")
         layout.menu("mn.mesh_generators_menu", text = "Mesh Generators")
         layout.separator()                                  
@@ -237,6 +238,7 @@ class CurveMenu(bpy.types.Menu):
         insertNode(layout, "mn_CurveInfoNode", "Curve Info")                                              
         insertNode(layout, "mn_CurveEvaluatorNode", "Curve Evaluator")                                              
         insertNode(layout, "mn_CurvePointProjectorNode", "Curve Point Projector")                                              
+        insertNode(layout, "mn_CurvePointListProjectorNode", "Curve Point List Projector")
         layout.separator()                                    
         insertNode(layout, "mn_CurveLoftNode", "Loft")                                              
         insertNode(layout, "mn_CurveRevolveNode", "Revolve")                                              
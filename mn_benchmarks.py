@@ -0,0 +1,473 @@
+import bpy, time
+from array import array
+from mathutils import Vector
+from . mn_utils import *
+from . utils.mn_node_utils import *
+from . mn_execution import allowCompiling, forbidCompiling
+from . mn_cache import getApproximateSize, getUniformRandom
+from . utils import mn_batch_math as batchMath
+from . data_structures.mesh import MeshData
+from . utils.mn_mesh_utils import setMeshArraysOnObject
+from . nodes.mesh.mn_create_mesh_from_data import getBMeshFromMeshData
+from . nodes.mesh_generators import DelaunayVoronoi, Triangulation
+from . nodes.system.mn_loop_start import newListSocketName, newOptionSocketName
+from . import mn_execution_unit_generator as generator
+from . import mn_execution
+
+benchmarkTreeName = "Animation Nodes Benchmark"
+
+def newBenchmarkNodeTree():
+    return bpy.data.node_groups.new(benchmarkTreeName, "mn_AnimationNodeTree")
+
+def removeBenchmarkNodeTree(nodeTree):
+    bpy.data.node_groups.remove(nodeTree)
+
+def timeFunction(function, *args):
+    start = time.clock()
+    result = function(*args)
+    return time.clock() - start, result
+
+
+# node ordering
+###############################
+
+nodeOrderingAmounts = [100, 500, 1000, 2000, 5000]
+
+# every math node uses the two previous ones as input, so that
+# the dependencies of each node form a chain of diamonds
+def createDiamondNetwork(nodeTree, amount):
+    nodes = []
+    for i in range(amount):
+        node = nodeTree.nodes.new("mn_FloatMathNode")
+        if i >= 1: nodeTree.links.new(node.inputs[0], nodes[i - 1].outputs[0])
+        if i >= 2: nodeTree.links.new(node.inputs[1], nodes[i - 2].outputs[0])
+        nodes.append(node)
+    return nodes
+
+def benchmarkNodeOrdering(amount):
+    nodeTree = newBenchmarkNodeTree()
+    try:
+        nodes = createDiamondNetwork(nodeTree, amount)
+        oldTreeInfo = generator.treeInfo
+        generator.treeInfo = NodeTreeInfo(nodeTree)
+        try: timeSpan, orderedNodes = timeFunction(generator.orderNodes, list(reversed(nodes)))
+        finally: generator.treeInfo = oldTreeInfo
+        if orderedNodes != nodes: print("Wrong node order with " + str(amount) + " nodes")
+        printTimeSpan("Order " + str(amount).rjust(5) + " nodes ", timeSpan)
+    finally:
+        removeBenchmarkNodeTree(nodeTree)
+
+class BenchmarkNodeOrdering(bpy.types.Operator):
+    bl_idname = "mn.benchmark_node_ordering"
+    bl_label = "Benchmark Node Ordering"
+    bl_description = "Sort synthetic node networks with 100 - 5000 nodes and print the needed time"
+
+    def execute(self, context):
+        forbidCompiling()
+        try:
+            print("----------  Node Ordering  ----------")
+            for amount in nodeOrderingAmounts:
+                benchmarkNodeOrdering(amount)
+        finally: allowCompiling()
+        return {'FINISHED'}
+
+
+# avoided copies
+###############################
+
+def getAvoidedCopiesSize(executionUnit):
+    variables = {"dirty_nodes" : set(executionUnit.constantNodes)}
+    exec(executionUnit.setupCodeObject, variables)
+    exec(executionUnit.codeObject, variables)
+    size = 0
+    for variableName in executionUnit.avoidedCopies:
+        try: size += getApproximateSize(eval(variableName, variables))
+        except: pass # local variables of loops and groups
+    return size
+
+class BenchmarkAvoidedCopies(bpy.types.Operator):
+    bl_idname = "mn.benchmark_avoided_copies"
+    bl_label = "Benchmark Avoided Copies"
+    bl_description = "Execute all units once and print how many copies and bytes the ownership analysis avoids"
+
+    def execute(self, context):
+        forbidCompiling()
+        try:
+            print("----------  Avoided Copies  ----------")
+            totalAmount, totalSize = 0, 0
+            for i, executionUnit in enumerate(mn_execution.executionUnits):
+                size = getAvoidedCopiesSize(executionUnit)
+                amount = len(executionUnit.avoidedCopies)
+                print("Unit " + str(i).rjust(3) + ":  " + str(amount).rjust(5) + " copies  " + str(size).rjust(12) + " bytes")
+                totalAmount += amount
+                totalSize += size
+            print("Total:     " + str(totalAmount).rjust(5) + " copies  " + str(totalSize).rjust(12) + " bytes")
+        finally: allowCompiling()
+        return {'FINISHED'}
+
+
+# execution backends
+###############################
+
+backendExecutionAmount = 20
+
+# resolving all references in every execution is what the units did
+# before the setup code was separated from the execution code
+def benchmarkResolvingBackend(executionUnit):
+    start = time.clock()
+    for i in range(backendExecutionAmount):
+        variables = {"dirty_nodes" : set(executionUnit.constantNodes)}
+        exec(executionUnit.setupCodeObject, variables)
+        exec(executionUnit.codeObject, variables)
+    return (time.clock() - start) / backendExecutionAmount
+
+def benchmarkSetupBackend(executionUnit):
+    variables = {"dirty_nodes" : set(executionUnit.constantNodes)}
+    setupTime, result = timeFunction(exec, executionUnit.setupCodeObject, variables)
+    exec(executionUnit.codeObject, variables)
+    variables["dirty_nodes"] = set()
+    start = time.clock()
+    for i in range(backendExecutionAmount):
+        exec(executionUnit.codeObject, variables)
+    return setupTime, (time.clock() - start) / backendExecutionAmount
+
+def benchmarkCompilation(executionUnit):
+    start = time.clock()
+    compile(executionUnit.executionCode, "<string>", "exec")
+    return time.clock() - start
+
+class BenchmarkExecutionBackends(bpy.types.Operator):
+    bl_idname = "mn.benchmark_execution_backends"
+    bl_label = "Benchmark Execution Backends"
+    bl_description = "Compare the execution time of all units with and without resolving the node references in every execution"
+
+    def execute(self, context):
+        forbidCompiling()
+        try:
+            print("----------  Execution Backends  ----------")
+            generator.clearExecutionUnitCache()
+            generationTime, executionUnits = timeFunction(generator.getExecutionUnits)
+            print("Generation:    " + str(round(generationTime, 7)).rjust(11) + " s")
+            for i, executionUnit in enumerate(executionUnits):
+                resolvingTime = benchmarkResolvingBackend(executionUnit)
+                setupTime, executionTime = benchmarkSetupBackend(executionUnit)
+                compilationTime = benchmarkCompilation(executionUnit)
+                print("Unit " + str(i).rjust(3) + ":  compile " + str(round(compilationTime, 7)).rjust(11) + " s  " +
+                      "resolve every time " + str(round(resolvingTime, 7)).rjust(11) + " s  " +
+                      "setup once " + str(round(setupTime, 7)).rjust(11) + " s + " + str(round(executionTime, 7)).rjust(11) + " s")
+        finally: allowCompiling()
+        mn_execution.generateExecutionUnits()
+        return {'FINISHED'}
+
+
+# mesh output
+###############################
+
+meshOutputVertexAmounts = [10000, 100000, 1000000]
+meshOutputFrames = 5
+
+def getGridMeshArrays(vertexAmount):
+    size = int(vertexAmount ** 0.5)
+    locationArray = array("f", [value for y in range(size) for x in range(size) for value in (x, y, 0)])
+    loopVertexIndices = array("i", [index for y in range(size - 1) for x in range(size - 1)
+        for index in (y * size + x, y * size + x + 1, (y + 1) * size + x + 1, (y + 1) * size + x)])
+    polygonAmount = len(loopVertexIndices) // 4
+    loopStarts = array("i", range(0, polygonAmount * 4, 4))
+    loopTotals = array("i", [4]) * polygonAmount
+    return locationArray, array("i"), (loopStarts, loopTotals, loopVertexIndices)
+
+def moveLocations(locationArray, frame):
+    return array("f", [value + frame for value in locationArray])
+
+def benchmarkMeshOutput(vertexAmount):
+    locationArray, edgeArray, polygonArrays = getGridMeshArrays(vertexAmount)
+    mesh = bpy.data.meshes.new(benchmarkTreeName)
+    object = bpy.data.objects.new(benchmarkTreeName, mesh)
+    try:
+        bmeshTime = 0.0
+        directTime = 0.0
+        for frame in range(meshOutputFrames):
+            meshData = MeshData.fromArrays(moveLocations(locationArray, frame), edgeArray, polygonArrays)
+            start = time.clock()
+            bm = getBMeshFromMeshData(meshData)
+            bm.to_mesh(object.data)
+            bm.free()
+            bmeshTime += time.clock() - start
+        rebuildTime, result = timeFunction(setMeshArraysOnObject, object, locationArray, edgeArray, polygonArrays)
+        for frame in range(meshOutputFrames):
+            movedLocationArray = moveLocations(locationArray, frame)
+            start = time.clock()
+            setMeshArraysOnObject(object, movedLocationArray, edgeArray, polygonArrays)
+            directTime += time.clock() - start
+        print(str(vertexAmount).rjust(8) + " vertices:  bmesh " + str(round(bmeshTime / meshOutputFrames, 5)).rjust(9) + " s  " +
+              "direct rebuild " + str(round(rebuildTime, 5)).rjust(9) + " s  " +
+              "direct locations " + str(round(directTime / meshOutputFrames, 5)).rjust(9) + " s")
+    finally:
+        # the first mesh has been removed when it was replaced
+        mesh = object.data
+        bpy.data.objects.remove(object)
+        bpy.data.meshes.remove(mesh)
+
+class BenchmarkMeshOutput(bpy.types.Operator):
+    bl_idname = "mn.benchmark_mesh_output"
+    bl_label = "Benchmark Mesh Output"
+    bl_description = "Compare the time per frame to output grids with 10k - 1M vertices through a bmesh and directly"
+
+    def execute(self, context):
+        forbidCompiling()
+        try:
+            print("----------  Mesh Output  ----------")
+            for vertexAmount in meshOutputVertexAmounts:
+                benchmarkMeshOutput(vertexAmount)
+        finally: allowCompiling()
+        return {'FINISHED'}
+
+
+# batch math
+###############################
+
+batchMathAmounts = [1000, 100000, 1000000]
+
+batchMathOperations = [
+    ("Cartesian to Polar", 2, batchMath.cartesianToPolarPerElement, batchMath.cartesianToPolarBatched),
+    ("Polar to Cartesian", 2, batchMath.polarToCartesianPerElement, batchMath.polarToCartesianBatched),
+    ("Cartesian to Spherical", 3, batchMath.cartesianToSphericalPerElement, batchMath.cartesianToSphericalBatched),
+    ("Spherical to Cartesian", 3, batchMath.sphericalToCartesianPerElement, batchMath.sphericalToCartesianBatched) ]
+
+def benchmarkBatchMath(amount):
+    lists = [[getUniformRandom(i * 3 + j, -1, 1) for i in range(amount)] for j in range(3)]
+    for name, argumentAmount, perElementFunction, batchedFunction in batchMathOperations:
+        perElementTime, result = timeFunction(perElementFunction, *lists[:argumentAmount])
+        batchedTime, result = timeFunction(batchedFunction, *lists[:argumentAmount])
+        print(name.ljust(25) + str(amount).rjust(8) + ":  per element " + str(round(perElementTime, 5)).rjust(9) + " s  " +
+              "batched " + str(round(batchedTime, 5)).rjust(9) + " s")
+
+class BenchmarkBatchMath(bpy.types.Operator):
+    bl_idname = "mn.benchmark_batch_math"
+    bl_label = "Benchmark Batch Math"
+    bl_description = "Compare the per element and the batched implementation of list operations with 1k - 1M elements"
+
+    def execute(self, context):
+        if batchMath.numpy is None:
+            print("NumPy is not available")
+            return {'CANCELLED'}
+        print("----------  Batch Math  ----------")
+        for amount in batchMathAmounts:
+            benchmarkBatchMath(amount)
+        return {'FINISHED'}
+
+
+# triangulation
+###############################
+
+triangulationAmounts = [1000, 10000, 50000]
+
+def getRandomPoints(amount):
+    return [Vector((getUniformRandom(i * 2, -10, 10), getUniformRandom(i * 2 + 1, -10, 10), 0)) for i in range(amount)]
+
+def benchmarkTriangulation(amount):
+    points = getRandomPoints(amount)
+    tuples = [(point.x, point.y) for point in points]
+    times = [("fortune", timeFunction(DelaunayVoronoi.computeDelaunayTriangulation, points)[0]),
+             ("incremental", timeFunction(Triangulation.computeDelaunayTrianglesIncremental, tuples)[0])]
+    if Triangulation.QhullDelaunay is not None:
+        times.append(("qhull", timeFunction(Triangulation.computeDelaunayTrianglesWithQhull, tuples)[0]))
+    times.append(("voronoi fortune", timeFunction(DelaunayVoronoi.computeVoronoiDiagram, points, 0, 0, True, True, False)[0]))
+    times.append(("voronoi new", timeFunction(Triangulation.computeVoronoiCells, points)[0]))
+    print(str(amount).rjust(6) + ":  " + "  ".join(name + " " + str(round(timeSpan, 4)) + " s" for name, timeSpan in times))
+
+class BenchmarkTriangulation(bpy.types.Operator):
+    bl_idname = "mn.benchmark_triangulation"
+    bl_label = "Benchmark Triangulation"
+    bl_description = "Compare the Fortune sweep with the incremental and the Qhull Delaunay triangulation and the Voronoi cells"
+
+    def execute(self, context):
+        print("----------  Triangulation  ----------")
+        for amount in triangulationAmounts:
+            benchmarkTriangulation(amount)
+        return {'FINISHED'}
+
+
+# loop calls
+###############################
+
+loopCallAmounts = [10000, 100000, 1000000]
+
+# like the Append Socket operator of the Loop Start node
+def newLoopSocket(startNode, idName, name, isListSocket):
+    socket = startNode.newOutputSocket(idName, name)
+    socket.loopAsList = isListSocket
+    index = startNode.outputs.find(newListSocketName if isListSocket else newOptionSocketName)
+    startNode.outputs.move(len(startNode.outputs) - 1, index)
+    return socket
+
+# the generator vectorizes this loop, its function is called once with all elements
+def createMathLoopBody(nodeTree, elementSocket, valuesSocket):
+    mathNode = nodeTree.nodes.new("mn_FloatMathNode")
+    mathNode.mathTypesProperty = "MULITPLY"
+    mathNode.inputs["B"].number = 2.0
+    appendNode = nodeTree.nodes.new("mn_AppendListNode")
+    appendNode.generateSockets("mn_FloatListSocket")
+    nodeTree.links.new(mathNode.inputs["A"], elementSocket)
+    nodeTree.links.new(appendNode.inputs["List"], valuesSocket)
+    nodeTree.links.new(appendNode.inputs["Element"], mathNode.outputs["Result"])
+
+# the Expression node can't be vectorized, so the loop function is called for every element
+def createExpressionLoopBody(nodeTree, elementSocket, valuesSocket):
+    expressionNode = nodeTree.nodes.new("mn_ExpressionNode")
+    expressionNode.expression = "values.append(x * 2.0)"
+    valuesInput = expressionNode.inputs.new("mn_GenericSocket", "values")
+    valuesInput.customName = "values"
+    expressionNode.inputs.move(len(expressionNode.inputs) - 1, 1)
+    nodeTree.links.new(expressionNode.inputs["x"], elementSocket)
+    nodeTree.links.new(valuesInput, valuesSocket)
+
+loopBodies = [("vectorized", createMathLoopBody), ("per element", createExpressionLoopBody)]
+
+# Number Range -> Loop Call, the loop multiplies every element and appends it to a loop option
+def createLoopCallNetwork(nodeTree, createLoopBody, amount):
+    startNode = nodeTree.nodes.new("mn_LoopStartNode")
+    elementSocket = newLoopSocket(startNode, "mn_FloatSocket", "Element", isListSocket = True)
+    valuesSocket = newLoopSocket(startNode, "mn_FloatListSocket", "Values", isListSocket = False)
+    createLoopBody(nodeTree, elementSocket, valuesSocket)
+    callerNode = nodeTree.nodes.new("mn_LoopCallerNode")
+    callerNode.activeLoop = startNode.loopName
+    callerNode.updateSockets()
+    rangeNode = nodeTree.nodes.new("mn_FloatRangeListNode")
+    rangeNode.inputs["Amount"].number = amount
+    nodeTree.links.new(callerNode.inputs[elementSocket.identifier + "list"], rangeNode.outputs["List"])
+    return callerNode.outputs[valuesSocket.identifier]
+
+# the first execution calculates the folded range, the second one is timed
+def executeLoopCallUnit(executionUnit, valuesOutput):
+    variables = {"dirty_nodes" : set(executionUnit.constantNodes)}
+    exec(executionUnit.setupCodeObject, variables)
+    exec(executionUnit.codeObject, variables)
+    variables["dirty_nodes"] = set()
+    timeSpan, result = timeFunction(exec, executionUnit.codeObject, variables)
+    return timeSpan, eval(generator.getOutputValueVariable(valuesOutput), variables)
+
+def benchmarkLoopCall(name, createLoopBody, amount):
+    nodeTree = newBenchmarkNodeTree()
+    try:
+        forbidCompiling()
+        try: valuesOutput = createLoopCallNetwork(nodeTree, createLoopBody, amount)
+        finally: allowCompiling()
+        mn_execution.generateExecutionUnits()
+        for executionUnit in mn_execution.executionUnits:
+            if nodeTree.name not in executionUnit.nodeTreeNames: continue
+            timeSpan, values = executeLoopCallUnit(executionUnit, valuesOutput)
+            if list(values) != [2.0 * i for i in range(amount)]: print("Wrong loop results with " + str(amount) + " elements")
+            print(name.rjust(12) + str(amount).rjust(9) + ":  " + str(round(timeSpan, 4)).rjust(8) + " s  " +
+                  str(round(timeSpan / amount * 1000000, 3)).rjust(7) + " us per element")
+    finally:
+        removeBenchmarkNodeTree(nodeTree)
+
+class BenchmarkLoopCalls(bpy.types.Operator):
+    bl_idname = "mn.benchmark_loop_calls"
+    bl_label = "Benchmark Loop Calls"
+    bl_description = "Generate loops over 10000 - 1000000 elements and print how long the generated code needs"
+
+    def execute(self, context):
+        print("----------  Loop Calls  ----------")
+        try:
+            for name, createLoopBody in loopBodies:
+                for amount in loopCallAmounts:
+                    benchmarkLoopCall(name, createLoopBody, amount)
+        finally: mn_execution.generateExecutionUnits()
+        return {'FINISHED'}
+
+
+# animated constant nodes
+###############################
+
+# a folded node must be executed again on every frame when one of its sockets gets keyframes
+def checkAnimatedConstantNode(nodeTree):
+    mathNode = nodeTree.nodes.new("mn_FloatMathNode")
+    debugNode = nodeTree.nodes.new("mn_DebugOutputNode")
+    nodeTree.links.new(debugNode.inputs[0], mathNode.outputs[0])
+    mn_execution.generateExecutionUnits()
+    if not any(generator.getNodeVariableName(mathNode) in executionUnit.constantNodes for executionUnit in mn_execution.executionUnits):
+        print("The math node is not folded")
+        
+    socket = mathNode.inputs[0]
+    for frame in [1, 10]:
+        socket.number = frame
+        socket.keyframe_insert("number", frame = frame)
+    mn_execution.checkAnimationChanges()
+    
+    scene = bpy.context.scene
+    oldFrame = scene.frame_current
+    try:
+        results = []
+        for frame in [1, 10]:
+            scene.frame_set(frame)
+            for executionUnit in mn_execution.executionUnits:
+                executionUnit.execute()
+            results.append(debugNode.debugOutputString)
+    finally: scene.frame_set(oldFrame)
+    if results == ["1.0", "10.0"]: print("Animated constant node:  ok")
+    else: print("Animated constant node:  wrong outputs " + str(results))
+
+class CheckAnimatedConstantNodes(bpy.types.Operator):
+    bl_idname = "mn.check_animated_constant_nodes"
+    bl_label = "Check Animated Constant Nodes"
+    bl_description = "Key the socket of a folded node and check that its output follows the keyframes"
+
+    def execute(self, context):
+        print("----------  Animated Constant Nodes  ----------")
+        nodeTree = newBenchmarkNodeTree()
+        try: checkAnimatedConstantNode(nodeTree)
+        finally:
+            action = getattr(nodeTree.animation_data, "action", None)
+            removeBenchmarkNodeTree(nodeTree)
+            if action is not None and action.users == 0: bpy.data.actions.remove(action)
+            mn_execution.generateExecutionUnits()
+        return {'FINISHED'}
+
+
+# passthrough copies
+###############################
+
+# every call of a copy function, without the definitions
+def getCopyAmount(executionCode):
+    return executionCode.count("_copy(") - executionCode.count("_copy(value):")
+
+# List Z is a read-only input of the cylindrical conversion and is passed through,
+# the output must not be the same list, otherwise Append to List changes the range too
+def checkPassthroughCopies(nodeTree):
+    timeNode = nodeTree.nodes.new("mn_TimeInfoNode")
+    rangeNode = nodeTree.nodes.new("mn_FloatRangeListNode")
+    convertNode = nodeTree.nodes.new("mn_Math3DCoordinatesCartesianToCylindricalList")
+    appendNode = nodeTree.nodes.new("mn_AppendListNode")
+    appendNode.generateSockets("mn_FloatListSocket")
+    nodeTree.links.new(rangeNode.inputs["Start"], timeNode.outputs["Frame"])
+    for name in ["List X", "List Y", "List Z"]:
+        nodeTree.links.new(convertNode.inputs[name], rangeNode.outputs["List"])
+    nodeTree.links.new(appendNode.inputs["List"], convertNode.outputs["List Z"])
+    nodeTree.links.new(nodeTree.nodes.new("mn_DebugOutputNode").inputs[0], appendNode.outputs["List"])
+    mn_execution.generateExecutionUnits()
+    
+    for executionUnit in mn_execution.executionUnits:
+        if nodeTree.name not in executionUnit.nodeTreeNames: continue
+        variables = {"dirty_nodes" : set(executionUnit.constantNodes)}
+        exec(executionUnit.setupCodeObject, variables)
+        exec(executionUnit.codeObject, variables)
+        rangeList = eval(generator.getOutputValueVariable(rangeNode.outputs["List"]), variables)
+        copyAmount = getCopyAmount(executionUnit.executionCode)
+        if len(rangeList) == rangeNode.inputs["Amount"].number and copyAmount == 0: print("Passthrough copies:  ok")
+        else: print("Passthrough copies:  " + str(copyAmount) + " copies (expected 0), the range has " + str(len(rangeList)) + " elements")
+
+class CheckPassthroughCopies(bpy.types.Operator):
+    bl_idname = "mn.check_passthrough_copies"
+    bl_label = "Check Passthrough Copies"
+    bl_description = "Check that a list passed through a node with read-only inputs is neither copied nor shared with a node that changes it"
+
+    def execute(self, context):
+        print("----------  Passthrough Copies  ----------")
+        nodeTree = newBenchmarkNodeTree()
+        try: checkPassthroughCopies(nodeTree)
+        finally:
+            removeBenchmarkNodeTree(nodeTree)
+            mn_execution.generateExecutionUnits()
+        return {'FINISHED'}
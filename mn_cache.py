@@ -1,5 +1,6 @@
 from . mn_utils import *
-import random
+from collections import OrderedDict
+import bpy, random, sys
 
 # generic execution cache
 ###############################
@@ -9,6 +10,8 @@ executionCache = {}
 def clearExecutionCache():
     global executionCache
     executionCache = {}
+    for namespace in cacheNamespaces.values():
+        namespace.removeStaleEntries()
     
 def setExecutionCache(identifier, object):
     global executionCache
@@ -21,24 +24,232 @@ def getExecutionCache(identifier):
 # generic long time cache
 ###############################
 
-longTimeCache = {}
+# the long time cache is split into namespaces, each with its own size limit,
+# the least recently used entries are removed when a namespace gets too big
+class CacheNamespace:
+    def __init__(self, name, maxSize, isStale = None):
+        self.name = name
+        self.maxSize = maxSize
+        self.isStale = isStale
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        
+    # entries whose validity key differs are stale and count as miss
+    def get(self, identifier, validityKey = None):
+        entry = self.entries.get(identifier)
+        if entry is None or entry[0] != validityKey:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(identifier)
+        self.hits += 1
+        return entry[1]
+        
+    def set(self, identifier, object, validityKey = None):
+        self.remove(identifier)
+        if object is None: return
+        size = getApproximateSize(object)
+        self.entries[identifier] = (validityKey, object, size)
+        self.size += size
+        while self.size > self.maxSize and len(self.entries) > 1:
+            oldestIdentifier = next(iter(self.entries))
+            self.remove(oldestIdentifier)
+            self.evictions += 1
+            
+    def remove(self, identifier):
+        entry = self.entries.pop(identifier, None)
+        if entry is not None: self.size -= entry[2]
+        
+    def clear(self):
+        self.entries.clear()
+        self.size = 0
+        
+    # e.g. entries that belong to removed Blender data
+    def removeStaleEntries(self):
+        if self.isStale is None: return
+        for identifier in [identifier for identifier in self.entries if self.isStale(identifier)]:
+            self.remove(identifier)
+        
+    def getStatistics(self):
+        return { "name" : self.name,
+                 "entries" : len(self.entries),
+                 "size" : self.size,
+                 "maxSize" : self.maxSize,
+                 "hits" : self.hits,
+                 "misses" : self.misses,
+                 "evictions" : self.evictions }
+                 
+defaultNamespaceSize = 100 * 1024 * 1024
+cacheNamespaces = OrderedDict()
+
+def getCacheNamespace(name, maxSize = defaultNamespaceSize, isStale = None):
+    namespace = cacheNamespaces.get(name)
+    if namespace is None:
+        namespace = CacheNamespace(name, maxSize, isStale)
+        cacheNamespaces[name] = namespace
+    return namespace
+    
+def getCacheStatistics():
+    return [namespace.getStatistics() for namespace in cacheNamespaces.values()]
+    
+longTimeCache = getCacheNamespace("Generic")
 
 def clearLongTimeCache():
-    global longTimeCache
-    longTimeCache = {}
+    for namespace in cacheNamespaces.values():
+        namespace.clear()
     
 def setLongTimeCache(identifier, object):
-    global longTimeCache
-    longTimeCache[identifier] = object
+    longTimeCache.set(identifier, object)
     
 def getLongTimeCache(identifier):
     return longTimeCache.get(identifier)
     
-def cacheFunctionResult(cacheDic, identifier, function, args, useCache):
-    if not useCache or identifier not in cacheDic:
-        cacheDic[identifier] = function(*args)
-    return cacheDic[identifier]
+def cacheFunctionResult(cache, identifier, function, args, useCache, validityKey = None):
+    if not useCache: return function(*args)
+    result = cache.get(identifier, validityKey)
+    if result is None:
+        result = function(*args)
+        cache.set(identifier, result, validityKey)
+    return result
+    
+# samples the first elements of big lists to stay fast
+def getApproximateSize(value, depth = 3):
+    size = sys.getsizeof(value)
+    if depth > 0:
+        if isinstance(value, (list, tuple)) and len(value) > 0:
+            sample = value[:10]
+            sampleSize = sum(getApproximateSize(element, depth - 1) for element in sample)
+            size += sampleSize * len(value) // len(sample)
+        elif isinstance(value, dict):
+            size += sum(getApproximateSize(element, depth - 1) for element in value.values())
+        elif hasattr(value, "__dict__"):
+            size += sum(getApproximateSize(element, depth - 1) for element in vars(value).values())
+    return size
+    
+    
+# object data changes
+###############################
+
+# the change id of an object gets increased when Blender reports a change of its data
+objectDataChangeIds = {}
+
+def markObjectDataChanged(object):
+    objectDataChangeIds[object.name] = objectDataChangeIds.get(object.name, 0) + 1
+    
+def getObjectDataIdentity(object):
+    return (object.data.as_pointer(), objectDataChangeIds.get(object.name, 0))
+    
+
+# node change tracking
+###############################
+
+nodeChangeCounter = 0
+allNodesChangeId = 0
+nodeChangeIds = {}
+
+def markNodeChanged(node):
+    global nodeChangeCounter
+    nodeChangeCounter += 1
+    nodeChangeIds[(node.id_data.name, node.name)] = nodeChangeCounter
+    
+def markAllNodesChanged():
+    global nodeChangeCounter, allNodesChangeId
+    nodeChangeCounter += 1
+    allNodesChangeId = nodeChangeCounter
+    
+def getNodeChangeCounter():
+    return nodeChangeCounter
     
+def getNodeChangeId(nodeKey):
+    return max(nodeChangeIds.get(nodeKey, 0), allNodesChangeId)
+
+
+# group results
+###############################
+
+# groups without side effects remember the outputs for the last used inputs,
+# groups that depend on the time forget them when the frame changes
+class GroupResultCache:
+    def __init__(self, name, maxEntries):
+        self.name = name
+        self.maxEntries = maxEntries
+        self.results = OrderedDict()
+        self.frame = None
+        self.hits = 0
+        self.misses = 0
+        self.unhashableCalls = 0
+
+    def call(self, function, arguments):
+        key = getHashableKey(arguments)
+        if key is None:
+            self.unhashableCalls += 1
+            return function(*arguments)
+        result = self.results.get(key)
+        if result is None:
+            self.misses += 1
+            result = function(*arguments)
+            self.results[key] = result
+            while len(self.results) > self.maxEntries: self.results.popitem(last = False)
+        else:
+            self.hits += 1
+            self.results.move_to_end(key)
+        return result
+
+    def setFrame(self, frame):
+        if frame != self.frame: self.clear()
+        self.frame = frame
+
+    def clear(self):
+        self.results.clear()
+
+    def getStatistics(self):
+        calls = self.hits + self.misses + self.unhashableCalls
+        return { "name" : self.name,
+                 "entries" : len(self.results),
+                 "maxEntries" : self.maxEntries,
+                 "hits" : self.hits,
+                 "misses" : self.misses,
+                 "unhashableCalls" : self.unhashableCalls,
+                 "hitRate" : self.hits / calls if calls > 0 else 0.0 }
+
+# lists and vectors are converted to tuples, returns None when that isn't possible
+def getHashableKey(arguments):
+    try: return tuple(getHashableValue(argument) for argument in arguments)
+    except TypeError: return None
+
+# objects that are hashed by their identity (e.g. mesh data, bmesh or Blender data)
+# can change without a new key and the key would keep them alive
+def getHashableValue(value):
+    if isinstance(value, (list, tuple)): return tuple(getHashableValue(element) for element in value)
+    if hasattr(value, "to_tuple"): return value.to_tuple()
+    if hasattr(value, "to_3x3"): return tuple(tuple(row) for row in value)
+    if value is None: return value
+    if isinstance(value, bpy.types.bpy_struct) or type(value).__hash__ is object.__hash__: raise TypeError()
+    hash(value)
+    return value
+
+groupResultCaches = OrderedDict()
+
+def getGroupResultCache(name, maxEntries):
+    cache = groupResultCaches.get(name)
+    if cache is None:
+        cache = GroupResultCache(name, maxEntries)
+        groupResultCaches[name] = cache
+    cache.maxEntries = maxEntries
+    return cache
+
+def clearGroupResultCache(name):
+    if name in groupResultCaches: groupResultCaches[name].clear()
+
+def clearGroupResultCaches():
+    for cache in groupResultCaches.values():
+        cache.clear()
+
+def getGroupCacheStatistics():
+    return [cache.getStatistics() for cache in groupResultCaches.values()]
+
 
 # random number cache
 ###############################
@@ -2,13 +2,15 @@ import bpy, time, traceback, sys
 from bpy.app.handlers import persistent
 from bpy.props import *
 from . mn_utils import *
-from . mn_cache import clearExecutionCache
+from . mn_cache import clearExecutionCache, markNodeChanged, markAllNodesChanged, markObjectDataChanged
 from . utils.mn_selection_utils import *
 from . utils.mn_node_utils import *
-from . mn_execution_unit_generator import getExecutionUnits
+from . mn_execution_unit_generator import getExecutionUnits, clearExecutionUnitCache, resetExecutionUnitGlobals, getAnimationState
+from . mn_profiler import startProfiling, finishProfiling
 
 COMPILE_BLOCKER = 0
 executionUnits = []
+animationState = None
 
 def updateAnimationTrees(event = "NONE", sender = None):
     if COMPILE_BLOCKER == 0 and len(executionUnits) > 0:
@@ -36,6 +38,7 @@ def secureExecution(event, sender):
     try: executeUnits(event, sender)
     except:
         resetCompileBlocker()
+        clearExecutionUnitCache()
         generateExecutionUnits()
         forbidCompiling()
         try: executeUnits(event, sender)
@@ -46,8 +49,20 @@ def secureExecution(event, sender):
         
         
 def executeUnits(event, sender):
+    useProfiling = bpy.context.scene.mn_settings.developer.executionProfiling
+    if useProfiling: startProfiling(getCurrentFrame())
     for executionUnit in executionUnits:
         executionUnit.execute(event, sender)
+    if useProfiling: finishProfiling()
+    if bpy.context.scene.mn_settings.developer.printUnitExecutionTimes:
+        printUnitExecutionTimes()
+        
+def printUnitExecutionTimes():
+    for i, executionUnit in enumerate(executionUnits):
+        if executionUnit.isExecuted:
+            name = "Unit " + str(i) + " (" + ", ".join(executionUnit.nodeTreeNames) + ")"
+            averageTime = executionUnit.totalExecuteTime / executionUnit.executeAmount
+            print(name.ljust(40) + str(round(executionUnit.lastExecuteTime, 7)).rjust(13) + " s  -  average: " + str(round(averageTime, 7)) + " s")
         
 def redraw_areas_if_possible():
     try:
@@ -70,19 +85,27 @@ def resetCompileBlocker():
 ################################
 
 def generateExecutionUnits():
-    global executionUnits
+    global executionUnits, animationState
     
     if COMPILE_BLOCKER == 0:
         forbidCompiling()
         
         start = time.clock()
+        animationState = getAnimationState()
         executionUnits = getExecutionUnits()
         timeSpan = time.clock() - start
         if bpy.context.scene.mn_settings.developer.printGenerationTime:
             print("Script Gen. " + str(round(timeSpan, 7)) + " s  -  " + str(round(1/timeSpan, 5)) + " fps")
+            printEliminatedNodes()
         
         allowCompiling()
         
+def printEliminatedNodes():
+    for i, executionUnit in enumerate(executionUnits):
+        name = "Unit " + str(i) + " (" + ", ".join(executionUnit.nodeTreeNames) + ")"
+        nodeNames = [nodeName for treeName, nodeName in executionUnit.eliminatedNodes]
+        print(name.ljust(40) + "eliminated nodes: " + str(len(nodeNames)) + ("  (" + ", ".join(nodeNames) + ")" if len(nodeNames) > 0 else ""))
+
 def getCodeStrings():
     codeStrings = []
     for executionUnit in executionUnits:
@@ -101,19 +124,40 @@ def frameChangeHandler(scene):
 @persistent
 def sceneUpdateHandler(scene):
     updateSelectionSorting()
+    markChangedObjectData()
+    checkAnimationChanges()
     updateAnimationTrees("SCENE")
 @persistent
 def fileLoadHandler(scene):
+    clearExecutionUnitCache()
     generateExecutionUnits()
+@persistent
+def undoHandler(scene):
+    resetExecutionUnitGlobals()
 def nodePropertyChanged(self, context):
+    markPropertyOwnerChanged(self)
     updateAnimationTrees("PROPERTY")
 def settingPropertyChanged(self, context):
     generateExecutionUnits()
     updateAnimationTrees("PROPERTY")
 def nodeTreeChanged(self = None, context = None):
+    markAllNodesChanged()
     generateExecutionUnits()
     updateAnimationTrees("TREE")
+def checkAnimationChanges():
+    if getAnimationState() != animationState:
+        generateExecutionUnits()
+def markChangedObjectData():
+    if bpy.data.objects.is_updated or bpy.data.meshes.is_updated or bpy.data.curves.is_updated:
+        for object in bpy.data.objects:
+            if object.is_updated_data or getattr(object.data, "is_updated", False):
+                markObjectDataChanged(object)
+def markPropertyOwnerChanged(owner):
+    if isinstance(owner, bpy.types.NodeSocket): markNodeChanged(owner.node)
+    elif isinstance(owner, bpy.types.Node): markNodeChanged(owner)
+    else: markAllNodesChanged()
 def forceExecution(sender = None):
+    clearExecutionUnitCache()
     generateExecutionUnits()
     updateAnimationTrees("FORCE", sender)
     
@@ -136,6 +180,8 @@ def register_handlers():
     bpy.app.handlers.frame_change_post.append(frameChangeHandler)
     bpy.app.handlers.scene_update_post.append(sceneUpdateHandler)
     bpy.app.handlers.load_post.append(fileLoadHandler)
+    bpy.app.handlers.undo_post.append(undoHandler)
+    bpy.app.handlers.redo_post.append(undoHandler)
     bpy.app.handlers.render_pre.append(rendering_starts)
     bpy.app.handlers.render_post.append(rendering_ends)
     
@@ -143,5 +189,7 @@ def unregister_handlers():
     bpy.app.handlers.frame_change_post.remove(frameChangeHandler)
     bpy.app.handlers.scene_update_post.remove(sceneUpdateHandler)
     bpy.app.handlers.load_post.remove(fileLoadHandler)
+    bpy.app.handlers.undo_post.remove(undoHandler)
+    bpy.app.handlers.redo_post.remove(undoHandler)
     bpy.app.handlers.render_pre.remove(rendering_starts)
     bpy.app.handlers.render_post.remove(rendering_ends)
\ No newline at end of file
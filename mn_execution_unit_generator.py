@@ -2,6 +2,7 @@ import bpy, time, os, sys
 from . utils.mn_node_utils import *
 from . mn_utils import *
 from . node_link_conversion import correctForbiddenNodeLinks
+from . mn_cache import getNodeChangeId, getNodeChangeCounter, clearGroupResultCache, clearGroupResultCaches
 
 normalNetworks = []
 loopNetworks = {}
@@ -13,11 +14,23 @@ addonName = os.path.basename(os.path.dirname(__file__))
 
 class ExecutionUnit:
 
-    def __init__(self, code, updateSettingsNode = None):
-        self.executionCode = code
+    def __init__(self, setupCode, code, updateSettingsNode = None, constantNodes = None):
+        self.executionCode = setupCode + "\n\n" + code
+        self.setupCodeObject = compile(setupCode, "<string>", "exec")
         self.codeObject = compile(code, "<string>", "exec")
         self.executeAmount = 0
         self.totalExecuteTime = 0.0
+        self.constantNodes = constantNodes or {}
+        self.groupCacheNodes = {}
+        self.constantOutputNames = set()
+        self.globals = None
+        self.persistentNames = set()
+        self.lastChangeId = None
+        self.avoidedCopies = []
+        self.eliminatedNodes = []
+        self.nodeTreeNames = []
+        self.isExecuted = False
+        self.lastExecuteTime = 0.0
         if getattr(updateSettingsNode, "bl_idname", "") == "mn_NetworkUpdateSettingsNode":
             self.updateSettingsNode = (updateSettingsNode.id_data.name, updateSettingsNode.name)
         else: self.updateSettingsNode = None
@@ -64,10 +77,11 @@ class ExecutionUnit:
         if event == "SCENE" and isViewportRenderingActive():
             onSceneUpdate = False
             
-        # reset counter on force execution
+        # reset counter and constants on force execution
         if forceExecution:
             self.totalExecuteTime = 0.0
             self.executeAmount = 0
+            self.lastChangeId = None
             
         execute = event == "NONE" \
             or event == "FRAME" and onFrameChange \
@@ -76,35 +90,93 @@ class ExecutionUnit:
             or event == "TREE" and onTreeChange \
             or forceExecution
             
+        self.isExecuted = execute
         if execute:
             start = time.clock()
-            exec(self.codeObject, {})
+            exec(self.codeObject, self.getExecutionGlobals())
+            self.removeExecutionVariables()
             timeSpan = time.clock() - start
+            self.lastExecuteTime = timeSpan
             self.totalExecuteTime += timeSpan
             self.executeAmount += 1
             if printTime:
                 printTimeSpan(unitName + " exec. ", self.totalExecuteTime / self.executeAmount, "counter: " + str(self.executeAmount))
             if node is not None:
                 node.executionTime = timeSpan
+                
+    # node, socket and function references are only resolved once by the setup code,
+    # afterwards every execution only runs the node code in the same globals
+    def getExecutionGlobals(self):
+        if self.globals is None:
+            executionGlobals = {}
+            exec(self.setupCodeObject, executionGlobals)
+            self.globals = executionGlobals
+            self.persistentNames = set(executionGlobals) | self.constantOutputNames
+            self.lastChangeId = None
+        self.clearChangedGroupCaches()
+        self.globals["dirty_nodes"] = self.getDirtyNodes()
+        return self.globals
+    def resetExecutionGlobals(self):
+        self.globals = None
+        
+    # only the references and the outputs of folded nodes are kept until the next execution
+    def removeExecutionVariables(self):
+        for name in [name for name in self.globals if name not in self.persistentNames]:
+            del self.globals[name]
+        
+    # constant nodes only have to be executed again when they or one of their parents changed
+    def getDirtyNodes(self):
+        dirtyNodes = set()
+        for variableName, nodeKeys in self.constantNodes.items():
+            if self.lastChangeId is None or any(getNodeChangeId(nodeKey) > self.lastChangeId for nodeKey in nodeKeys):
+                dirtyNodes.add(variableName)
+        self.lastChangeId = getNodeChangeCounter()
+        return dirtyNodes
+        
+    # the remembered results of a group are wrong when one of its nodes changed
+    def clearChangedGroupCaches(self):
+        for groupName, nodeKeys in self.groupCacheNodes.items():
+            if self.lastChangeId is None or any(getNodeChangeId(nodeKey) > self.lastChangeId for nodeKey in nodeKeys):
+                clearGroupResultCache(groupName)
 
 def getExecutionUnits():
     global useProfiling, idCounter, treeInfo
     useProfiling = bpy.context.scene.mn_settings.developer.executionProfiling
     idCounter = 0
+    determinedNodes.clear()
     correctForbiddenNodeLinks()
     treeInfo = NodeTreeInfo(getAnimationNodeTrees())
+    clearGroupResultCaches()
     networks = getNodeNetworks()
     prepareNetworks(networks)
+    findDeadNodes(normalNetworks + list(loopNetworks.values()) + list(groupNetworks.values()))
     executionUnits = []
     if len(invalidNetworks) == 0:
-        for network in normalNetworks:
-            codeGenerator = NetworkCodeGenerator(network)
-            codeGenerator.generateCode()
-            executionUnit = ExecutionUnit(codeGenerator.generatedCode, codeGenerator.updateSettingsNode)
-            executionUnits.append(executionUnit)
+        try:
+            for network in normalNetworks:
+                executionUnits.append(getExecutionUnit(network))
+        except NodeCycleError as e:
+            print(e)
+            return []
     else: print("There is at least one invalid network.")
+    removeUnusedExecutionUnitsFromCache(executionUnits)
     return executionUnits
     
+def getExecutionUnit(network):
+    fingerprint = getNetworkFingerprint(network)
+    executionUnit = executionUnitCache.get(fingerprint)
+    if executionUnit is None:
+        codeGenerator = NetworkCodeGenerator(network)
+        codeGenerator.generateCode()
+        executionUnit = ExecutionUnit(codeGenerator.setupCode, codeGenerator.generatedCode, codeGenerator.updateSettingsNode, codeGenerator.constantNodeKeys)
+        executionUnit.avoidedCopies = codeGenerator.avoidedCopies
+        executionUnit.groupCacheNodes = codeGenerator.groupCacheNodeKeys
+        executionUnit.constantOutputNames = codeGenerator.constantOutputNames
+        executionUnit.eliminatedNodes = [(node.id_data.name, node.name) for node in codeGenerator.eliminatedNodes]
+        executionUnit.nodeTreeNames = [nodeTree.name for nodeTree in codeGenerator.nodeTreeNames]
+        executionUnitCache[fingerprint] = executionUnit
+    return executionUnit
+    
 def prepareNetworks(networks):
     global normalNetworks, loopNetworks, groupNetworks, invalidNetworks
     normalNetworks = []
@@ -132,6 +204,76 @@ def setUniqueCodeIndexToEveryNode(nodes):
         idCounter += 1
         
 
+# reuse execution units of unchanged networks
+###############################################
+
+executionUnitCache = {}
+
+def clearExecutionUnitCache():
+    executionUnitCache.clear()
+    
+# undo replaces all Blender data, so the resolved references become invalid
+def resetExecutionUnitGlobals():
+    for executionUnit in executionUnitCache.values():
+        executionUnit.resetExecutionGlobals()
+    
+def removeUnusedExecutionUnitsFromCache(executionUnits):
+    for fingerprint, executionUnit in list(executionUnitCache.items()):
+        if executionUnit not in executionUnits:
+            del executionUnitCache[fingerprint]
+
+# contains everything the generated code depends on:
+# the nodes of the network and of all called loops and groups, their links and in-line code
+def getNetworkFingerprint(network):
+    fingerprintParts = [useProfiling]
+    for node in getNodesUsedByNetwork(network):
+        fingerprintParts.append(getNodeFingerprint(node))
+    return tuple(fingerprintParts)
+    
+def getNodesUsedByNetwork(network):
+    nodes = []
+    foundNetworks = [network]
+    uncheckedNetworks = [network]
+    while len(uncheckedNetworks) > 0:
+        checkNetwork = uncheckedNetworks.pop()
+        nodes.extend(checkNetwork.nodes)
+        for calledNetwork in getCalledNetworks(checkNetwork):
+            if calledNetwork not in foundNetworks:
+                foundNetworks.append(calledNetwork)
+                uncheckedNetworks.append(calledNetwork)
+    return nodes
+    
+def getCalledNetworks(network):
+    calledNetworks = []
+    for node in network.nodes:
+        if isLoopCallerNode(node):
+            calledNetworks.append(loopNetworks.get(node.getStartNode()))
+        elif isGroupCallerNode(node):
+            calledNetworks.append(groupNetworks.get(node.getInputNode()))
+    return [calledNetwork for calledNetwork in calledNetworks if calledNetwork is not None]
+    
+def getNodeFingerprint(node):
+    fingerprintParts = [node.id_data.name, node.name, node.bl_idname]
+    for socket in node.inputs:
+        originSocket = treeInfo.getDataOriginSocket(socket)
+        origin = None
+        if originSocket is not None:
+            origin = (originSocket.node.id_data.name, originSocket.node.name, originSocket.identifier)
+        fingerprintParts.append((socket.identifier, socket.name, socket.bl_idname, origin))
+    for socket in node.outputs:
+        targetAmount = len(treeInfo.getDataTargetSockets(socket))
+        fingerprintParts.append((socket.identifier, socket.name, socket.bl_idname, getattr(socket, "loopAsList", False), targetAmount))
+    updateSettingsNode = treeInfo.getUpdateSettingsNode(node)
+    if updateSettingsNode is not None:
+        fingerprintParts.append((updateSettingsNode.id_data.name, updateSettingsNode.name))
+    if getattr(node, "useInLineExecution", lambda: False)():
+        fingerprintParts.append(node.getInLineExecutionString(getOutputUseDictionary(node)))
+    if getattr(node, "cacheResults", False):
+        fingerprintParts.append(("cached", node.cacheSize))
+    fingerprintParts.append(tuple(getNodeAnimationPaths(node)))
+    return tuple(fingerprintParts)
+    
+
 # get node networks (groups of connected nodes)
 ###############################################
         
@@ -161,34 +303,56 @@ class NetworkCodeGenerator:
         self.executeNodes = []
         self.outputUseNodes = []
         self.determinedNodesCode = []
+        self.constantNodesCode = []
+        self.constantNodeKeys = {}
+        self.constantOutputNames = set()
+        self.constantParentKeys = {}
+        self.foldedNodes = set()
+        self.functionNodes = set()
+        self.executionPositions = {}
+        self.avoidedCopies = []
+        self.profiledNodes = []
+        self.vectorizedLoops = {}
+        self.batchedSockets = set()
+        self.batchExecuteNodes = []
+        self.cachedGroups = {}
+        self.groupCacheNodeKeys = {}
+        self.timeDependentGroups = []
+        self.eliminatedNodes = []
         
         self.updateSettingsNode = None
+        self.setupCode = ""
         self.generatedCode = ""
         
     def generateCode(self):
         mainCode = self.getMainCode()
         
+        setupParts = []
+        setupParts.append("import " + ", ".join(self.modules))
+        setupParts.append("animation_nodes = sys.modules['{}']".format(addonName))
+        setupParts.append(self.getNodeTreeReferencingCode())
+        setupParts.append(self.getNodeReferencingCode())
+        setupParts.append(self.getNodeExecuteReferencingCode())
+        setupParts.append(self.getSocketReferencingCode())
+        setupParts.append(self.getOutputUseDeclarationCode())
+        setupParts.append(self.getGroupResultCacheReferencingCode())
+        
         codeParts = []
-        codeParts.append("import " + ", ".join(self.modules))
-        codeParts.append("animation_nodes = sys.modules['{}']".format(addonName))
         codeParts.append("scene = bpy.context.scene")
-        codeParts.append(self.getNodeTreeReferencingCode())
-        codeParts.append(self.getNodeReferencingCode())
-        codeParts.append(self.getNodeExecuteReferencingCode())
-        codeParts.append(self.getSocketReferencingCode())
+        codeParts.append(self.getGroupResultCacheFrameCode())
         codeParts.append(self.getSocketValueReferencingCode())
-        codeParts.append(self.getOutputUseDeclarationCode())
-        codeParts.append(self.getTimerDefinitions())
+        codeParts.append(self.getNodeProfileReferencingCode())
         codeParts.append(self.getFunctionsCode())
         codeParts.append(self.getDeterminedNodesCode())
         codeParts.append(mainCode)
-        codeParts.append(self.getCodeToPrintProfilingResult())
         
+        self.setupCode = "\n".join(setupParts)
         self.generatedCode = "\n".join(codeParts)
         
     def getMainCode(self):
         self.allNodesInTree.extend(self.network.nodes)
         orderedNodes = orderNodes(self.network.nodes)
+        self.setExecutionPositions(orderedNodes)
         codeLines = []
         for node in orderedNodes:
             if self.updateSettingsNode is None:
@@ -199,19 +363,20 @@ class NetworkCodeGenerator:
     def makeLoopCode(self, loopNetwork):
         startNode = loopNetwork.getLoopStartNode()
         if startNode not in self.functions:
-            self.functions[startNode] = self.getLoopCode(loopNetwork, startNode)
+            if self.isVectorizedLoop(startNode): self.functions[startNode] = self.getVectorizedLoopCode(loopNetwork, startNode)
+            else: self.functions[startNode] = self.getLoopCode(loopNetwork, startNode)
     def getLoopCode(self, loopNetwork, startNode):
         self.allNodesInTree.extend(loopNetwork.nodes)
+        self.functionNodes.update(loopNetwork.nodes)
         orderedNodes = orderNodes(loopNetwork.nodes)
+        self.setExecutionPositions(orderedNodes)
         mainLines = []
-        mainLines.append("def " + getNodeFunctionName(startNode) + "(" + getNodeOutputName(startNode) + "):")
-        mainLines.append("    " + self.getTimerGlobalList(loopNetwork))
+        mainLines.append(getFunctionDeclarationString(startNode))
         for node in orderedNodes:
             if node != startNode:
                 codeLines = self.getNodeCodeLines(node)
                 self.setIndentationOnEveryLine(codeLines)
                 mainLines.extend(codeLines)
-        if useProfiling: mainLines.append("    globals().update(locals())")
         mainLines.append("    pass")
         functionString = "\n".join(mainLines)
         return functionString
@@ -224,7 +389,9 @@ class NetworkCodeGenerator:
         
     def getNodeCodeLines(self, node):
         codeLines = []
-        if isExecuteableNode(node) or isInLineNode(node):
+        if not isLiveNode(node):
+            self.eliminatedNodes.append(node)
+        elif isExecuteableNode(node) or isInLineNode(node):
             codeLines.extend(self.getExecutableNodeCode(node))
         elif isLoopCallerNode(node):
             codeLines.extend(self.getLoopNodeCode(node))
@@ -235,13 +402,17 @@ class NetworkCodeGenerator:
     def getExecutableNodeCode(self, node):
         codeLines = []
         lines = self.getNodeExecutionLines(node)
-        if isDeterminedNode(node):
+        if useProfiling: lines = self.getProfiledLines(node, lines)
+        if self.isConstantNode(node):
+            self.foldedNodes.add(node)
+            self.constantNodesCode.append((node, lines))
+        elif isDeterminedNode(node):
             self.determinedNodesCode.extend(lines)
         else:
-            if useProfiling: codeLines.append(getNodeTimerStartName(node) + " = time.clock()")
             codeLines.extend(lines)
-            if useProfiling: codeLines.append(getNodeTimerName(node) + " += time.clock() - " + getNodeTimerStartName(node))
         return codeLines
+    # the iterations run one after another on the main thread, because nodes access bpy data
+    # which isn't thread safe, independent iterations are sped up by vectorization instead
     def getLoopNodeCode(self, node):
         codeLines = []
         codeLines.append(getNodeInputName(node) + " = " + self.generateInputListString(node))
@@ -249,16 +420,10 @@ class NetworkCodeGenerator:
         if startNode is not None:
             fromListSockets = startNode.getSocketDescriptions()[0]
             
-            if len(fromListSockets) == 0:
-                codeLines.append(getNodeInputName(node) + "['List Length'] = " + getNodeInputName(node) + "['Amount']")
-                codeLines.append("for " + getNodeInputName(node) + "['Index'] in range(" + getNodeInputName(node) + "['Amount']):")
+            if self.isVectorizedLoop(startNode):
+                codeLines.extend(self.getVectorizedLoopCallLines(node, fromListSockets))
             else:
-                codeLines.append("try: " + self.getZipListCode(node, fromListSockets))
-                codeLines.append("except: zippedList = []")
-                codeLines.append(getNodeInputName(node) + "['List Length'] = len(zippedList)")
-                codeLines.append(self.getEnumerateLoopHeader(node, fromListSockets))
-            
-            codeLines.append("    " + getNodeFunctionName(startNode) + "(" + getNodeInputName(node) + ")")
+                codeLines.extend(self.getLoopCallLines(node, fromListSockets))
             self.makeLoopCode(loopNetworks[startNode])
         codeLines.append(getNodeOutputName(node) + " = " + getNodeInputName(node))
         return codeLines
@@ -276,25 +441,189 @@ class NetworkCodeGenerator:
         codeParts.append("))")
         
         return "".join(codeParts)
-    # for (input['Index'], (element1, element2, element3,)) in enumerate(zippedList):
-    def getEnumerateLoopHeader(self, node, fromListSockets):
-        codeParts = []
-        codeParts.append("for (" + getNodeInputName(node) + "['Index']" + ", (")
+    # the loop function gets every value as parameter, so an iteration only uses local variables
+    def getLoopCallLines(self, node, fromListSockets):
+        startNode = node.getStartNode()
+        argumentNames = dict((socket.identifier, getLoopArgumentName(node, socket)) for socket in getParameterSockets(startNode))
+        codeLines = []
+        if len(fromListSockets) == 0:
+            codeLines.append(argumentNames["List Length"] + " = " + getNodeInputName(node) + "['Amount']")
+        else:
+            codeLines.append("try: " + self.getZipListCode(node, fromListSockets))
+            codeLines.append("except: zippedList = []")
+            codeLines.append(argumentNames["List Length"] + " = len(zippedList)")
+        for socket in getParameterSockets(startNode):
+            if isLoopOptionSocket(socket, startNode):
+                codeLines.append(argumentNames[socket.identifier] + " = " + getNodeInputName(node) + "['" + socket.identifier + "']")
+        if len(fromListSockets) == 0:
+            codeLines.append("for " + argumentNames["Index"] + " in range(" + argumentNames["List Length"] + "):")
+        else:
+            codeLines.append(self.getEnumerateLoopHeader(argumentNames["Index"], [argumentNames[socket.identifier] for socket in fromListSockets], "zippedList"))
+        codeLines.append("    " + getLoopFunctionCall(startNode, argumentNames))
+        return codeLines
         
-        listVariables = []
-        for socket in fromListSockets:
-            listVariables.append(getNodeInputName(node) + "['" + socket.identifier + "']")
-            
-        codeParts.append(", ".join(listVariables))
-        codeParts.append(",)) in enumerate(zippedList):")
+    # for index, (element1, element2, element3,) in enumerate(zippedList):
+    def getEnumerateLoopHeader(self, indexName, elementNames, listName):
+        return "for " + indexName + ", (" + ", ".join(elementNames) + ",) in enumerate(" + listName + "):"
         
-        return "".join(codeParts)
+    # vectorized loops
+    # a loop whose nodes only calculate values per element (and collect them with Append to List)
+    # calls its function once: every node gets the lists of all elements, others are executed once
+    def isVectorizedLoop(self, startNode):
+        if startNode not in self.vectorizedLoops:
+            self.vectorizedLoops[startNode] = self.canVectorizeLoop(loopNetworks[startNode], startNode)
+        return self.vectorizedLoops[startNode]
+    def canVectorizeLoop(self, loopNetwork, startNode):
+        elementSockets = set(socket for socket in startNode.outputs if socket.identifier == "Index" or getattr(socket, "loopAsList", False))
+        for node in orderNodes(loopNetwork.nodes):
+            if node == startNode or not isLiveNode(node) or self.isConstantNode(node) or isDeterminedNode(node): continue
+            if any(treeInfo.getDataOriginSocket(socket) in elementSockets for socket in node.inputs):
+                if not self.canBatchNode(node, startNode, elementSockets): return False
+                elementSockets.update(node.outputs)
+            # executing them once instead of per element only doesn't change pure nodes
+            elif not isPureNode(node): return False
+        self.batchedSockets.update(elementSockets)
+        return True
+    def canBatchNode(self, node, startNode, elementSockets):
+        if hasBatchExecutionString(node):
+            invariantInputs = [socket for socket in node.inputs if isBatchInvariantInput(socket)]
+            for socket in invariantInputs:
+                originSocket = treeInfo.getDataOriginSocket(socket)
+                if getattr(originSocket, "node", None) != startNode or originSocket in elementSockets: return False
+            return len(invariantInputs) == 0 or not any(isOutputSocketUsed(socket) for socket in node.outputs)
+        if not isPureNode(node) or not usesFastCall(node) or usesOutputUseParameter(node) or len(node.outputs) != 1: return False
+        if hasBatchExecuteFunction(node): return True
+        if getattr(node, "useInLineExecution", lambda: False)():
+            inLineString = node.getInLineExecutionString(getOutputUseDictionary(node))
+            return inLineString.strip() == "" or getAssignedExpression(inLineString, node.getOutputSocketNames()[node.outputs[0].identifier]) is not None
+        return isExecuteableNode(node)
+        
+    def getVectorizedLoopCallLines(self, node, fromListSockets):
+        inputName = getNodeInputName(node)
+        startNode = node.getStartNode()
+        argumentNames = dict((socket.identifier, getLoopArgumentName(node, socket)) for socket in getParameterSockets(startNode))
+        lengthName = argumentNames["List Length"]
+        codeLines = []
+        if len(fromListSockets) == 0:
+            codeLines.append(lengthName + " = " + inputName + "['Amount']")
+        else:
+            listNames = [inputName + "['" + socket.identifier + "list']" for socket in fromListSockets]
+            codeLines.append("try:")
+            if len(listNames) == 1: codeLines.append("    " + lengthName + " = len(" + listNames[0] + ")")
+            else: codeLines.append("    " + lengthName + " = min(" + ", ".join("len(" + listName + ")" for listName in listNames) + ")")
+            for socket, listName in zip(fromListSockets, listNames):
+                if len(listNames) == 1: codeLines.append("    " + argumentNames[socket.identifier] + " = " + listName)
+                else: codeLines.append("    " + argumentNames[socket.identifier] + " = " + listName + "[:" + lengthName + "]")
+            codeLines.append("except:")
+            codeLines.append("    " + lengthName + " = 0")
+            for socket in fromListSockets:
+                codeLines.append("    " + argumentNames[socket.identifier] + " = []")
+        for socket in getParameterSockets(startNode):
+            if isLoopOptionSocket(socket, startNode):
+                argumentNames[socket.identifier] = inputName + "['" + socket.identifier + "']"
+        argumentNames["Index"] = "range(" + lengthName + ")"
+        codeLines.append(getLoopFunctionCall(startNode, argumentNames))
+        return codeLines
+        
+    def getVectorizedLoopCode(self, loopNetwork, startNode):
+        self.allNodesInTree.extend(loopNetwork.nodes)
+        self.functionNodes.update(loopNetwork.nodes)
+        orderedNodes = orderNodes(loopNetwork.nodes)
+        self.setExecutionPositions(orderedNodes)
+        lengthName = getOutputValueVariable(startNode.outputs["List Length"])
+        mainLines = []
+        mainLines.append(getFunctionDeclarationString(startNode))
+        for node in orderedNodes:
+            if node == startNode: continue
+            if isLiveNode(node) and any(treeInfo.getDataOriginSocket(socket) in self.batchedSockets for socket in node.inputs):
+                codeLines = self.getBatchedNodeCodeLines(node, lengthName)
+            else: codeLines = self.getNodeCodeLines(node)
+            self.setIndentationOnEveryLine(codeLines)
+            mainLines.extend(codeLines)
+        mainLines.append("    pass")
+        return "\n".join(mainLines)
+        
+    def getBatchedNodeCodeLines(self, node, lengthName):
+        if hasBatchExecutionString(node):
+            if hasattr(node, "getModuleList"): self.modules.update(node.getModuleList())
+            batchString = node.getBatchExecutionString(getOutputUseDictionary(node))
+            for identifier, name in node.getInputSocketNames().items():
+                batchString = batchString.replace("%" + name + "%", self.getBatchInputString(node.inputs[identifier], lengthName))
+            for identifier, name in node.getOutputSocketNames().items():
+                batchString = batchString.replace("$" + name + "$", getOutputValueVariable(node.outputs[identifier]))
+            lines = batchString.strip().split("\n")
+        elif hasBatchExecuteFunction(node):
+            self.batchExecuteNodes.append(node)
+            inputParts = [name + " = " + self.getBatchInputString(node.inputs[identifier], lengthName) for identifier, name in node.getInputSocketNames().items()]
+            lines = [getOutputValueVariable(node.outputs[0]) + " = " + getNodeBatchExecutionName(node) + "(" + ", ".join(inputParts) + ")"]
+        else:
+            lines = self.getElementComprehensionLines(node)
+        if useProfiling: lines = self.getProfiledLines(node, lines)
+        return lines
+        
+    # output = [a + b for element_0, element_1 in zip(listA, listB)]
+    def getElementComprehensionLines(self, node):
+        inputSocketNames = node.getInputSocketNames()
+        elementLists = []
+        inputStrings = {}
+        for socket in node.inputs:
+            originSocket = treeInfo.getDataOriginSocket(socket)
+            if originSocket in self.batchedSockets:
+                elementName = "element_" + str(len(elementLists))
+                elementLists.append(getOutputValueVariable(originSocket))
+                if self.copyValueBeforeUsing(socket, originSocket): elementName = self.makeCopyFunction(socket, originSocket) + "(" + elementName + ")"
+                inputStrings[socket.identifier] = elementName
+            else:
+                if originSocket is None: self.neededSocketReferences.append(socket)
+                inputStrings[socket.identifier] = self.getInputValueString(socket)
+                
+        if getattr(node, "useInLineExecution", lambda: False)():
+            if hasattr(node, "getModuleList"): self.modules.update(node.getModuleList())
+            inLineString = node.getInLineExecutionString(getOutputUseDictionary(node))
+            if inLineString.strip() == "": return []
+            expression = getAssignedExpression(inLineString, node.getOutputSocketNames()[node.outputs[0].identifier])
+            for identifier, name in inputSocketNames.items():
+                expression = expression.replace("%" + name + "%", inputStrings[identifier])
+        else:
+            self.executeNodes.append(node)
+            expression = getNodeExecutionName(node) + "(" + ", ".join(name + " = " + inputStrings[identifier] for identifier, name in inputSocketNames.items()) + ")"
+        
+        elementNames = ["element_" + str(i) for i in range(len(elementLists))]
+        if len(elementLists) == 1: loopHeader = elementNames[0] + " in " + elementLists[0]
+        else: loopHeader = ", ".join(elementNames) + " in zip(" + ", ".join(elementLists) + ")"
+        return [getOutputValueVariable(node.outputs[0]) + " = [" + expression + " for " + loopHeader + "]"]
+        
+    # lists of elements are passed on, the other values are repeated for every element
+    def getBatchInputString(self, socket, lengthName):
+        originSocket = treeInfo.getDataOriginSocket(socket)
+        if originSocket is None: self.neededSocketReferences.append(socket)
+        variable = self.getInputValueVariable(socket, originSocket)
+        copyValue = self.copyValueBeforeUsing(socket, originSocket)
+        if originSocket in self.batchedSockets:
+            if copyValue: return "[" + self.makeCopyFunction(socket, originSocket) + "(value) for value in " + variable + "]"
+            return variable
+        if isBatchInvariantInput(socket): return self.getInputValueString(socket)
+        if copyValue: return "[" + self.getInputValueString(socket) + " for index in range(" + lengthName + ")]"
+        return "[" + variable + "] * " + lengthName
+        
+    # values are passed to loop and group functions as positional arguments and returned as tuple
+    def getFunctionArguments(self, sockets):
+        arguments = []
+        for socket in sockets:
+            if not treeInfo.hasOtherDataOrigin(socket): self.neededSocketReferences.append(socket)
+            arguments.append(self.getInputValueString(socket))
+        return arguments
         
     def getGroupNodeCode(self, node):
         codeLines = []
         inputNode = node.getInputNode()
         if inputNode is not None:
-            codeLines.append(getNodeOutputName(node) + " = " + getNodeFunctionName(inputNode) + "(" + self.generateInputListString(node) + ")")
+            arguments = self.getFunctionArguments(node.inputs)
+            if len(node.outputs) > 0 and self.isCachedGroup(inputNode):
+                functionCall = getNodeResultCacheName(inputNode) + ".call(" + getNodeFunctionName(inputNode) + ", " + getTupleString(arguments) + ")"
+            else: functionCall = getNodeFunctionName(inputNode) + "(" + ", ".join(arguments) + ")"
+            if len(node.outputs) == 0: codeLines.append(functionCall)
+            else: codeLines.append(getTupleString([getOutputValueVariable(socket) for socket in node.outputs]) + " = " + functionCall)
             self.makeGroupCode(inputNode)
         return codeLines
         
@@ -305,48 +634,112 @@ class NetworkCodeGenerator:
             self.functions[inputNode] = self.getGroupCode(groupNetwork, inputNode, outputNode)
     def getGroupCode(self, groupNetwork, inputNode, outputNode):
         self.allNodesInTree.extend(groupNetwork.nodes)
+        self.functionNodes.update(groupNetwork.nodes)
         codeLines = []
-        codeLines.append("def " + getNodeFunctionName(inputNode) + "(" + getNodeOutputName(inputNode) + "):")
-        codeLines.append("    " + self.getTimerGlobalList(groupNetwork))
+        codeLines.append(getFunctionDeclarationString(inputNode))
         orderedNodes = orderNodes(groupNetwork.nodes)
+        self.setExecutionPositions(orderedNodes)
         for node in orderedNodes:
             if node not in [inputNode, outputNode]:
                 nodeCodeLines = self.getNodeCodeLines(node)
                 self.setIndentationOnEveryLine(nodeCodeLines)
                 codeLines.extend(nodeCodeLines)
-        if useProfiling: codeLines.append("    globals().update(locals())")
         if outputNode is not None:
-            codeLines.append("    return " + self.generateInputListString(outputNode))
+            codeLines.append("    return " + getTupleString(self.getFunctionArguments(outputNode.getSockets())))
         else: codeLines.append("    pass")
         return "\n".join(codeLines)
         
-    def getTimerDefinitions(self):
-        if useProfiling:
-            codeLines = []
-            for node in self.allNodesInTree:
-                codeLines.append(getNodeTimerName(node) + " = 0")
-            return "\n" + "\n".join(codeLines) + "\n"
-        return ""
-    def getTimerGlobalList(self, network):
-        if useProfiling:
-            nodeTimerNames = []
-            for node in network.nodes:
-                nodeTimerNames.append(getNodeTimerName(node))
-            return "global " + ", ".join(nodeTimerNames)
-        return ""
-        
-    def getCodeToPrintProfilingResult(self):
-        if useProfiling:
-            codeLines = []
-            codeLines.append("print('----------  Profiling  ----------')")
-            for node in self.allNodesInTree:
-                codeLines.append("print('" + node.name + "')")
-                codeLines.append("print('  ' + str(round(" + getNodeTimerName(node) + ", 5)) + ' s')")
-            return "\n" + "\n".join(codeLines)
-        return ""
+    # cached groups
+    # groups that only calculate values remember their outputs for the inputs of earlier calls,
+    # the cache is cleared when the nodes change and, if the group reads the time, on frame changes
+    def isCachedGroup(self, inputNode):
+        if not getattr(inputNode, "cacheResults", False): return False
+        if inputNode not in self.cachedGroups:
+            self.cachedGroups[inputNode] = self.canCacheGroup(groupNetworks[inputNode], inputNode)
+            if self.cachedGroups[inputNode]: self.makeGroupResultCache(groupNetworks[inputNode], inputNode)
+        return self.cachedGroups[inputNode]
+    def canCacheGroup(self, groupNetwork, inputNode):
+        for node in getNodesUsedByNetwork(groupNetwork):
+            if node.bl_idname in ["mn_GroupInput", "mn_GroupOutput", "mn_LoopStartNode"] or isLoopCallerNode(node) or isGroupCallerNode(node): continue
+            if getattr(node, "isDetermined", False): continue
+            if bpy.context.scene.mn_settings.developer.printGenerationTime:
+                print("Results of group '" + inputNode.groupName + "' are not cached because '" + node.name + "' may have side effects")
+            return False
+        return True
+    def makeGroupResultCache(self, groupNetwork, inputNode):
+        nodes = getNodesUsedByNetwork(groupNetwork)
+        self.groupCacheNodeKeys[inputNode.groupName] = set((node.id_data.name, node.name) for node in nodes)
+        if any(getattr(node, "readsExternalData", False) or isNodeAnimated(node) for node in nodes):
+            self.timeDependentGroups.append(inputNode)
+            
+    def getGroupResultCacheReferencingCode(self):
+        codeLines = []
+        for inputNode, isCached in self.cachedGroups.items():
+            if isCached:
+                codeLines.append(getNodeResultCacheName(inputNode) + " = animation_nodes.mn_cache.getGroupResultCache(" + repr(inputNode.groupName) + ", " + str(inputNode.cacheSize) + ")")
+        return "\n".join(codeLines)
+        
+    def getGroupResultCacheFrameCode(self):
+        codeLines = []
+        for inputNode in self.timeDependentGroups:
+            codeLines.append(getNodeResultCacheName(inputNode) + ".setFrame(scene.frame_current_final)")
+        return "\n".join(codeLines)
+        
+    # profiling
+    # every node records its time, calls and output size in the profiler of the current update
+    def getProfiledLines(self, node, lines):
+        self.profiledNodes.append(node)
+        profiledLines = [getNodeTimerStartName(node) + " = time.clock()"]
+        profiledLines.extend(lines)
+        outputVariables = [getOutputValueVariable(socket) for socket in node.outputs if isOutputSocketUsed(socket)]
+        profiledLines.append(getNodeProfileName(node) + ".record(" + ", ".join(["time.clock() - " + getNodeTimerStartName(node)] + outputVariables) + ")")
+        return profiledLines
+        
+    def getNodeProfileReferencingCode(self):
+        codeLines = []
+        for node in self.profiledNodes:
+            codeLines.append(getNodeProfileName(node) + " = animation_nodes.mn_profiler.getNodeProfile(" + repr(node.id_data.name) + ", " + repr(node.name) + ")")
+        return "\n".join(codeLines)
+        
+    # constant folding
+    # nodes which only depend on socket values and other constant nodes keep
+    # their outputs in the unit memory and are only executed when they changed
+    def isConstantNode(self, node):
+        return self.getConstantParentKeys(node) is not None
+    def getConstantParentKeys(self, node):
+        if node not in self.constantParentKeys:
+            self.constantParentKeys[node] = self.findConstantParentKeys(node)
+        return self.constantParentKeys[node]
+    def findConstantParentKeys(self, node):
+        if not isDeterminedNode(node) or getattr(node, "readsExternalData", False) or isNodeAnimated(node): return None
+        nodeKeys = set([(node.id_data.name, node.name)])
+        for socket in node.inputs:
+            originNode = treeInfo.getDataOriginNode(socket)
+            if originNode is not None:
+                parentKeys = self.getConstantParentKeys(originNode)
+                if parentKeys is None: return None
+                nodeKeys.update(parentKeys)
+        return nodeKeys
+        
+    def getConstantNodesCode(self):
+        codeLines = []
+        for node, lines in self.constantNodesCode:
+            variableName = getNodeVariableName(node)
+            self.constantNodeKeys[variableName] = self.getConstantParentKeys(node)
+            self.constantOutputNames.update(getNodeOutputVariables(node))
+            codeLines.append("if '" + variableName + "' in dirty_nodes:")
+            nodeLines = []
+            for socket in self.neededSocketReferences:
+                if socket.node == node:
+                    nodeLines.append(self.getSocketDeclarationString(socket))
+            nodeLines.extend(lines)
+            nodeLines.append("pass")
+            self.setIndentationOnEveryLine(nodeLines)
+            codeLines.extend(nodeLines)
+        return "\n".join(codeLines)
         
     def getDeterminedNodesCode(self):
-        return "\n".join(self.determinedNodesCode)
+        return self.getConstantNodesCode() + "\n" + "\n".join(self.determinedNodesCode)
         
     def getNodeTreeReferencingCode(self):
         nodeTrees = []
@@ -369,6 +762,8 @@ class NetworkCodeGenerator:
         codeLines = []
         for node in self.executeNodes:
             codeLines.append(self.getNodeFunctionDeclarationString(node))
+        for node in self.batchExecuteNodes:
+            codeLines.append(getNodeBatchExecutionName(node) + " = " + getNodeVariableName(node) + ".executeBatch")
         return "\n".join(codeLines)
     
     def getSocketReferencingCode(self):
@@ -380,7 +775,8 @@ class NetworkCodeGenerator:
     def getSocketValueReferencingCode(self):
         codeLines = []
         for socket in self.neededSocketReferences:
-            codeLines.append(self.getSocketDeclarationString(socket))
+            if socket.node not in self.foldedNodes:
+                codeLines.append(self.getSocketDeclarationString(socket))
         return "\n".join(codeLines)
         
     def getOutputUseDeclarationCode(self):
@@ -467,6 +863,8 @@ class NetworkCodeGenerator:
             functionName = self.makeCopyFunction(socket, originSocket)
             return functionName + "(" + inputVariableName + ")"
         else:
+            if self.copiedValueBeforeOwnershipAnalysis(socket, originSocket):
+                self.avoidedCopies.append(inputVariableName)
             return inputVariableName
                 
     def getInputValueVariable(self, socket, originSocket):
@@ -475,12 +873,54 @@ class NetworkCodeGenerator:
         else:
             return getOutputValueVariable(originSocket)
             
+    # ownership analysis
+    # a node which may change an input value (every input that isn't in readOnlyInputs)
+    # only gets a copy when the value is read again later or has to survive the execution
     def copyValueBeforeUsing(self, socket, originSocket):
-        if hasattr(socket, "getCopyValueFunctionString") or hasattr(originSocket, "getCopyValueFunctionString"):
-            index = treeInfo.getTargetIndexFromOutputSocket(originSocket, socket)
-            amount = len(treeInfo.getDataTargetSockets(originSocket))
-            return originSocket is None or (amount >= 2)# and index < amount - 1)
-        return False
+        if not hasCopyValueFunction(socket, originSocket): return False
+        if isReadOnlyInput(socket): return False
+        node = socket.node
+        # socket values are read once and then used in every call of the loop or group
+        if originSocket is None: return self.isExecutedRepeatedly(node)
+        originNode = originSocket.node
+        # folded values must survive until the next execution
+        if self.isConstantNode(originNode): return True
+        # remembered outputs and inputs of cached groups are used again by later calls
+        if self.isCachedGroupValue(originNode): return True
+        if isDeterminedNode(originNode) and self.isExecutedRepeatedly(node): return True
+        # loop options are the same object in every iteration, a single reader (e.g. Append to List) may collect values in it
+        if originNode.bl_idname == "mn_LoopStartNode" and not originSocket.loopAsList:
+            return len(getLiveTargetSockets(originSocket)) >= 2
+        return not self.isLastReader(socket, originSocket)
+        
+    def isCachedGroupValue(self, node):
+        if isGroupCallerNode(node):
+            inputNode = node.getInputNode()
+            return inputNode is not None and len(node.outputs) > 0 and self.isCachedGroup(inputNode)
+        return node.bl_idname == "mn_GroupInput" and self.isCachedGroup(node)
+        
+    def copiedValueBeforeOwnershipAnalysis(self, socket, originSocket):
+        if not hasCopyValueFunction(socket, originSocket): return False
+        if originSocket is None: return True
+        return self.isConstantNode(originSocket.node) or len(treeInfo.getDataTargetSockets(originSocket)) >= 2
+        
+    def isExecutedRepeatedly(self, node):
+        return node in self.functionNodes and not isDeterminedNode(node)
+        
+    def isLastReader(self, socket, originSocket):
+        targetNodes = [targetSocket.node for targetSocket in getLiveTargetSockets(originSocket)]
+        lastNode = max(targetNodes, key = self.getExecutionPosition)
+        return socket.node == lastNode and targetNodes.count(lastNode) == 1
+        
+    # hoisted nodes are executed before the other nodes of the network
+    def getExecutionPosition(self, node):
+        if self.isConstantNode(node): block = 0
+        elif isDeterminedNode(node): block = 1
+        else: block = 2
+        return (block, self.executionPositions.get(node, -1))
+    def setExecutionPositions(self, orderedNodes):
+        for i, node in enumerate(orderedNodes):
+            self.executionPositions[node] = i
                 
     def makeCopyFunction(self, socket, originSocket):
         codeLines = []
@@ -497,6 +937,11 @@ class NetworkCodeGenerator:
         self.functions[functionName] = "\n".join(codeLines)
         return functionName
             
+def getNodeOutputVariables(node):
+    if usesFastCall(node) and len(node.outputs) != 0:
+        return [getOutputValueVariable(socket) for socket in node.outputs]
+    return [getNodeOutputName(node)]
+    
 def getNodeOutputString(node):
     if usesFastCall(node):
         outputSocketNames = node.getOutputSocketNames()
@@ -511,15 +956,20 @@ def getNodeOutputString(node):
 def getOutputUseDictionaryCode(node):
     codeParts = []
     for socket in node.outputs:
-        codeParts.append('"' + socket.identifier + '" : ' + str(treeInfo.isOutputSocketUsed(socket)))
+        codeParts.append('"' + socket.identifier + '" : ' + str(isOutputSocketUsed(socket)))
     return "{" + ", ".join(codeParts) + "}"
 def getOutputUseDictionary(node):
     outputUse = {}
     for socket in node.outputs:
-        outputUse[socket.identifier] = treeInfo.isOutputSocketUsed(socket)
+        outputUse[socket.identifier] = isOutputSocketUsed(socket)
     return outputUse
     
         
+def hasCopyValueFunction(socket, originSocket):
+    return hasattr(socket, "getCopyValueFunctionString") or hasattr(originSocket, "getCopyValueFunctionString")
+def isReadOnlyInput(socket):
+    return socket.identifier in getattr(socket.node, "readOnlyInputs", [])
+    
 def isExecuteableNode(node):
     return hasattr(node, "execute")
 def isInLineNode(node):
@@ -535,18 +985,120 @@ def usesFastCall(node):
         else: raise Exception()
     if hasattr(node, "getOutputSocketNames"): raise Exception()
     return False
+# the outputs of these nodes are the parameters or return values of loop and group functions
+def usesSlotOutputs(node):
+    return node.bl_idname in ["mn_LoopStartNode", "mn_GroupInput", "mn_GroupCaller"]
+def getParameterSockets(node):
+    return [socket for socket in node.outputs if socket.bl_idname != "mn_EmptySocket"]
+def getFunctionDeclarationString(node):
+    return "def " + getNodeFunctionName(node) + "(" + ", ".join(getOutputValueVariable(socket) for socket in getParameterSockets(node)) + "):"
+def getTupleString(names):
+    return "(" + "".join(name + ", " for name in names).rstrip() + ")"
+def getLoopFunctionCall(startNode, argumentNames):
+    return getNodeFunctionName(startNode) + "(" + ", ".join(argumentNames[socket.identifier] for socket in getParameterSockets(startNode)) + ")"
 def usesOutputUseParameter(node):
     return hasattr(node, "outputUseParameterName")
     
+def isPureNode(node):
+    return getattr(node, "isDetermined", False) and not getattr(node, "readsExternalData", False)
+def hasBatchExecutionString(node):
+    return hasattr(node, "getBatchExecutionString")
+def hasBatchExecuteFunction(node):
+    return hasattr(node, "executeBatch")
+def isBatchInvariantInput(socket):
+    return socket.identifier in getattr(socket.node, "batchInvariantInputs", [])
+def isLoopOptionSocket(socket, startNode):
+    if socket is None or socket.node != startNode: return False
+    return not getattr(socket, "loopAsList", False) and socket.identifier not in ["Index", "List Length"]
+    
+# returns the expression of in-line code like "$result$ = %a% + %b%"
+def getAssignedExpression(inLineString, outputName):
+    lines = inLineString.strip().split("\n")
+    start = "$" + outputName + "$ = "
+    if len(lines) != 1 or not lines[0].startswith(start): return None
+    expression = lines[0][len(start):]
+    if "$" in expression: return None
+    return expression
+    
 
 def getOutputValueVariable(socket):
+    if usesSlotOutputs(socket.node):
+        return getNodeOutputName(socket.node) + "_" + str(socket.node.outputs.find(socket.name))
     if usesFastCall(socket.node):
         outputSocketNames = socket.node.getOutputSocketNames()
         return getNodeOutputName(socket.node) + "_" + outputSocketNames[socket.identifier]
     else:
         return getNodeOutputName(socket.node) + "['" + socket.identifier + "']"
         
+# keyframes and drivers can change the properties and socket values of a node
+def isNodeAnimated(node):
+    return len(getNodeAnimationPaths(node)) > 0
+def getNodeAnimationPaths(node):
+    dataPathStart = 'nodes["' + node.name + '"]'
+    return [dataPath for dataPath in getAnimatedDataPaths(node.id_data) if dataPath.startswith(dataPathStart)]
+def getAnimatedDataPaths(nodeTree):
+    animationData = nodeTree.animation_data
+    if animationData is None: return []
+    fCurves = list(animationData.drivers)
+    if animationData.action is not None: fCurves.extend(animationData.action.fcurves)
+    return [fCurve.data_path for fCurve in fCurves]
+    
+# units have to be generated again when a node gets or loses its keyframes or drivers,
+# because only nodes which aren't animated are folded
+def getAnimationState():
+    return tuple((nodeTree.name, tuple(getAnimatedDataPaths(nodeTree))) for nodeTree in getAnimationNodeTrees())
+        
+# dead node elimination
+# only nodes with side effects and the nodes they depend on are executed,
+# determined nodes whose outputs aren't used by them can't change anything
+deadNodes = set()
+def findDeadNodes(networks):
+    deadNodes.clear()
+    for network in networks:
+        liveNodes = set(node for node in network.nodes if isSideEffectNode(node))
+        uncheckedNodes = list(liveNodes)
+        while len(uncheckedNodes) > 0:
+            node = uncheckedNodes.pop()
+            for socket in node.inputs:
+                originNode = treeInfo.getDataOriginNode(socket)
+                if originNode is not None and originNode not in liveNodes:
+                    liveNodes.add(originNode)
+                    uncheckedNodes.append(originNode)
+        deadNodes.update(node for node in network.nodes if node not in liveNodes)
+def isLiveNode(node):
+    return node not in deadNodes
+def isSideEffectNode(node):
+    if node.bl_idname in ["mn_GroupInput", "mn_LoopStartNode", "mn_GroupOutput"]: return True
+    if changesFunctionParameter(node): return True
+    if isLoopCallerNode(node) or isGroupCallerNode(node): return calledNetworkHasSideEffects(node)
+    return not getattr(node, "isDetermined", False)
+# e.g. Append to List collecting values in a loop option
+def changesFunctionParameter(node):
+    for socket in node.inputs:
+        originSocket = treeInfo.getDataOriginSocket(socket)
+        if originSocket is None or originSocket.node.bl_idname not in ["mn_GroupInput", "mn_LoopStartNode"]: continue
+        if hasCopyValueFunction(socket, originSocket) and not isReadOnlyInput(socket): return True
+    return False
+def calledNetworkHasSideEffects(node):
+    if isLoopCallerNode(node): calledNetwork = loopNetworks.get(node.getStartNode())
+    else: calledNetwork = groupNetworks.get(node.getInputNode())
+    if calledNetwork is None: return True
+    for calledNode in getNodesUsedByNetwork(calledNetwork):
+        if calledNode.bl_idname in ["mn_GroupInput", "mn_LoopStartNode", "mn_GroupOutput"] or isLoopCallerNode(calledNode) or isGroupCallerNode(calledNode): continue
+        if not getattr(calledNode, "isDetermined", False): return True
+    return False
+    
+def getLiveTargetSockets(socket):
+    return [targetSocket for targetSocket in treeInfo.getDataTargetSockets(socket) if isLiveNode(targetSocket.node)]
+def isOutputSocketUsed(socket):
+    return len(getLiveTargetSockets(socket)) > 0
+        
+determinedNodes = {}
 def isDeterminedNode(node):
+    if node not in determinedNodes:
+        determinedNodes[node] = findIfNodeIsDetermined(node)
+    return determinedNodes[node]
+def findIfNodeIsDetermined(node):
     if getattr(node, "isDetermined", False):
         for socket in node.inputs:
             originNode = treeInfo.getDataOriginNode(socket)
@@ -567,10 +1119,16 @@ def getNodeFunctionName(node):
     return getNodeVariableName(node) + "_" + "Function"
 def getNodeExecutionName(node):
     return getNodeVariableName(node) + "_" + "execute"
+def getNodeBatchExecutionName(node):
+    return getNodeVariableName(node) + "_" + "executeBatch"
+def getLoopArgumentName(callerNode, socket):
+    return "loop_" + str(callerNode.codeIndex) + "_" + str(socket.node.outputs.find(socket.name))
+def getNodeResultCacheName(node):
+    return getNodeVariableName(node) + "_result_cache"
 def getNodeTimerStartName(node):
     return "timer_start_" + str(node.codeIndex)
-def getNodeTimerName(node):
-    return "timer_" + str(node.codeIndex)
+def getNodeProfileName(node):
+    return "profile_" + str(node.codeIndex)
 def getInputSocketValueName(socket):
     node = socket.node
     return getNodeVariableName(node) + "_socketvalue_" + str(node.inputs.find(socket.name))
@@ -588,25 +1146,41 @@ def getCopyValueFunctionName(socket):
     
 # order nodes (network) to possible execution sequence
 ######################################################
+
+class NodeCycleError(Exception):
+    pass
     
 def orderNodes(nodes):
-    preOrderedList = []
-    for node in nodes:
-        preOrderedList.extend(getAllNodeDependencies(node))
-        preOrderedList.append(node)
-    
+    nodeSet = set(nodes)
     orderedList = []
-    for node in preOrderedList:
-        if node not in orderedList and node in nodes: orderedList.append(node)
+    visitedNodes = set()
+    for node in nodes:
+        if node in visitedNodes: continue
+        visitedNodes.add(node)
+        
+        # iterative depth first search, nodes on the stack are not finished yet
+        stack = [(node, iter(getDirectDependencies(node)))]
+        activeNodes = set([node])
+        while len(stack) > 0:
+            currentNode, dependencies = stack[-1]
+            for dependency in dependencies:
+                if dependency in activeNodes:
+                    raise NodeCycleError(getCycleErrorMessage(stack, dependency))
+                if dependency not in visitedNodes:
+                    visitedNodes.add(dependency)
+                    activeNodes.add(dependency)
+                    stack.append((dependency, iter(getDirectDependencies(dependency))))
+                    break
+            else:
+                del stack[-1]
+                activeNodes.discard(currentNode)
+                if currentNode in nodeSet: orderedList.append(currentNode)
     return orderedList
-
-def getAllNodeDependencies(node):
-    dependencies = []
-    directDependencies = getDirectDependencies(node)
-    for directDependency in directDependencies:
-        dependencies.extend(getAllNodeDependencies(directDependency))
-    dependencies.extend(directDependencies)
-    return dependencies
+    
+def getCycleErrorMessage(stack, node):
+    stackNodes = [stackNode for stackNode, dependencies in stack]
+    cycleNodes = stackNodes[stackNodes.index(node):] + [node]
+    return "Cycle in node tree '" + node.id_data.name + "': " + " -> ".join(cycleNode.name for cycleNode in reversed(cycleNodes))
     
 def getDirectDependencies(node):
     directDependencies = []
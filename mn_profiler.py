@@ -0,0 +1,141 @@
+import bpy, json, csv
+from collections import deque
+from bpy.props import *
+from . mn_utils import *
+
+# node profiles
+###############################
+
+# a profile holds the statistics of one node during one update
+class NodeProfile:
+    __slots__ = ("time", "calls", "outputSize")
+
+    def __init__(self):
+        self.time = 0.0
+        self.calls = 0
+        self.outputSize = 0
+
+    def record(self, timeSpan, *outputs):
+        self.time += timeSpan
+        self.calls += 1
+        self.outputSize = sum(getValueSize(value) for value in outputs)
+
+def getValueSize(value):
+    if hasattr(value, "__len__"): return len(value)
+    return 1
+
+
+# recording
+###############################
+
+recordedUpdatesAmount = 250
+recordedUpdates = deque(maxlen = recordedUpdatesAmount)
+currentFrame = 0
+currentProfiles = {}
+
+def startProfiling(frame):
+    global currentFrame, currentProfiles
+    currentFrame = frame
+    currentProfiles = {}
+
+def finishProfiling():
+    if len(currentProfiles) > 0:
+        recordedUpdates.append((currentFrame, currentProfiles))
+
+def getNodeProfile(treeName, nodeName):
+    key = (treeName, nodeName)
+    profile = currentProfiles.get(key)
+    if profile is None:
+        profile = NodeProfile()
+        currentProfiles[key] = profile
+    return profile
+
+def clearProfilingData():
+    recordedUpdates.clear()
+
+
+# access recorded data
+###############################
+
+def getProfilingRows():
+    rows = []
+    for frame, profiles in recordedUpdates:
+        for (treeName, nodeName), profile in profiles.items():
+            rows.append((frame, treeName, nodeName, profile.time, profile.calls, profile.outputSize))
+    return rows
+
+def getNodeStatistics(treeName, nodeName):
+    profiles = [profiles[(treeName, nodeName)] for frame, profiles in recordedUpdates if (treeName, nodeName) in profiles]
+    if len(profiles) == 0: return None
+    totalTime = sum(profile.time for profile in profiles)
+    return { "updates" : len(profiles),
+             "totalTime" : totalTime,
+             "averageTime" : totalTime / len(profiles),
+             "maxTime" : max(profile.time for profile in profiles),
+             "calls" : sum(profile.calls for profile in profiles),
+             "outputSize" : profiles[-1].outputSize }
+
+def getSlowestNodes(amount = 10):
+    totalTimes = {}
+    for frame, profiles in recordedUpdates:
+        for key, profile in profiles.items():
+            totalTimes[key] = totalTimes.get(key, 0.0) + profile.time
+    return sorted(totalTimes.items(), key = lambda item: item[1], reverse = True)[:amount]
+
+
+# export
+###############################
+
+profilingColumns = ("frame", "tree", "node", "time", "calls", "outputSize")
+
+def exportProfilingData(path):
+    if path.lower().endswith(".csv"): exportProfilingDataAsCsv(path)
+    else: exportProfilingDataAsJson(path)
+
+def exportProfilingDataAsJson(path):
+    data = [dict(zip(profilingColumns, row)) for row in getProfilingRows()]
+    with open(path, "w") as file:
+        json.dump(data, file, indent = 2)
+
+def exportProfilingDataAsCsv(path):
+    with open(path, "w", newline = "") as file:
+        writer = csv.writer(file)
+        writer.writerow(profilingColumns)
+        writer.writerows(getProfilingRows())
+
+
+class ExportProfilingData(bpy.types.Operator):
+    bl_idname = "mn.export_profiling_data"
+    bl_label = "Export Profiling Data"
+    bl_description = "Save the recorded node profiles as .json or .csv file"
+
+    filepath = StringProperty(subtype = "FILE_PATH", default = "profiling.json")
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        exportProfilingData(bpy.path.abspath(self.filepath))
+        return {'FINISHED'}
+
+class ClearProfilingData(bpy.types.Operator):
+    bl_idname = "mn.clear_profiling_data"
+    bl_label = "Clear Profiling Data"
+    bl_description = "Remove all recorded node profiles"
+
+    def execute(self, context):
+        clearProfilingData()
+        return {'FINISHED'}
+
+class PrintSlowestNodes(bpy.types.Operator):
+    bl_idname = "mn.print_slowest_nodes"
+    bl_label = "Print Slowest Nodes"
+    bl_description = "Print the nodes which needed the most time in the recorded updates"
+
+    def execute(self, context):
+        print("----------  Profiling  ----------")
+        for (treeName, nodeName), totalTime in getSlowestNodes():
+            statistics = getNodeStatistics(treeName, nodeName)
+            print((treeName + " - " + nodeName).ljust(50) + str(round(statistics["averageTime"], 7)).rjust(13) + " s  -  calls: " + str(statistics["calls"]))
+        return {'FINISHED'}
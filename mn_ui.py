@@ -1,6 +1,7 @@
 import bpy
-from . mn_execution import getCodeStrings, resetCompileBlocker, updateAnimationTrees, generateExecutionUnits
+from . mn_execution import getCodeStrings, resetCompileBlocker, updateAnimationTrees, generateExecutionUnits, clearExecutionUnitCache
 from . mn_keyframes import *
+from . mn_cache import getCacheStatistics, getGroupCacheStatistics
 from . mn_utils import *
 from . utils.mn_selection_utils import *
 
@@ -49,12 +50,35 @@ class AnimationNodesDeveloperPanel(bpy.types.Panel):
         col = layout.column(align = True)
         col.operator("mn.unit_execution_code_in_text_block")
         col.operator("mn.print_node_tree_execution_string")
+        col.operator("mn.print_cache_statistics")
         
         col = layout.column(align = True)
         col.prop(scene.mn_settings.developer, "printUpdateTime", text = "Print Update Time")
         col.prop(scene.mn_settings.developer, "printGenerationTime", text = "Print Generation Time")
+        col.prop(scene.mn_settings.developer, "printUnitExecutionTimes", text = "Print Unit Times")
         col.prop(scene.mn_settings.developer, "executionProfiling", text = "Node Execution Profiling")
         
+        col = layout.column(align = True)
+        col.label("Profiling:")
+        col.operator("mn.print_slowest_nodes", text = "Print Slowest Nodes")
+        col.operator("mn.export_profiling_data", text = "Export")
+        col.operator("mn.clear_profiling_data", text = "Clear")
+        
+        col = layout.column(align = True)
+        col.label("Benchmarks:")
+        col.operator("mn.benchmark_node_ordering", text = "Node Ordering")
+        col.operator("mn.benchmark_avoided_copies", text = "Avoided Copies")
+        col.operator("mn.benchmark_execution_backends", text = "Execution Backends")
+        col.operator("mn.benchmark_mesh_output", text = "Mesh Output")
+        col.operator("mn.benchmark_batch_math", text = "Batch Math")
+        col.operator("mn.benchmark_triangulation", text = "Triangulation")
+        col.operator("mn.benchmark_loop_calls", text = "Loop Calls")
+        
+        col = layout.column(align = True)
+        col.label("Checks:")
+        col.operator("mn.check_animated_constant_nodes", text = "Animated Constants")
+        col.operator("mn.check_passthrough_copies", text = "Passthrough Copies")
+        
 class SocketVisibilityPanel(bpy.types.Panel):
     bl_idname = "mn.socket_visibility_panel"
     bl_label = "Socket Visibility"
@@ -165,10 +189,28 @@ class ForceNodeTreeUpdate(bpy.types.Operator):
 
     def execute(self, context):
         resetCompileBlocker()
+        clearExecutionUnitCache()
         generateExecutionUnits()
         updateAnimationTrees()
         return {'FINISHED'}
         
+class PrintCacheStatistics(bpy.types.Operator):
+    bl_idname = "mn.print_cache_statistics"
+    bl_label = "Print Cache Statistics"
+    bl_description = "Print size, hits, misses and evictions of all long time cache namespaces and the hit rates of cached groups"
+    
+    def execute(self, context):
+        print("----------  Cache Statistics  ----------")
+        for statistics in getCacheStatistics():
+            print(statistics["name"].ljust(25) + str(statistics["entries"]).rjust(6) + " entries  " +
+                  str(statistics["size"] // 1024).rjust(9) + " / " + str(statistics["maxSize"] // 1024) + " KB  " +
+                  "hits: " + str(statistics["hits"]) + "  misses: " + str(statistics["misses"]) + "  evictions: " + str(statistics["evictions"]))
+        for statistics in getGroupCacheStatistics():
+            print(("Group: " + statistics["name"]).ljust(25) + str(statistics["entries"]).rjust(6) + " / " + str(statistics["maxEntries"]) + " results  " +
+                  "hit rate: " + str(round(statistics["hitRate"] * 100, 1)) + " %  hits: " + str(statistics["hits"]) + "  misses: " + str(statistics["misses"]) +
+                  "  unhashable: " + str(statistics["unhashableCalls"]))
+        return {'FINISHED'}
+        
 class PrintNodeTreeExecutionStrings(bpy.types.Operator):
     bl_idname = "mn.print_node_tree_execution_string"
     bl_label = "Print Node Tree Code"
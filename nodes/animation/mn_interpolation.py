@@ -27,6 +27,7 @@ class mn_InterpolationNode(Node, AnimationNode):
     bl_idname = "mn_InterpolationNode"
     bl_label = "Interpolation"
     isDetermined = True
+    readsExternalData = True
     
     def topCategoryChanged(self, context):
         self.hideInputSockets()
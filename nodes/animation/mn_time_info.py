@@ -9,6 +9,7 @@ class mn_TimeInfoNode(Node, AnimationNode):
     bl_label = "Time Info"
     search_tags = ["Frame"]
     isDetermined = True
+    readsExternalData = True
     
     def init(self, context):
         forbidCompiling()
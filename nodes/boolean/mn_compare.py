@@ -9,6 +9,7 @@ compare_types_items = [(t, t, "") for t in compare_types]
 class mn_CompareNode(Node, AnimationNode):
     bl_idname = "mn_CompareNode"
     bl_label = "Compare"
+    isDetermined = True
     
     compareType = bpy.props.EnumProperty(name = "Compare Type", items = compare_types_items, update = nodeTreeChanged)
     
@@ -7,6 +7,7 @@ from ... mn_execution import nodePropertyChanged, nodeTreeChanged, allowCompilin
 class mn_ConditionNode(Node, AnimationNode):
     bl_idname = "mn_ConditionNode"
     bl_label = "Condition"
+    isDetermined = True
     
     def init(self, context):
         forbidCompiling()
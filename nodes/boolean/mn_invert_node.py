@@ -7,6 +7,7 @@ from ... mn_execution import nodePropertyChanged, nodeTreeChanged, allowCompilin
 class mn_InvertNode(Node, AnimationNode):
     bl_idname = "mn_InvertNode"
     bl_label = "Invert Boolean"
+    isDetermined = True
     
     def init(self, context):
         forbidCompiling()
@@ -8,6 +8,7 @@ from ... mn_execution import nodePropertyChanged, allowCompiling, forbidCompilin
 class mn_SetVertexColor(Node, AnimationNode):
     bl_idname = "mn_SetVertexColor"
     bl_label = "Set Vertex Color"
+    readOnlyInputs = ["Color"]
     
     enabled = bpy.props.BoolProperty(default = True, update = nodePropertyChanged)
     vertexColorName = bpy.props.StringProperty(default = "Col", update = nodePropertyChanged)
@@ -1,8 +1,10 @@
 ﻿from . import Math
 from mathutils import *
+from mathutils.kdtree import KDTree
 
 import bpy
 import numpy
+from ... mn_cache import getCacheNamespace, getObjectDataIdentity
 
 
 # utility properties & functions
@@ -10,6 +12,10 @@ defaultParameter = 0.5
 defaultResolutionAnalysis = 128
 deltaParameter = 0.001
 deltaParameterImaginary = Math.defaultDeltaImaginary
+arcLengthSamplesPerSegment = 32
+projectionSamplesPerSegment = 16
+projectionCandidates = 4
+projectionIterations = 8
 
 def IsCurve(blenderObject):
     if blenderObject is None: return False
@@ -237,52 +243,43 @@ class BezierSegment:
 
 
 
-# TODO: remove dependence on blenderBezierSpline/self.bezierSpline
 # TODO: remove bez-segments from definition, as blender splines don't have them (only bez-points)
 # ----- -- could still be useful in other calculations, though..
 class BezierSpline:
     def __init__(self, blenderBezierSpline):
-        self.blenderBezierSpline = blenderBezierSpline
+        self.blenderResolution = blenderBezierSpline.resolution_u
+        self.isCyclic = blenderBezierSpline.use_cyclic_u
 
-        bezPoints = []
+        # copies, so that the spline stays valid when the blender data changes
+        self.bezierPoints = [BezierPoint.FromBlenderBezierPoint(bezierPoint).Copy() for bezierPoint in blenderBezierSpline.bezier_points]
 
-        nrBezPoints = len(blenderBezierSpline.bezier_points)
-        for iBezierPoint in range(nrBezPoints):
-            bezPoints.append(BezierPoint.FromBlenderBezierPoint(blenderBezierSpline.bezier_points[iBezierPoint]))
+        self.segments = self.CreateSegments()
+        self.nrSegments = len(self.segments)
+        self.resolution = self.nrSegments + 1
 
-        self.bezierPoints = []
-        for ip in range(len(bezPoints)): self.bezierPoints.append(bezPoints[ip])
+        # coefficients of all segments in one (nrSegments, 4, 3) array for the batch calculations
+        coefficients = [[segment.coeff0, segment.coeff1, segment.coeff2, segment.coeff3] for segment in self.segments]
+        self.coefficients = numpy.array(coefficients, dtype = float).reshape(-1, 4, 3)
+        self.arcLengthTable = None
 
-    def __getattr__(self, attrName):
-        if attrName == "blenderResolution":
-            return self.blenderBezierSpline.resolution_u
-
-        if attrName == "isCyclic":
-            return self.blenderBezierSpline.use_cyclic_u
-
-        if attrName == "nrBezierPoints":
-            return len(self.bezierPoints)
+    def CreateSegments(self):
+        rvSegments = []
 
-        if attrName == "segments":
-            rvSegments = []
+        for iBezierPoint in range(self.nrBezierPoints - 1):
+            bezierPoint1 = self.bezierPoints[iBezierPoint]
+            bezierPoint2 = self.bezierPoints[iBezierPoint + 1]
+            rvSegments.append(BezierSegment(bezierPoint1, bezierPoint2))
 
-            for iBezierPoint in range(self.nrBezierPoints - 1):
-                bezierPoint1 = self.bezierPoints[iBezierPoint]
-                bezierPoint2 = self.bezierPoints[iBezierPoint + 1]
-                rvSegments.append(BezierSegment.FromBlenderBezierPoints(bezierPoint1, bezierPoint2))
+        if self.isCyclic and self.nrBezierPoints > 0:
+            bezierPoint1 = self.bezierPoints[-1]
+            bezierPoint2 = self.bezierPoints[0]
+            rvSegments.append(BezierSegment(bezierPoint1, bezierPoint2))
 
-            if self.isCyclic:
-                bezierPoint1 = self.bezierPoints[-1]
-                bezierPoint2 = self.bezierPoints[0]
-                rvSegments.append(BezierSegment.FromBlenderBezierPoints(bezierPoint1, bezierPoint2))
+        return rvSegments
 
-            return rvSegments
-
-        if attrName == "nrSegments":
-            return len(self.segments)
-
-        if attrName == "resolution":
-            return (self.nrSegments + 1)
+    def __getattr__(self, attrName):
+        if attrName == "nrBezierPoints":
+            return len(self.bezierPoints)
 
         if attrName == "length":
             return self.CalcLength(self.resolution)
@@ -355,27 +352,61 @@ class BezierSpline:
         return rvSegmentIndex, rvSegmentParameter, rvDistance2
 
         
-    def CalcLength(self, resolution):
-        try: nrSamplesPerSegment = int(resolution / self.nrSegments)
-        except: nrSamplesPerSegment = 2
-        if nrSamplesPerSegment < 2: nrSamplesPerSegment = 2
+    # batch versions for numpy arrays of spline parameters, they return (n, 3) arrays
+    def CalcSegmentIndicesAndParameters(self, splineParameters):
+        nrSegments = self.nrSegments
+        scaledParameters = splineParameters * nrSegments
+        segmentIndices = numpy.clip(scaledParameters.astype(int), 0, nrSegments - 1)
+        segmentParameters = numpy.clip(scaledParameters - segmentIndices, 0.0, 1.0)
 
-        rvLength = 0.0
-        for segment in self.segments:
-            rvLength += segment.CalcLength(nrSamples = nrSamplesPerSegment)
+        return segmentIndices, segmentParameters
 
-        return rvLength
+    def CalcPoints(self, splineParameters):
+        segmentIndices, segmentParameters = self.CalcSegmentIndicesAndParameters(splineParameters)
+
+        return CalcPolynomials(self.coefficients[segmentIndices], segmentParameters[:, None])
+
+    def CalcDerivatives(self, splineParameters):
+        segmentIndices, segmentParameters = self.CalcSegmentIndicesAndParameters(splineParameters)
+
+        return CalcPolynomialDerivatives(self.coefficients[segmentIndices], segmentParameters[:, None])
+
+        
+    def CalcLength(self, resolution):
+        return self.CalcLengthTransformed(resolution, None)
 
     def CalcLengthTransformed(self, resolution, matrix):
         try: nrSamplesPerSegment = int(resolution / self.nrSegments)
         except: nrSamplesPerSegment = 2
         if nrSamplesPerSegment < 2: nrSamplesPerSegment = 2
 
-        rvLength = 0.0
-        for segment in self.segments:
-            rvLength += segment.CalcLengthTransformed(nrSamplesPerSegment, matrix)
+        # (nrSegments, nrSamplesPerSegment + 1, 3) array with the samples of all segments
+        parameters = numpy.arange(nrSamplesPerSegment + 1) / float(nrSamplesPerSegment)
+        points = CalcPolynomials(self.coefficients[:, None], parameters[None, :, None])
+        if matrix is not None: points = TransformPoints(points, matrix)
 
-        return rvLength
+        return float(numpy.linalg.norm(numpy.diff(points, axis = 1), axis = 2).sum())
+
+    # the length from the start at evenly spaced spline parameters, it
+    # maps lengths back to parameters for evenly spaced samples
+    def GetArcLengthTable(self):
+        if self.arcLengthTable is None:
+            parameters = numpy.linspace(0.0, 1.0, max(self.nrSegments, 1) * arcLengthSamplesPerSegment + 1)
+            if self.nrSegments > 0:
+                segmentLengths = numpy.linalg.norm(numpy.diff(self.CalcPoints(parameters), axis = 0), axis = 1)
+                lengths = numpy.concatenate(([0.0], numpy.cumsum(segmentLengths)))
+            else: lengths = numpy.zeros(len(parameters))
+            self.arcLengthTable = (parameters, lengths)
+
+        return self.arcLengthTable
+
+    def CalcArcLength(self):
+        return float(self.GetArcLengthTable()[1][-1])
+
+    def CalcParametersAtLengths(self, lengths):
+        parameters, tableLengths = self.GetArcLengthTable()
+
+        return numpy.interp(lengths, tableLengths, parameters)
 
     def CalcLengthWithBlenderResolution(self):
         return self.CalcLength(self.blenderResolution)
@@ -385,13 +416,25 @@ class BezierSpline:
 
 
 
+# the splines only change with the curve data, so all Curve objects of it can share them
+splinesCache = getCacheNamespace("Curve Splines")
+
 # TODO: Curve
 class Curve:
     def __init__(self, blenderCurve):
         self.curve = blenderCurve
         self.curveData = blenderCurve.data
 
-        self.splines = self.SetupSplines()
+        self.splines = self.GetSplines()
+
+    def GetSplines(self):
+        validityKey = getObjectDataIdentity(self.curve)
+        splines = splinesCache.get(self.curve.name, validityKey)
+        if splines is None:
+            splines = self.SetupSplines()
+            splinesCache.set(self.curve.name, splines, validityKey)
+
+        return splines
 
     def SetupSplines(self):
         rvSplines = []
@@ -515,24 +558,89 @@ class Curve:
         return self.CalcPointOnSplineWorld(splineIndex, splineParameter)
         
     def Sample(self, resolution):
-        rvList = []
+        return self.CalcPoints(GetSampleParameters(resolution))
 
-        fltResolutionM1 = float(resolution - 1)
-        for iSample in range(resolution):
-            par = float(iSample) / fltResolutionM1
-            rvList.append(self.CalcPoint(par))
+    def SampleWorld(self, resolution):
+        return self.CalcPoints(GetSampleParameters(resolution), self.worldMatrix)
 
-        return rvList
+    # samples with the same distance between them along the splines (in local space)
+    def SampleUniform(self, resolution):
+        splineIndices, splineParameters = self.CalcUniformSplineIndicesAndParameters(resolution)
+        
+        return self.CalcPointsOnSplines(splineIndices, splineParameters)
 
-    def SampleWorld(self, resolution):
-        rvList = []
+    def SampleUniformWorld(self, resolution):
+        splineIndices, splineParameters = self.CalcUniformSplineIndicesAndParameters(resolution)
+        
+        return self.CalcPointsOnSplines(splineIndices, splineParameters, matrix = self.worldMatrix)
+
+    def CalcUniformSplineIndicesAndParameters(self, resolution):
+        splineLengths = numpy.array([spline.CalcArcLength() for spline in self.splines])
+        splineEnds = numpy.cumsum(splineLengths)
+        lengths = numpy.linspace(0.0, splineEnds[-1] if len(splineEnds) > 0 else 0.0, resolution)
+
+        splineIndices = numpy.clip(numpy.searchsorted(splineEnds, lengths), 0, max(self.nrSplines - 1, 0))
+        splineParameters = numpy.zeros(resolution)
+        for splineIndex, spline in enumerate(self.splines):
+            indices = numpy.nonzero(splineIndices == splineIndex)[0]
+            splineStart = splineEnds[splineIndex] - splineLengths[splineIndex]
+            splineParameters[indices] = spline.CalcParametersAtLengths(lengths[indices] - splineStart)
+        
+        return splineIndices, splineParameters
+
+    # batch evaluation of a numpy array of curve parameters, the
+    # points are calculated for all parameters on a spline at once
+    def CalcPoints(self, parameters, matrix = None, derivatives = False):
+        if self.nrSplines < 1: return [None] * len(parameters)
+        splineIndices, splineParameters = self.CalcSplineIndicesAndParameters(parameters)
+
+        return self.CalcPointsOnSplines(splineIndices, splineParameters, matrix, derivatives)
+
+    def CalcSplineIndicesAndParameters(self, parameters):
+        nrSpl = self.nrSplines
+        if nrSpl == 1: return numpy.zeros(len(parameters), dtype = int), parameters
+
+        scaledParameters = parameters * nrSpl
+        splineIndices = numpy.clip(scaledParameters.astype(int), 0, nrSpl - 1)
+        splineParameters = numpy.clip(scaledParameters - splineIndices, 0.0, 1.0)
+
+        return splineIndices, splineParameters
+
+    # None for samples on splines without segments, like the single point calculations
+    def CalcPointsOnSplines(self, splineIndices, splineParameters, matrix = None, derivatives = False):
+        points = self.CalcPointArrayOnSplines(splineIndices, splineParameters, matrix, derivatives)
+        isValid = numpy.logical_not(numpy.isnan(points[:, 0]))
+
+        return [Vector(point) if valid else None for point, valid in zip(points.tolist(), isValid.tolist())]
+
+    # (n, 3) array, samples on splines without segments are NaN
+    def CalcPointArrayOnSplines(self, splineIndices, splineParameters, matrix = None, derivatives = False):
+        points = numpy.full((len(splineIndices), 3), numpy.nan)
+
+        for splineIndex, spline in enumerate(self.splines):
+            if spline.nrSegments < 1: continue
+            indices = numpy.nonzero(splineIndices == splineIndex)[0]
+            if len(indices) == 0: continue
+
+            if derivatives:
+                splinePoints = spline.CalcDerivatives(splineParameters[indices])
+                if matrix is not None: splinePoints = splinePoints.dot(numpy.array(matrix.to_3x3()).T)
+            else:
+                splinePoints = spline.CalcPoints(splineParameters[indices])
+                if matrix is not None: splinePoints = TransformPoints(splinePoints, matrix)
+            points[indices] = splinePoints
 
-        fltResolutionM1 = float(resolution - 1)
-        for iSample in range(resolution):
-            par = float(iSample) / fltResolutionM1
-            rvList.append(self.CalcPointWorld(par))
+        return points
 
-        return rvList
+    # like the sample functions, but all samples are in one (resolution, 3) array
+    def SampleArray(self, resolution, world = False, derivatives = False):
+        if self.nrSplines < 1: raise Exception("Curve has no splines")
+        splineIndices, splineParameters = self.CalcSplineIndicesAndParameters(GetSampleParameters(resolution))
+        matrix = self.worldMatrix if world else None
+        points = self.CalcPointArrayOnSplines(splineIndices, splineParameters, matrix, derivatives)
+        if numpy.isnan(points).any(): raise Exception("Samples on splines without segments")
+
+        return points
 
         
     def CalcDerivativeOnSpline(self, splineIndex, splineParameter):
@@ -556,25 +664,10 @@ class Curve:
         return self.CalcDerivativeOnSplineWorld(splineIndex, splineParameter)
 
     def SampleDerivatives(self, resolution):
-        rvList = []
-
-        fltResolutionM1 = float(resolution - 1)
-        for iSample in range(resolution):
-            par = float(iSample) / fltResolutionM1
-            rvList.append(self.CalcDerivative(par))
-
-        return rvList
+        return self.CalcPoints(GetSampleParameters(resolution), derivatives = True)
 
     def SampleDerivativesWorld(self, resolution):
-        rvList = []
-        wm3x3 = self.worldMatrix3x3
-
-        fltResolutionM1 = float(resolution - 1)
-        for iSample in range(resolution):
-            par = float(iSample) / fltResolutionM1
-            rvList.append(wm3x3 * self.CalcDerivative(par))
-
-        return rvList
+        return self.CalcPoints(GetSampleParameters(resolution), self.worldMatrix, derivatives = True)
 
 
     def CalcProjection(self, point, resolution):
@@ -592,6 +685,52 @@ class Curve:
                 
         return rvParameter
 
+    # closest points for many world points at once, the nearest curve samples give candidate
+    # segments and parameters, which are refined with newton steps for all candidates together
+    # returns numpy arrays with the curve parameters and the distances
+    def CalcProjections(self, points):
+        points = numpy.array([tuple(point) for point in points], dtype = float).reshape(-1, 3)
+        coefficients, samples, sampleSegments, sampleParameters, segmentParameters = self.GetProjectionData()
+
+        kdTree = KDTree(len(samples))
+        for i, sample in enumerate(samples.tolist()):
+            kdTree.insert(sample, i)
+        kdTree.balance()
+        amount = min(projectionCandidates, len(samples))
+        candidates = numpy.array([[index for co, index, distance in kdTree.find_n(point, amount)] for point in points.tolist()], dtype = int).reshape(-1, amount)
+
+        segments = sampleSegments[candidates]
+        parameters, distances = RefineProjections(coefficients[segments], sampleParameters[candidates], points[:, None])
+
+        best = numpy.argmin(distances, axis = 1)
+        rows = numpy.arange(len(points))
+        bestSegments = segments[rows, best]
+        curveParameters = segmentParameters[bestSegments, 0] + parameters[rows, best] * segmentParameters[bestSegments, 1]
+
+        return curveParameters, distances[rows, best]
+
+    # world space coefficients of all segments and samples on them
+    def GetProjectionData(self):
+        matrix = numpy.array(self.worldMatrix)
+        coefficients, segmentParameters = [], []
+        for splineIndex, spline in enumerate(self.splines):
+            for segmentIndex in range(spline.nrSegments):
+                # curve parameter = start + segment parameter * scale
+                scale = 1.0 / (spline.nrSegments * self.nrSplines)
+                segmentParameters.append((segmentIndex * scale + splineIndex / float(self.nrSplines), scale))
+            coefficients.append(spline.coefficients)
+        if len(segmentParameters) == 0: raise Exception("Curve has no segments")
+
+        coefficients = numpy.concatenate(coefficients).dot(matrix[:3, :3].T)
+        coefficients[:, 0] += matrix[:3, 3]
+
+        parameters = numpy.arange(projectionSamplesPerSegment + 1) / float(projectionSamplesPerSegment)
+        samples = CalcPolynomials(coefficients[:, None], parameters[None, :, None]).reshape(-1, 3)
+        sampleSegments = numpy.repeat(numpy.arange(len(coefficients)), len(parameters))
+        sampleParameters = numpy.tile(parameters, len(coefficients))
+
+        return coefficients, samples, sampleSegments, sampleParameters, numpy.array(segmentParameters)
+
     def CalcProjectionByPoly5(self, point):
         rvSplineIndex = 0
         rvSplineParameter = defaultParameter
@@ -652,3 +791,41 @@ class Curve:
         return rvLength
 
 
+
+# batch calculation helpers
+def GetSampleParameters(resolution):
+    return numpy.linspace(0.0, 1.0, resolution)
+
+# coefficients are (..., 4, 3) arrays, the parameters have to be broadcastable to (..., 3)
+def CalcPolynomials(coefficients, parameters):
+    return coefficients[..., 0, :] + (coefficients[..., 1, :] + (coefficients[..., 2, :] + coefficients[..., 3, :] * parameters) * parameters) * parameters
+
+def CalcPolynomialDerivatives(coefficients, parameters):
+    return coefficients[..., 1, :] + (coefficients[..., 2, :] * 2.0 + coefficients[..., 3, :] * (parameters * 3.0)) * parameters
+
+def TransformPoints(points, matrix):
+    matrix = numpy.array(matrix)
+
+    return points.dot(matrix[:3, :3].T) + matrix[:3, 3]
+
+# newton iterations on the derivative of the squared distance, like CalcProjectionByPoly5 they
+# find parameters where the difference is orthogonal to the tangent, but start next to the solution
+def RefineProjections(coefficients, parameters, points):
+    startDistances = numpy.linalg.norm(CalcPolynomials(coefficients, parameters[..., None]) - points, axis = -1)
+    startParameters = parameters
+
+    for i in range(projectionIterations):
+        t = parameters[..., None]
+        difference = CalcPolynomials(coefficients, t) - points
+        derivative = CalcPolynomialDerivatives(coefficients, t)
+        secondDerivative = coefficients[..., 2, :] * 2.0 + coefficients[..., 3, :] * (t * 6.0)
+
+        value = (difference * derivative).sum(axis = -1)
+        slope = (derivative * derivative).sum(axis = -1) + (difference * secondDerivative).sum(axis = -1)
+        step = numpy.divide(value, slope, out = numpy.zeros_like(value), where = slope > 0)
+        parameters = numpy.clip(parameters - step, 0.0, 1.0)
+
+    distances = numpy.linalg.norm(CalcPolynomials(coefficients, parameters[..., None]) - points, axis = -1)
+    isWorse = distances > startDistances
+
+    return numpy.where(isWorse, startParameters, parameters), numpy.where(isWorse, startDistances, distances)
@@ -1,46 +1,124 @@
 ﻿import bpy
 import bmesh
+import numpy
+from mathutils import Vector
 
 from . import Math
 from . import Curves
+from ... mn_cache import getCacheNamespace
 
 
 # utility properties & functions
 defaultResolutionSynthesis = 16
 
 
+# the faces of a grid only depend on its resolution, so the same ones are shared by all
+# surfaces, the polygons are tuples and every surface gets its own list of them
+gridFacesCache = getCacheNamespace("Grid Topology")
+
+def GetGridFaces(resAlong, resAcross, cyclicAcross = False):
+    key = (resAlong, resAcross, cyclicAcross)
+    faces = gridFacesCache.get(key)
+    if faces is None:
+        faces = CreateGridFaces(resAlong, resAcross, cyclicAcross)
+        gridFacesCache.set(key, faces)
+
+    return list(faces)
+
+def CreateGridFaces(resAlong, resAcross, cyclicAcross):
+    indices = numpy.arange(resAlong * resAcross).reshape(resAlong, resAcross)
+    indicesBL = indices[:-1, :-1]
+    indicesBR = indices[1:, :-1]
+    faces = numpy.stack((indicesBL, indicesBR, indicesBR + 1, indicesBL + 1), axis = -1).reshape(-1, 4)
+
+    if cyclicAcross:
+        indicesTL = indices[:-1, 0]
+        indicesTR = indices[1:, 0]
+        seamFaces = numpy.stack((indicesTL + resAcross - 1, indicesTR + resAcross - 1, indicesTR, indicesTL), axis = -1)
+        faces = numpy.concatenate((faces, seamFaces))
+
+    return tuple(map(tuple, faces.tolist()))
+
+def VectorsFromArray(points):
+    return [Vector(point) for point in points.reshape(-1, 3).tolist()]
+
+def Normalized(vectors):
+    lengths = numpy.linalg.norm(vectors, axis = -1)[..., None]
+    return numpy.divide(vectors, lengths, out = numpy.zeros_like(vectors), where = lengths != 0)
+
+def MatrixArray(matrices):
+    return numpy.array([[list(row) for row in matrix] for matrix in matrices])
+
+# the circles around the axis points through the profile points, see Math.GenerateCircle
+def CalcRevolvedVertices(worldPointsAxis, worldPointsProfile, worldDerivativesAxis, resAcross):
+    dirX = worldPointsProfile - worldPointsAxis
+    radius = numpy.linalg.norm(dirX, axis = 1)[:, None, None]
+    dirY = Normalized(numpy.cross(worldDerivativesAxis, dirX))
+    dirX = Normalized(dirX)
+
+    angles = numpy.arange(resAcross) * ((numpy.pi * 2.0) / float(resAcross))
+    cosAngles = numpy.cos(angles)[None, :, None]
+    sinAngles = numpy.sin(angles)[None, :, None]
+    points = worldPointsAxis[:, None] + dirX[:, None] * radius * cosAngles + dirY[:, None] * radius * sinAngles
+
+    return VectorsFromArray(points)
+
+# the profile is moved along the rail and rotated with its tangent, the rotations depend
+# on each other, so only the (resAlong) matrices are calculated one after another
+# returns the world offsets of all profile points to the first one as (resAlong, resAcross, 3) array
+def CalcSweptProfileOffsets(curveRail, localDerivativesRail, worldMatrixProfile, localPointsProfile, reverse = False):
+    worldMatrixRail = curveRail.worldMatrix
+    worldMatrixRailInv = worldMatrixRail.inverted()
+    resAlong = len(localDerivativesRail)
+    railIndices = range(resAlong - 1, -1, -1) if reverse else range(resAlong)
+
+    profileMatrices = [None] * resAlong
+    currWorldMatrixProfile = worldMatrixProfile
+    prevDerivativeRail = localDerivativesRail[railIndices[0]]
+    for iRail in railIndices:
+        currDerivativeRail = localDerivativesRail[iRail]
+        localRotMatRail = Math.CalcRotationMatrix(prevDerivativeRail, currDerivativeRail)
+
+        currLocalProfileToLocalRail = worldMatrixRailInv * currWorldMatrixProfile
+        currWorldMatrixProfile = worldMatrixRail * localRotMatRail * currLocalProfileToLocalRail
+        profileMatrices[iRail] = currWorldMatrixProfile
+        prevDerivativeRail = currDerivativeRail
+
+    matrices = MatrixArray(profileMatrices)
+    worldPointsProfile = numpy.einsum("aij,cj->aci", matrices[:, :3, :3], localPointsProfile) + matrices[:, None, :3, 3]
+
+    return worldPointsProfile - worldPointsProfile[:, :1]
+
+# rotates and scales the offsets of each row, so that the last one ends on the second rail
+def FitOffsetsToRail(worldOffsetsProfile, worldPointsRail1, worldPointsRail2):
+    rotationMatrices = []
+    for iRail in range(len(worldOffsetsProfile)):
+        v3From = Vector(worldOffsetsProfile[iRail, -1])
+        v3To = Vector(worldPointsRail2[iRail] - worldPointsRail1[iRail])
+        scaleFactorRail2 = v3To.magnitude / v3From.magnitude
+        rotationMatrices.append(Math.CalcRotationMatrix(v3From, v3To).to_3x3() * scaleFactorRail2)
+
+    return numpy.einsum("aij,acj->aci", MatrixArray(rotationMatrices), worldOffsetsProfile)
+
+def Morph(pointsBegin, pointsEnd):
+    weightsEnd = (numpy.arange(len(pointsBegin)) / float(len(pointsBegin) - 1))[:, None, None]
+
+    return pointsBegin * (1.0 - weightsEnd) + pointsEnd * weightsEnd
+
+
 class LoftedSurface:
     def __init__(self, blenderObjectRail1, blenderObjectRail2):
         self.curveRail1 = Curves.Curve(blenderObjectRail1)
         self.curveRail2 = Curves.Curve(blenderObjectRail2)
 
     def Calculate(self, resAlong, resAcross):
-        pointsRail1 = self.curveRail1.SampleWorld(resAlong)
-        pointsRail2 = self.curveRail2.SampleWorld(resAlong)
+        pointsRail1 = self.curveRail1.SampleArray(resAlong, world = True)
+        pointsRail2 = self.curveRail2.SampleArray(resAlong, world = True)
 
-        fltResAcrossM1 = float(resAcross - 1)
-        rvVertices = []
-        for iAlong in range(resAlong):
-            pointRail1 = pointsRail1[iAlong]
-            pointRail2 = pointsRail2[iAlong]
-            diff12 = pointRail2 - pointRail1
-            for iAcross in range(resAcross):
-                parAcross = float(iAcross) / fltResAcrossM1
-                rvVertices.append(pointRail1 + (diff12 * parAcross))
-
-        rvFaces = []
-        for iAlong in range(resAlong - 1):
-            currAlong = iAlong * resAcross
-            nextAlong = currAlong + resAcross
-            for iAcross in range(resAcross - 1):
-                indexBL = currAlong + iAcross
-                indexTL = indexBL + 1
-                indexBR = nextAlong + iAcross
-                indexTR = indexBR + 1
-
-                rvFaces.append([indexBL, indexBR, indexTR, indexTL])
+        parametersAcross = (numpy.arange(resAcross) / float(resAcross - 1))[None, :, None]
+        points = pointsRail1[:, None] + (pointsRail2 - pointsRail1)[:, None] * parametersAcross
 
-        return rvVertices, rvFaces
+        return VectorsFromArray(points), GetGridFaces(resAlong, resAcross)
 
 
 class RevolvedSurface:
@@ -49,42 +127,12 @@ class RevolvedSurface:
         self.curveProfile = Curves.Curve(blenderObjectProfile)
 
     def Calculate(self, resAlong, resAcross):
-        worldPointsAxis = self.curveAxis.SampleWorld(resAlong)
-        worldPointsProfile = self.curveProfile.SampleWorld(resAlong)
-        worldDerivativesAxis = self.curveAxis.SampleDerivativesWorld(resAlong)
+        worldPointsAxis = self.curveAxis.SampleArray(resAlong, world = True)
+        worldPointsProfile = self.curveProfile.SampleArray(resAlong, world = True)
+        worldDerivativesAxis = self.curveAxis.SampleArray(resAlong, world = True, derivatives = True)
 
-        rvVertices = []
-        for iAlong in range(resAlong):
-            center = worldPointsAxis[iAlong]
-            pointProfile = worldPointsProfile[iAlong]
-            dirX = (pointProfile - center)
-            radius = dirX.magnitude
-            dirY = worldDerivativesAxis[iAlong].cross(dirX).normalized()
-            dirX.normalize()
-
-            currPointsAcross = Math.GenerateCircle(center, radius, dirX, dirY, resAcross)
-            for iAcross in range(resAcross):
-                rvVertices.append(currPointsAcross[iAcross])
-
-        rvFaces = []
-        for iAlong in range(resAlong - 1):
-            currAlong = iAlong * resAcross
-            nextAlong = currAlong + resAcross
-            for iAcross in range(resAcross - 1):
-                indexBL = currAlong + iAcross
-                indexTL = indexBL + 1
-                indexBR = nextAlong + iAcross
-                indexTR = indexBR + 1
-
-                rvFaces.append([indexBL, indexBR, indexTR, indexTL])
-
-        for iAlong in range(resAlong - 1):
-            indexTL = iAlong * resAcross
-            indexTR = indexTL + resAcross
-            indexBL = indexTL + resAcross - 1
-            indexBR = indexTR + resAcross - 1
-
-            rvFaces.append([indexBL, indexBR, indexTR, indexTL])
+        rvVertices = CalcRevolvedVertices(worldPointsAxis, worldPointsProfile, worldDerivativesAxis, resAcross)
+        rvFaces = GetGridFaces(resAlong, resAcross, cyclicAcross = True)
 
         return rvVertices, rvFaces
 
@@ -109,49 +157,19 @@ class RevolvedProjectedSurface:
             elif Curves.ParameterIsOne(parAxis): worldPointAxis = Math.CalcProjectionPointToLine(pointProfile, worldPointAxis, worldDerivativeAxis.normalized())
             worldPointsAxis.append(worldPointAxis)
         
-        rvVertices = []
-        for iAlong in range(resAlong):
-            center = worldPointsAxis[iAlong]
-            pointProfile = worldPointsProfile[iAlong]
-            dirX = (pointProfile - center)
-            radius = dirX.magnitude
-            dirY = worldDerivativesAxis[iAlong].cross(dirX).normalized()
-            dirX.normalize()
-
-            currPointsAcross = Math.GenerateCircle(center, radius, dirX, dirY, resAcross)
-            for iAcross in range(resAcross):
-                rvVertices.append(currPointsAcross[iAcross])
-
-        rvFaces = []
-        for iAlong in range(resAlong - 1):
-            currAlong = iAlong * resAcross
-            nextAlong = currAlong + resAcross
-            for iAcross in range(resAcross - 1):
-                indexBL = currAlong + iAcross
-                indexTL = indexBL + 1
-                indexBR = nextAlong + iAcross
-                indexTR = indexBR + 1
-
-                rvFaces.append([indexBL, indexBR, indexTR, indexTL])
-
-        for iAlong in range(resAlong - 1):
-            indexTL = iAlong * resAcross
-            indexTR = indexTL + resAcross
-            indexBL = indexTL + resAcross - 1
-            indexBR = indexTR + resAcross - 1
-
-            rvFaces.append([indexBL, indexBR, indexTR, indexTL])
+        rvVertices = CalcRevolvedVertices(numpy.array(worldPointsAxis), numpy.array(worldPointsProfile), numpy.array(worldDerivativesAxis), resAcross)
+        rvFaces = GetGridFaces(resAlong, resAcross, cyclicAcross = True)
 
         return rvVertices, rvFaces
 
     def CalculateAnalytic(self, resAlong, resAcross):
         worldPointsProfile = self.curveProfile.SampleWorld(resAlong)
+        parametersAxis, distancesAxis = self.curveAxis.CalcProjections(worldPointsProfile)
         worldPointsAxis = []
         worldDerivativesAxis = []
         for iAlong in range(resAlong):
             pointProfile = worldPointsProfile[iAlong]
-            currSplineIndex, currSplineParameter, currDistance2 = self.curveAxis.CalcProjectionByPoly5(pointProfile)
-            parAxis = self.curveAxis.CalcParameter(currSplineIndex, currSplineParameter)
+            parAxis = float(parametersAxis[iAlong])
             worldDerivativeAxis = self.curveAxis.CalcDerivativeWorld(parAxis)
             worldDerivativesAxis.append(worldDerivativeAxis)
             
@@ -160,38 +178,8 @@ class RevolvedProjectedSurface:
             elif Curves.ParameterIsOne(parAxis): worldPointAxis = Math.CalcProjectionPointToLine(pointProfile, worldPointAxis, worldDerivativeAxis.normalized())
             worldPointsAxis.append(worldPointAxis)
         
-        rvVertices = []
-        for iAlong in range(resAlong):
-            center = worldPointsAxis[iAlong]
-            pointProfile = worldPointsProfile[iAlong]
-            dirX = (pointProfile - center)
-            radius = dirX.magnitude
-            dirY = worldDerivativesAxis[iAlong].cross(dirX).normalized()
-            dirX.normalize()
-
-            currPointsAcross = Math.GenerateCircle(center, radius, dirX, dirY, resAcross)
-            for iAcross in range(resAcross):
-                rvVertices.append(currPointsAcross[iAcross])
-
-        rvFaces = []
-        for iAlong in range(resAlong - 1):
-            currAlong = iAlong * resAcross
-            nextAlong = currAlong + resAcross
-            for iAcross in range(resAcross - 1):
-                indexBL = currAlong + iAcross
-                indexTL = indexBL + 1
-                indexBR = nextAlong + iAcross
-                indexTR = indexBR + 1
-
-                rvFaces.append([indexBL, indexBR, indexTR, indexTL])
-
-        for iAlong in range(resAlong - 1):
-            indexTL = iAlong * resAcross
-            indexTR = indexTL + resAcross
-            indexBL = indexTL + resAcross - 1
-            indexBR = indexTR + resAcross - 1
-
-            rvFaces.append([indexBL, indexBR, indexTR, indexTL])
+        rvVertices = CalcRevolvedVertices(numpy.array(worldPointsAxis), numpy.array(worldPointsProfile), numpy.array(worldDerivativesAxis), resAcross)
+        rvFaces = GetGridFaces(resAlong, resAcross, cyclicAcross = True)
 
         return rvVertices, rvFaces
 
@@ -202,51 +190,14 @@ class SweptSurface:
         self.curveProfile = Curves.Curve(blenderObjectProfile)
 
     def Calculate(self, resAlong, resAcross):
-        worldPointsRail = self.curveRail.SampleWorld(resAlong)
+        worldPointsRail = self.curveRail.SampleArray(resAlong, world = True)
         localDerivativesRail = self.curveRail.SampleDerivatives(resAlong)
-        worldMatrixRail = self.curveRail.worldMatrix
-        worldMatrixRailInv = worldMatrixRail.inverted()
-
-        localPointsProfile = self.curveProfile.Sample(resAcross)
-        currWorldMatrixProfile = self.curveProfile.worldMatrix
-
-        rvVertices = []
-        prevDerivativeRail = localDerivativesRail[0]
-        for iRail in range(resAlong):
-            currDerivativeRail = localDerivativesRail[iRail]
-            localRotMatRail = Math.CalcRotationMatrix(prevDerivativeRail, currDerivativeRail)
-
-            currLocalProfileToLocalRail = worldMatrixRailInv * currWorldMatrixProfile
-            worldPointsProfile = []
-            for iProfile in range(resAcross):
-                pointProfileLocalToRail = currLocalProfileToLocalRail * localPointsProfile[iProfile]
-                rotatedPointProfile = localRotMatRail * pointProfileLocalToRail
-                worldPointsProfile.append(worldMatrixRail * rotatedPointProfile)
-
-            worldOffsetsProfile = []
-            worldPoint0Profile = worldPointsProfile[0]
-            for iProfile in range(resAcross): worldOffsetsProfile.append(worldPointsProfile[iProfile] - worldPoint0Profile)
-
-            for iProfile in range(resAcross):
-                currVert = worldPointsRail[iRail] + worldOffsetsProfile[iProfile]
-                rvVertices.append(currVert)
-
-            prevDerivativeRail = currDerivativeRail
-            currWorldMatrixProfile = worldMatrixRail * localRotMatRail * currLocalProfileToLocalRail
-
-        rvFaces = []
-        for iAlong in range(resAlong - 1):
-            currAlong = iAlong * resAcross
-            nextAlong = currAlong + resAcross
-            for iAcross in range(resAcross - 1):
-                indexBL = currAlong + iAcross
-                indexTL = indexBL + 1
-                indexBR = nextAlong + iAcross
-                indexTR = indexBR + 1
-
-                rvFaces.append([indexBL, indexBR, indexTR, indexTL])
+        localPointsProfile = self.curveProfile.SampleArray(resAcross)
 
-        return rvVertices, rvFaces
+        worldOffsetsProfile = CalcSweptProfileOffsets(self.curveRail, localDerivativesRail, self.curveProfile.worldMatrix, localPointsProfile)
+        points = worldPointsRail[:, None] + worldOffsetsProfile
+
+        return VectorsFromArray(points), GetGridFaces(resAlong, resAcross)
 
 
 class BirailedSurface:
@@ -256,65 +207,16 @@ class BirailedSurface:
         self.curveProfile = Curves.Curve(blenderObjectProfile)
 
     def Calculate(self, resAlong, resAcross):
-        worldMatrixRail1 = self.curveRail1.worldMatrix
-        worldMatrixProfile = self.curveProfile.worldMatrix
-
-        localPointsProfile = self.curveProfile.Sample(resAcross)
-        worldPointsRail1 = self.curveRail1.SampleWorld(resAlong)
+        localPointsProfile = self.curveProfile.SampleArray(resAcross)
+        worldPointsRail1 = self.curveRail1.SampleArray(resAlong, world = True)
         localDerivativesRail1 = self.curveRail1.SampleDerivatives(resAlong)
-        worldPointsRail2 = self.curveRail2.SampleWorld(resAlong)
-
-        rvVertices = []
-        currWorldMatrixProfile = worldMatrixProfile
-        worldMatrixRail1Inv = worldMatrixRail1.inverted()
-        prevDerivativeRail1 = localDerivativesRail1[0]
-        for iRail in range(resAlong):
-            currDerivativeRail1 = localDerivativesRail1[iRail]
-            localRotMatRail1 = Math.CalcRotationMatrix(prevDerivativeRail1, currDerivativeRail1)
-
-            currLocalProfileToLocalRail1 = worldMatrixRail1Inv * currWorldMatrixProfile
-            worldPointsProfileRail1 = []
-            for iProfile in range(resAcross):
-                pointProfileLocalToRail1 = currLocalProfileToLocalRail1 * localPointsProfile[iProfile]
-                rotatedPointProfile = localRotMatRail1 * pointProfileLocalToRail1
-                worldPointsProfileRail1.append(worldMatrixRail1 * rotatedPointProfile)
-
-            worldOffsetsProfileRail1 = []
-            worldPoint0ProfileRail1 = worldPointsProfileRail1[0]
-            for iProfile in range(resAcross): worldOffsetsProfileRail1.append(worldPointsProfileRail1[iProfile] - worldPoint0ProfileRail1)
-
-            worldStartPointProfileRail1 = worldPointsRail1[iRail]
-            worldEndPointProfileRail1 = worldStartPointProfileRail1 + worldOffsetsProfileRail1[-1]
-            v3From = worldEndPointProfileRail1 - worldStartPointProfileRail1
-            v3To = worldPointsRail2[iRail] - worldStartPointProfileRail1
-            scaleFactorRail2 = v3To.magnitude / v3From.magnitude
-            rotMatRail2 = Math.CalcRotationMatrix(v3From, v3To)
-
-            worldOffsetsProfileRail2 = []
-            for iProfile in range(resAcross):
-                offsetProfileRail1 = worldOffsetsProfileRail1[iProfile]
-                worldOffsetsProfileRail2.append(rotMatRail2 * (offsetProfileRail1 * scaleFactorRail2))
-
-            for iProfile in range(resAcross):
-                currVert = worldPointsRail1[iRail] + worldOffsetsProfileRail2[iProfile]
-                rvVertices.append(currVert)
-
-            prevDerivativeRail1 = currDerivativeRail1
-            currWorldMatrixProfile = worldMatrixRail1 * localRotMatRail1 * currLocalProfileToLocalRail1
-
-        rvFaces = []
-        for iAlong in range(resAlong - 1):
-            currAlong = iAlong * resAcross
-            nextAlong = currAlong + resAcross
-            for iAcross in range(resAcross - 1):
-                indexBL = currAlong + iAcross
-                indexTL = indexBL + 1
-                indexBR = nextAlong + iAcross
-                indexTR = indexBR + 1
-
-                rvFaces.append([indexBL, indexBR, indexTR, indexTL])
+        worldPointsRail2 = self.curveRail2.SampleArray(resAlong, world = True)
 
-        return rvVertices, rvFaces
+        worldOffsetsProfileRail1 = CalcSweptProfileOffsets(self.curveRail1, localDerivativesRail1, self.curveProfile.worldMatrix, localPointsProfile)
+        worldOffsetsProfileRail2 = FitOffsetsToRail(worldOffsetsProfileRail1, worldPointsRail1, worldPointsRail2)
+        points = worldPointsRail1[:, None] + worldOffsetsProfileRail2
+
+        return VectorsFromArray(points), GetGridFaces(resAlong, resAcross)
 
 
 class SweptAndMorphedSurface:
@@ -324,96 +226,24 @@ class SweptAndMorphedSurface:
         self.curveEndProfile = Curves.Curve(blenderObjectEndProfile)
 
     def Calculate(self, resAlong, resAcross):
-        worldMatrixRail = self.curveRail.worldMatrix
-        worldMatrixRailInv = worldMatrixRail.inverted()
-        worldMatrixBeginProfile = self.curveBeginProfile.worldMatrix
-        worldMatrixEndProfile = self.curveEndProfile.worldMatrix
-
         # 1. rail
-        worldPointsRail = self.curveRail.SampleWorld(resAlong)
+        worldPointsRail = self.curveRail.SampleArray(resAlong, world = True)
         localDerivativesRail = self.curveRail.SampleDerivatives(resAlong)
 
         # 2. beginProfile
-        localPointsBeginProfile = self.curveBeginProfile.Sample(resAcross)
-        currWorldMatrixBeginProfile = worldMatrixBeginProfile
-        prevDerivativeRail = localDerivativesRail[0]
-        vertsBeginProfile = []
-        for iRail in range(resAlong):
-            currDerivativeRail = localDerivativesRail[iRail]
-            localRotMatRail = Math.CalcRotationMatrix(prevDerivativeRail, currDerivativeRail)
-
-            currLocalProfileToLocalRail = worldMatrixRailInv * currWorldMatrixBeginProfile
-            worldPointsProfile = []
-            for iProfile in range(resAcross):
-                pointProfileLocalToRail = currLocalProfileToLocalRail * localPointsBeginProfile[iProfile]
-                rotatedPointProfile = localRotMatRail * pointProfileLocalToRail
-                worldPointsProfile.append(worldMatrixRail * rotatedPointProfile)
-
-            worldOffsetsProfile = []
-            worldPoint0Profile = worldPointsProfile[0]
-            for iProfile in range(resAcross): worldOffsetsProfile.append(worldPointsProfile[iProfile] - worldPoint0Profile)
-
-            for iProfile in range(resAcross):
-                currVert = worldPointsRail[iRail] + worldOffsetsProfile[iProfile]
-                vertsBeginProfile.append(currVert)
-
-            prevDerivativeRail = currDerivativeRail
-            currWorldMatrixBeginProfile = worldMatrixRail * localRotMatRail * currLocalProfileToLocalRail
+        localPointsBeginProfile = self.curveBeginProfile.SampleArray(resAcross)
+        worldOffsetsBeginProfile = CalcSweptProfileOffsets(self.curveRail, localDerivativesRail, self.curveBeginProfile.worldMatrix, localPointsBeginProfile)
+        vertsBeginProfile = worldPointsRail[:, None] + worldOffsetsBeginProfile
 
         # 3. endProfile
-        localPointsEndProfile = self.curveEndProfile.Sample(resAcross)
-        currWorldMatrixEndProfile = worldMatrixEndProfile
-        prevDerivativeRail = localDerivativesRail[-1]
-        vertsEndProfile = [None] * (resAlong * resAcross)
-        for iRail in reversed(range(resAlong)):
-            currDerivativeRail = localDerivativesRail[iRail]
-            localRotMatRail = Math.CalcRotationMatrix(prevDerivativeRail, currDerivativeRail)
-
-            currLocalProfileToLocalRail = worldMatrixRailInv * currWorldMatrixEndProfile
-            worldPointsProfile = []
-            for iProfile in range(resAcross):
-                pointProfileLocalToRail = currLocalProfileToLocalRail * localPointsEndProfile[iProfile]
-                rotatedPointProfile = localRotMatRail * pointProfileLocalToRail
-                worldPointsProfile.append(worldMatrixRail * rotatedPointProfile)
-
-            worldOffsetsProfile = []
-            worldPoint0Profile = worldPointsProfile[0]
-            for iProfile in range(resAcross): worldOffsetsProfile.append(worldPointsProfile[iProfile] - worldPoint0Profile)
-
-            for iProfile in range(resAcross):
-                iVert = (resAcross * iRail) + iProfile
-                currVert = worldPointsRail[iRail] + worldOffsetsProfile[iProfile]
-                vertsEndProfile[iVert] = currVert
-
-            prevDerivativeRail = currDerivativeRail
-            currWorldMatrixEndProfile = worldMatrixRail * localRotMatRail * currLocalProfileToLocalRail
+        localPointsEndProfile = self.curveEndProfile.SampleArray(resAcross)
+        worldOffsetsEndProfile = CalcSweptProfileOffsets(self.curveRail, localDerivativesRail, self.curveEndProfile.worldMatrix, localPointsEndProfile, reverse = True)
+        vertsEndProfile = worldPointsRail[:, None] + worldOffsetsEndProfile
 
         # 4. morph
-        rvVertices = []
-        fltResRailMin1 = float(resAlong - 1)
-        for iRail in range(resAlong):
-            weightEnd = float(iRail) / fltResRailMin1
-            weightBegin = 1.0 - weightEnd
-            for iProfile in range(resAcross):
-                iVert = (resAcross * iRail) + iProfile
-                vertBegin = vertsBeginProfile[iVert]
-                vertEnd = vertsEndProfile[iVert]
-                vertMorphed = (vertBegin * weightBegin) + (vertEnd * weightEnd)
-                rvVertices.append(vertMorphed)
-
-        rvFaces = []
-        for iAlong in range(resAlong - 1):
-            currAlong = iAlong * resAcross
-            nextAlong = currAlong + resAcross
-            for iAcross in range(resAcross - 1):
-                indexBL = currAlong + iAcross
-                indexTL = indexBL + 1
-                indexBR = nextAlong + iAcross
-                indexTR = indexBR + 1
-
-                rvFaces.append([indexBL, indexBR, indexTR, indexTL])
+        points = Morph(vertsBeginProfile, vertsEndProfile)
 
-        return rvVertices, rvFaces
+        return VectorsFromArray(points), GetGridFaces(resAlong, resAcross)
 
 
 class BirailedAndMorphedSurface:
@@ -424,119 +254,22 @@ class BirailedAndMorphedSurface:
         self.curveEndProfile = Curves.Curve(blenderObjectEndProfile)
 
     def Calculate(self, resAlong, resAcross):
-        worldMatrixRail1 = self.curveRail1.worldMatrix
-        worldMatrixBeginProfile = self.curveBeginProfile.worldMatrix
-        worldMatrixEndProfile = self.curveEndProfile.worldMatrix
-
         # 1. rail
-        worldPointsRail1 = self.curveRail1.SampleWorld(resAlong)
+        worldPointsRail1 = self.curveRail1.SampleArray(resAlong, world = True)
         localDerivativesRail1 = self.curveRail1.SampleDerivatives(resAlong)
-        worldPointsRail2 = self.curveRail2.SampleWorld(resAlong)
+        worldPointsRail2 = self.curveRail2.SampleArray(resAlong, world = True)
 
         # 2. beginProfile
-        localPointsBeginProfile = self.curveBeginProfile.Sample(resAcross)
-        currWorldMatrixBeginProfile = worldMatrixBeginProfile
-        worldMatrixRail1Inv = worldMatrixRail1.inverted()
-        prevDerivativeRail1 = localDerivativesRail1[0]
-        vertsBeginProfile = []
-        for iRail in range(resAlong):
-            currDerivativeRail1 = localDerivativesRail1[iRail]
-            localRotMatRail1 = Math.CalcRotationMatrix(prevDerivativeRail1, currDerivativeRail1)
-
-            currLocalBeginProfileToLocalRail1 = worldMatrixRail1Inv * currWorldMatrixBeginProfile
-            worldPointsBeginProfileRail1 = []
-            for iProfile in range(resAcross):
-                pointBeginProfileLocalToRail1 = currLocalBeginProfileToLocalRail1 * localPointsBeginProfile[iProfile]
-                rotatedPointProfile = localRotMatRail1 * pointBeginProfileLocalToRail1
-                worldPointsBeginProfileRail1.append(worldMatrixRail1 * rotatedPointProfile)
-
-            worldOffsetsBeginProfileRail1 = []
-            worldPoint0BeginProfileRail1 = worldPointsBeginProfileRail1[0]
-            for iProfile in range(resAcross): worldOffsetsBeginProfileRail1.append(worldPointsBeginProfileRail1[iProfile] - worldPoint0BeginProfileRail1)
-
-            worldStartPointBeginProfileRail1 = worldPointsRail1[iRail]
-            worldEndPointBeginProfileRail1 = worldStartPointBeginProfileRail1 + worldOffsetsBeginProfileRail1[-1]
-            v3From = worldEndPointBeginProfileRail1 - worldStartPointBeginProfileRail1
-            v3To = worldPointsRail2[iRail] - worldStartPointBeginProfileRail1
-            scaleFactorRail2 = v3To.magnitude / v3From.magnitude
-            rotMatRail2 = Math.CalcRotationMatrix(v3From, v3To)
-
-            worldOffsetsBeginProfileRail2 = []
-            for iProfile in range(resAcross):
-                offsetBeginProfileRail1 = worldOffsetsBeginProfileRail1[iProfile]
-                worldOffsetsBeginProfileRail2.append(rotMatRail2 * (offsetBeginProfileRail1 * scaleFactorRail2))
-
-            for iProfile in range(resAcross):
-                currVert = worldPointsRail1[iRail] + worldOffsetsBeginProfileRail2[iProfile]
-                vertsBeginProfile.append(currVert)
-
-            prevDerivativeRail1 = currDerivativeRail1
-            currWorldMatrixBeginProfile = worldMatrixRail1 * localRotMatRail1 * currLocalBeginProfileToLocalRail1
+        localPointsBeginProfile = self.curveBeginProfile.SampleArray(resAcross)
+        worldOffsetsBeginProfile = CalcSweptProfileOffsets(self.curveRail1, localDerivativesRail1, self.curveBeginProfile.worldMatrix, localPointsBeginProfile)
+        vertsBeginProfile = worldPointsRail1[:, None] + FitOffsetsToRail(worldOffsetsBeginProfile, worldPointsRail1, worldPointsRail2)
 
         # 3. endProfile
-        localPointsEndProfile = self.curveEndProfile.Sample(resAcross)
-        currWorldMatrixEndProfile = worldMatrixEndProfile
-        worldMatrixRail1Inv = worldMatrixRail1.inverted()
-        prevDerivativeRail1 = localDerivativesRail1[-1]
-        vertsEndProfile = [None] * (resAlong * resAcross)
-        for iRail in reversed(range(resAlong)):
-            currDerivativeRail1 = localDerivativesRail1[iRail]
-            localRotMatRail1 = Math.CalcRotationMatrix(prevDerivativeRail1, currDerivativeRail1)
-
-            currLocalEndProfileToLocalRail1 = worldMatrixRail1Inv * currWorldMatrixEndProfile
-            worldPointsEndProfileRail1 = []
-            for iProfile in range(resAcross):
-                pointEndProfileLocalToRail1 = currLocalEndProfileToLocalRail1 * localPointsEndProfile[iProfile]
-                rotatedPointProfile = localRotMatRail1 * pointEndProfileLocalToRail1
-                worldPointsEndProfileRail1.append(worldMatrixRail1 * rotatedPointProfile)
-
-            worldOffsetsEndProfileRail1 = []
-            worldPoint0EndProfileRail1 = worldPointsEndProfileRail1[0]
-            for iProfile in range(resAcross): worldOffsetsEndProfileRail1.append(worldPointsEndProfileRail1[iProfile] - worldPoint0EndProfileRail1)
-
-            worldStartPointEndProfileRail1 = worldPointsRail1[iRail]
-            worldEndPointEndProfileRail1 = worldStartPointEndProfileRail1 + worldOffsetsEndProfileRail1[-1]
-            v3From = worldEndPointEndProfileRail1 - worldStartPointEndProfileRail1
-            v3To = worldPointsRail2[iRail] - worldStartPointEndProfileRail1
-            scaleFactorRail2 = v3To.magnitude / v3From.magnitude
-            rotMatRail2 = Math.CalcRotationMatrix(v3From, v3To)
-
-            worldOffsetsEndProfileRail2 = []
-            for iProfile in range(resAcross):
-                offsetEndProfileRail1 = worldOffsetsEndProfileRail1[iProfile]
-                worldOffsetsEndProfileRail2.append(rotMatRail2 * (offsetEndProfileRail1 * scaleFactorRail2))
-
-            for iProfile in range(resAcross):
-                iVert = (resAcross * iRail) + iProfile
-                currVert = worldPointsRail1[iRail] + worldOffsetsEndProfileRail2[iProfile]
-                vertsEndProfile[iVert] = currVert
-
-            prevDerivativeRail1 = currDerivativeRail1
-            currWorldMatrixEndProfile = worldMatrixRail1 * localRotMatRail1 * currLocalEndProfileToLocalRail1
+        localPointsEndProfile = self.curveEndProfile.SampleArray(resAcross)
+        worldOffsetsEndProfile = CalcSweptProfileOffsets(self.curveRail1, localDerivativesRail1, self.curveEndProfile.worldMatrix, localPointsEndProfile, reverse = True)
+        vertsEndProfile = worldPointsRail1[:, None] + FitOffsetsToRail(worldOffsetsEndProfile, worldPointsRail1, worldPointsRail2)
 
         # 4. morph
-        rvVertices = []
-        fltResRailMin1 = float(resAlong - 1)
-        for iRail in range(resAlong):
-            weightEnd = float(iRail) / fltResRailMin1
-            weightBegin = 1.0 - weightEnd
-            for iProfile in range(resAcross):
-                iVert = (resAcross * iRail) + iProfile
-                vertBegin = vertsBeginProfile[iVert]
-                vertEnd = vertsEndProfile[iVert]
-                vertMorphed = (vertBegin * weightBegin) + (vertEnd * weightEnd)
-                rvVertices.append(vertMorphed)
-
-        rvFaces = []
-        for iAlong in range(resAlong - 1):
-            currAlong = iAlong * resAcross
-            nextAlong = currAlong + resAcross
-            for iAcross in range(resAcross - 1):
-                indexBL = currAlong + iAcross
-                indexTL = indexBL + 1
-                indexBR = nextAlong + iAcross
-                indexTR = indexBR + 1
-
-                rvFaces.append([indexBL, indexBR, indexTR, indexTL])
+        points = Morph(vertsBeginProfile, vertsEndProfile)
 
-        return rvVertices, rvFaces
+        return VectorsFromArray(points), GetGridFaces(resAlong, resAcross)
@@ -0,0 +1,47 @@
+import bpy
+from bpy.types import Node
+from ... mn_node_base import AnimationNode
+from ... mn_execution import nodePropertyChanged, allowCompiling, forbidCompiling
+
+from . import Curves
+
+class mn_CurvePointListProjectorNode(Node, AnimationNode):
+    bl_idname = "mn_CurvePointListProjectorNode"
+    bl_label = "Curve Point List Projector"
+    readOnlyInputs = ["World Points"]
+
+    def init(self, context):
+        forbidCompiling()
+        self.inputs.new("mn_VectorListSocket", "World Points")
+        self.inputs.new("mn_ObjectSocket", "Curve")
+        self.outputs.new("mn_FloatListSocket", "Parameters")
+        self.outputs.new("mn_FloatListSocket", "Distances")
+        allowCompiling()
+
+    def getInputSocketNames(self):
+        return {"World Points" : "points",
+                "Curve" : "curve"}
+
+    def getOutputSocketNames(self):
+        return {"Parameters" : "parameters",
+                "Distances" : "distances"}
+
+    def canExecute(self, points, curve):
+        if len(points) == 0: return False
+        if not Curves.IsBezierCurve(curve): return False
+
+        return True
+
+    def execute(self, points, curve):
+        parameters = []
+        distances = []
+        if not self.canExecute(points, curve):
+            return parameters, distances
+
+        try:
+            curveCurve = Curves.Curve(curve)
+            parameters, distances = curveCurve.CalcProjections(points)
+            parameters, distances = parameters.tolist(), distances.tolist()
+        except: pass
+
+        return parameters, distances
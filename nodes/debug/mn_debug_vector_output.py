@@ -6,6 +6,7 @@ from ... mn_execution import nodePropertyChanged, allowCompiling, forbidCompilin
 class mn_DebugVectorOutputNode(Node, AnimationNode):
     bl_idname = "mn_DebugVectorOutputNode"
     bl_label = "Debug Vector Output"
+    readOnlyInputs = ["Vector"]
     
     debugOutputString_component0 = bpy.props.StringProperty(default = "")
     debugOutputString_component1 = bpy.props.StringProperty(default = "")
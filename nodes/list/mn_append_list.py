@@ -8,6 +8,7 @@ from ... mn_execution import nodePropertyChanged, allowCompiling, forbidCompilin
 class mn_AppendListNode(Node, AnimationNode):
     bl_idname = "mn_AppendListNode"
     bl_label = "Append to List"
+    batchInvariantInputs = ["List"]
     
     def init(self, context):
         forbidCompiling()
@@ -25,6 +26,9 @@ class mn_AppendListNode(Node, AnimationNode):
     def getInLineExecutionString(self, outputUse):
         return "$list$ = %list%\n" + \
                 "$list$.append(%element%)"
+    def getBatchExecutionString(self, outputUse):
+        return "$list$ = %list%\n" + \
+                "$list$.extend(%element%)"
                 
     def update(self):
         nodeTree = self.id_data
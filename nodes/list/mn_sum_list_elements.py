@@ -7,6 +7,7 @@ from ... mn_utils import *
 class mn_SumListElementsNode(Node, AnimationNode):
     bl_idname = "mn_SumListElementsNode"
     bl_label = "Sum Elements"
+    readOnlyInputs = ["List"]
     
     def setSocketTypes(self, context):
         self.setSocketType(self.listTypesProperty)
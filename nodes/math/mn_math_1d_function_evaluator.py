@@ -2,22 +2,12 @@ import bpy
 from bpy.types import Node
 import bpy
 from bpy.types import Node
-import math
-from math import *
 from ... mn_node_base import AnimationNode
+from ... utils.mn_expression_utils import getExpression
 from ... mn_execution import allowCompiling, forbidCompiling
 
 defaultFunction = "u"
 
-# list of safe functions for eval()
-safe_list = ['math', 'acos', 'asin', 'atan', 'atan2', 'ceil', 'cos', 'cosh',
-             'degrees', 'e', 'exp', 'fabs', 'floor', 'fmod', 'frexp', 'hypot',
-             'ldexp', 'log', 'log10', 'modf', 'pi', 'pow', 'radians',
-             'sin', 'sinh', 'sqrt', 'tan', 'tanh']
-
-# use the list to filter the local namespace
-safe_dict = dict((k, globals().get(k, None)) for k in safe_list)
-
 class mn_Math1DFunctionEvaluatorNode(Node, AnimationNode):
     bl_idname = "mn_Math1DFunctionEvaluatorNode"
     bl_label = "1D Function Evaluator"
@@ -37,18 +27,8 @@ class mn_Math1DFunctionEvaluatorNode(Node, AnimationNode):
         return {"Result" : "result"}
 
     def execute(self, function, argumentU):
-        def canExecute():
-            try: self.expr_args = (compile(function, __file__, 'eval'), {"__builtins__": None}, safe_dict)
-            except: return False
-            
-            return True
-
-        result = 0.0
-        if not canExecute(): return result
-
-        safe_dict['u'] = argumentU
-        try: result = float(eval(*(self.expr_args)))
-        except: pass
+        expression = getExpression(function, ["u"])
+        if expression is None: return 0.0
         
-        return result
-        
\ No newline at end of file
+        try: return expression.evaluate(argumentU)
+        except: return 0.0
@@ -8,6 +8,7 @@ from ... mn_execution import nodePropertyChanged, nodeTreeChanged, allowCompilin
 class mn_Math2DCoordinatesCartesianToPolar(Node, AnimationNode):
     bl_idname = "mn_Math2DCoordinatesCartesianToPolar"
     bl_label = "Cartesian To Polar"
+    isDetermined = True
     
     def init(self, context):
         forbidCompiling()
@@ -2,12 +2,14 @@ import bpy
 import math
 from bpy.types import Node
 from ... mn_node_base import AnimationNode
+from ... utils.mn_batch_math import cartesianToPolar
 from ... mn_execution import nodePropertyChanged, nodeTreeChanged, allowCompiling, forbidCompiling
 
 # http://en.wikipedia.org/wiki/Polar_coordinate_system
 class mn_Math2DCoordinatesCartesianToPolarList(Node, AnimationNode):
     bl_idname = "mn_Math2DCoordinatesCartesianToPolarList"
     bl_label = "Cartesian To Polar List"
+    readOnlyInputs = ["List X", "List Y"]
     
     def init(self, context):
         forbidCompiling()
@@ -31,21 +33,8 @@ class mn_Math2DCoordinatesCartesianToPolarList(Node, AnimationNode):
         return True
 
     def execute(self, listX, listY):
-        listRadius = []
-        listAzimuth = []
         if not self.canExecute(listX, listY):
-            return listRadius, listAzimuth
+            return [], []
         
-        try:
-            lenLists = len(listX)
-            for iLists in range(lenLists):
-                x = listX[iLists]
-                y = listY[iLists]
-                radius = math.sqrt(x*x + y*y)
-                azimuth = math.atan2(y, x)  # in range [-pi .. pi]
-                listRadius.append(radius)
-                listAzimuth.append(azimuth)
-        except: pass
-        
-        return listRadius, listAzimuth
-
+        try: return cartesianToPolar(listX, listY)
+        except: return [], []
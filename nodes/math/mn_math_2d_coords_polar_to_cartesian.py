@@ -8,6 +8,7 @@ from ... mn_execution import nodePropertyChanged, nodeTreeChanged, allowCompilin
 class mn_Math2DCoordinatesPolarToCartesian(Node, AnimationNode):
     bl_idname = "mn_Math2DCoordinatesPolarToCartesian"
     bl_label = "Polar To Cartesian"
+    isDetermined = True
     
     # is this description used anywhere? in the node add menu, eg, would be nice
     bl_description = "Converts a (2D) point in Polar Coordinates to Cartesian Coordinates"
@@ -2,12 +2,14 @@ import bpy
 import math
 from bpy.types import Node
 from ... mn_node_base import AnimationNode
+from ... utils.mn_batch_math import polarToCartesian
 from ... mn_execution import nodePropertyChanged, nodeTreeChanged, allowCompiling, forbidCompiling
 
 # http://en.wikipedia.org/wiki/Polar_coordinate_system
 class mn_Math2DCoordinatesPolarToCartesianList(Node, AnimationNode):
     bl_idname = "mn_Math2DCoordinatesPolarToCartesianList"
     bl_label = "Polar To Cartesian List"
+    readOnlyInputs = ["List Radius", "List Azimuth"]
     
     def init(self, context):
         forbidCompiling()
@@ -31,21 +33,8 @@ class mn_Math2DCoordinatesPolarToCartesianList(Node, AnimationNode):
         return True
 
     def execute(self, listRadius, listAzimuth):
-        listX = []
-        listY = []
         if not self.canExecute(listRadius, listAzimuth):
-            return listX, listY
+            return [], []
         
-        try:
-            lenLists = len(listRadius)
-            for iLists in range(lenLists):
-                radius = listRadius[iLists]
-                azimuth = listAzimuth[iLists]
-                x = math.cos(azimuth) * radius
-                y = math.sin(azimuth) * radius
-                listX.append(x)
-                listY.append(y)
-        except: pass
-        
-        return listX, listY
-
+        try: return polarToCartesian(listRadius, listAzimuth)
+        except: return [], []
@@ -2,22 +2,12 @@ import bpy
 from bpy.types import Node
 import bpy
 from bpy.types import Node
-import math
-from math import *
 from ... mn_node_base import AnimationNode
+from ... utils.mn_expression_utils import getExpression
 from ... mn_execution import allowCompiling, forbidCompiling
 
 defaultFunction = "u * v"
 
-# list of safe functions for eval()
-safe_list = ['math', 'acos', 'asin', 'atan', 'atan2', 'ceil', 'cos', 'cosh',
-             'degrees', 'e', 'exp', 'fabs', 'floor', 'fmod', 'frexp', 'hypot',
-             'ldexp', 'log', 'log10', 'modf', 'pi', 'pow', 'radians',
-             'sin', 'sinh', 'sqrt', 'tan', 'tanh']
-
-# use the list to filter the local namespace
-safe_dict = dict((k, globals().get(k, None)) for k in safe_list)
-
 class mn_Math2DFunctionEvaluatorNode(Node, AnimationNode):
     bl_idname = "mn_Math2DFunctionEvaluatorNode"
     bl_label = "2D Function Evaluator"
@@ -39,19 +29,8 @@ class mn_Math2DFunctionEvaluatorNode(Node, AnimationNode):
         return {"Result" : "result"}
 
     def execute(self, function, argumentU, argumentV):
-        def canExecute():
-            try: self.expr_args = (compile(function, __file__, 'eval'), {"__builtins__": None}, safe_dict)
-            except: return False
-            
-            return True
-
-        result = 0.0
-        if not canExecute(): return result
-
-        safe_dict['u'] = argumentU
-        safe_dict['v'] = argumentV
-        try: result = float(eval(*(self.expr_args)))
-        except: pass
+        expression = getExpression(function, ["u", "v"])
+        if expression is None: return 0.0
         
-        return result
-        
\ No newline at end of file
+        try: return expression.evaluate(argumentU, argumentV)
+        except: return 0.0
@@ -1,22 +1,12 @@
 import bpy
 from bpy.types import Node
 import mathutils
-import math
-from math import *
 from ... mn_node_base import AnimationNode
+from ... utils.mn_expression_utils import getExpression
 from ... mn_execution import nodePropertyChanged, allowCompiling, forbidCompiling
 
 defaultFunction = "u * v"
 
-# list of safe functions for eval()
-safe_list = ['math', 'acos', 'asin', 'atan', 'atan2', 'ceil', 'cos', 'cosh',
-             'degrees', 'e', 'exp', 'fabs', 'floor', 'fmod', 'frexp', 'hypot',
-             'ldexp', 'log', 'log10', 'modf', 'pi', 'pow', 'radians',
-             'sin', 'sinh', 'sqrt', 'tan', 'tanh']
-
-# use the list to filter the local namespace
-safe_dict = dict((k, globals().get(k, None)) for k in safe_list)
-
 class mn_Math2DFunctionSamplerNode(Node, AnimationNode):
     bl_idname = "mn_Math2DFunctionSamplerNode"
     bl_label = "2D Function Sampler"
@@ -38,24 +28,8 @@ class mn_Math2DFunctionSamplerNode(Node, AnimationNode):
         return {"Samples" : "samples"}
 
     def execute(self, function, argumentListU, argumentListV):
-        def canExecute():
-            try: self.expr_args = (compile(function, __file__, 'eval'), {"__builtins__": None}, safe_dict)
-            except: return False
-            
-            return True
-
-        samples = []
-        if not canExecute(): return samples
-        
-        for argumentU in argumentListU:
-            safe_dict['u'] = argumentU
-            
-            for argumentV in argumentListV:
-                safe_dict['v'] = argumentV
-
-                try: sample = float(eval(*(self.expr_args)))
-                except: return []
-                
-                samples.append(sample)
+        expression = getExpression(function, ["u", "v"])
+        if expression is None: return []
         
-        return samples
+        try: return expression.evaluateGrid(argumentListU, argumentListV)
+        except: return []
@@ -7,6 +7,7 @@ from ... mn_execution import nodePropertyChanged, nodeTreeChanged, allowCompilin
 class mn_Math3DCoordinatesCartesianToCylindrical(Node, AnimationNode):
     bl_idname = "mn_Math3DCoordinatesCartesianToCylindrical"
     bl_label = "Cartesian To Cylindrical"
+    isDetermined = True
     
     def init(self, context):
         forbidCompiling()
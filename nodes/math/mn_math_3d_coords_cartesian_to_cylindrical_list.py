@@ -2,12 +2,14 @@ import bpy
 import math
 from bpy.types import Node
 from ... mn_node_base import AnimationNode
+from ... utils.mn_batch_math import cartesianToCylindrical
 from ... mn_execution import nodePropertyChanged, nodeTreeChanged, allowCompiling, forbidCompiling
 
 # http://en.wikipedia.org/wiki/Polar_coordinate_system
 class mn_Math3DCoordinatesCartesianToCylindricalList(Node, AnimationNode):
     bl_idname = "mn_Math3DCoordinatesCartesianToCylindricalList"
     bl_label = "Cartesian To Cylindrical List"
+    readOnlyInputs = ["List X", "List Y", "List Z"]
     
     def init(self, context):
         forbidCompiling()
@@ -36,21 +38,8 @@ class mn_Math3DCoordinatesCartesianToCylindricalList(Node, AnimationNode):
         return True
 
     def execute(self, listX, listY, listZ):
-        listRadius = []
-        listAzimuth = []
         if not self.canExecute(listX, listY, listZ):
-            return listRadius, listAzimuth, []
+            return [], [], []
         
-        try:
-            lenLists = len(listX)
-            for iLists in range(lenLists):
-                x = listX[iLists]
-                y = listY[iLists]
-                radius = math.sqrt(x*x + y*y)
-                azimuth = math.atan2(y, x)  # in range [-pi .. pi]
-                listRadius.append(radius)
-                listAzimuth.append(azimuth)
-        except: pass
-        
-        return listRadius, listAzimuth, listZ
-
+        try: return cartesianToCylindrical(listX, listY, listZ)
+        except: return [], [], []
@@ -7,6 +7,7 @@ from ... mn_execution import nodePropertyChanged, nodeTreeChanged, allowCompilin
 class mn_Math3DCoordinatesCartesianToSpherical(Node, AnimationNode):
     bl_idname = "mn_Math3DCoordinatesCartesianToSpherical"
     bl_label = "Cartesian To Spherical"
+    isDetermined = True
     
     def init(self, context):
         forbidCompiling()
@@ -2,11 +2,13 @@ import bpy
 import math
 from bpy.types import Node
 from ... mn_node_base import AnimationNode
+from ... utils.mn_batch_math import cartesianToSpherical
 from ... mn_execution import nodePropertyChanged, nodeTreeChanged, allowCompiling, forbidCompiling
 
 class mn_Math3DCoordinatesCartesianToSphericalList(Node, AnimationNode):
     bl_idname = "mn_Math3DCoordinatesCartesianToSphericalList"
     bl_label = "Cartesian To Spherical List"
+    readOnlyInputs = ["List X", "List Y", "List Z"]
     
     def init(self, context):
         forbidCompiling()
@@ -35,24 +37,8 @@ class mn_Math3DCoordinatesCartesianToSphericalList(Node, AnimationNode):
         return True
 
     def execute(self, listX, listY, listZ):
-        listRadius = []
-        listAzimuth = []
-        listElevation = []
         if not self.canExecute(listX, listY, listZ):
-            return listRadius, listAzimuth, listElevation
+            return [], [], []
         
-        try:
-            lenLists = len(listX)
-            for iLists in range(lenLists):
-                x = listX[iLists]
-                y = listY[iLists]
-                z = listZ[iLists]
-                radius = math.sqrt(x*x + y*y + z*z)
-                azimuth = math.atan2(y, x)
-                elevation = math.asin(z/radius)
-                listRadius.append(radius)
-                listAzimuth.append(azimuth)
-                listElevation.append(elevation)
-        except: pass
-        
-        return listRadius, listAzimuth, listElevation
+        try: return cartesianToSpherical(listX, listY, listZ)
+        except: return [], [], []
@@ -8,6 +8,7 @@ from ... mn_execution import nodePropertyChanged, nodeTreeChanged, allowCompilin
 class mn_Math3DCoordinatesCylindricalToCartesian(Node, AnimationNode):
     bl_idname = "mn_Math3DCoordinatesCylindricalToCartesian"
     bl_label = "Cylindrical To Cartesian"
+    isDetermined = True
     
     def init(self, context):
         forbidCompiling()
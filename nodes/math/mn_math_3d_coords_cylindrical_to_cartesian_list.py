@@ -2,12 +2,14 @@ import bpy
 import math
 from bpy.types import Node
 from ... mn_node_base import AnimationNode
+from ... utils.mn_batch_math import cylindricalToCartesian
 from ... mn_execution import nodePropertyChanged, nodeTreeChanged, allowCompiling, forbidCompiling
 
 # http://en.wikipedia.org/wiki/Polar_coordinate_system
 class mn_Math3DCoordinatesCylindricalToCartesianList(Node, AnimationNode):
     bl_idname = "mn_Math3DCoordinatesCylindricalToCartesianList"
     bl_label = "Cylindrical To Cartesian List"
+    readOnlyInputs = ["List Radius", "List Azimuth", "List Z"]
     
     def init(self, context):
         forbidCompiling()
@@ -36,21 +38,8 @@ class mn_Math3DCoordinatesCylindricalToCartesianList(Node, AnimationNode):
         return True
 
     def execute(self, listRadius, listAzimuth, listZ):
-        listX = []
-        listY = []
         if not self.canExecute(listRadius, listAzimuth, listZ):
-            return listX, listY, []
+            return [], [], []
         
-        try:
-            lenLists = len(listRadius)
-            for iLists in range(lenLists):
-                radius = listRadius[iLists]
-                azimuth = listAzimuth[iLists]
-                x = math.cos(azimuth) * radius
-                y = math.sin(azimuth) * radius
-                listX.append(x)
-                listY.append(y)
-        except: pass
-        
-        return listX, listY, listZ
-
+        try: return cylindricalToCartesian(listRadius, listAzimuth, listZ)
+        except: return [], [], []
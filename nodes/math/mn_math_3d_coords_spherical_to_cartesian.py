@@ -7,6 +7,7 @@ from ... mn_execution import nodePropertyChanged, nodeTreeChanged, allowCompilin
 class mn_Math3DCoordinatesSphericalToCartesian(Node, AnimationNode):
     bl_idname = "mn_Math3DCoordinatesSphericalToCartesian"
     bl_label = "Spherical To Cartesian"
+    isDetermined = True
     
     def init(self, context):
         forbidCompiling()
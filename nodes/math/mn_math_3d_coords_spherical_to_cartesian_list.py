@@ -2,11 +2,13 @@ import bpy
 import math
 from bpy.types import Node
 from ... mn_node_base import AnimationNode
+from ... utils.mn_batch_math import sphericalToCartesian
 from ... mn_execution import nodePropertyChanged, nodeTreeChanged, allowCompiling, forbidCompiling
 
 class mn_Math3DCoordinatesSphericalToCartesianList(Node, AnimationNode):
     bl_idname = "mn_Math3DCoordinatesSphericalToCartesianList"
     bl_label = "Spherical To Cartesian List"
+    readOnlyInputs = ["List Radius", "List Azimuth", "List Elevation"]
     
     def init(self, context):
         forbidCompiling()
@@ -35,25 +37,8 @@ class mn_Math3DCoordinatesSphericalToCartesianList(Node, AnimationNode):
         return True
 
     def execute(self, listRadius, listAzimuth, listElevation):
-        listX = []
-        listY = []
-        listZ = []
         if not self.canExecute(listRadius, listAzimuth, listElevation):
-            return listX, listY, listZ
+            return [], [], []
         
-        try:
-            lenLists = len(listRadius)
-            for iLists in range(lenLists):
-                radius = listRadius[iLists]
-                azimuth = listAzimuth[iLists]
-                elevation = listElevation[iLists]
-                cosElevation = math.cos(elevation)
-                x = radius * cosElevation * math.cos(azimuth)
-                y = radius * cosElevation * math.sin(azimuth)
-                z = radius * math.sin(elevation)
-                listX.append(x)
-                listY.append(y)
-                listZ.append(z)
-        except: pass
-        
-        return listX, listY, listZ
+        try: return sphericalToCartesian(listRadius, listAzimuth, listElevation)
+        except: return [], [], []
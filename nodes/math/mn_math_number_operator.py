@@ -2,7 +2,7 @@ import bpy
 
 from bpy.types import Node
 from ... mn_node_base import AnimationNode
-from ... mn_execution import allowCompiling, forbidCompiling
+from ... mn_execution import nodePropertyChanged, allowCompiling, forbidCompiling
 
 defaultOperand1 = 1.0
 defaultOperand2 = 2.0
@@ -10,12 +10,13 @@ defaultOperand2 = 2.0
 class mn_MathNumberOperatorNode(Node, AnimationNode):
     bl_idname = "mn_MathNumberOperatorNode"
     bl_label = "Number Operator"
+    isDetermined = True
 
     operator_items = [ ("Add", "Add", "Returns Operand1 + Operand2"), 
                        ("Subtract", "Subtract", "Returns Operand1 - Operand2"), 
                        ("Multiply", "Multiply", "Returns Operand1 * Operand2"), 
                        ("Divide", "Divide", "Returns Operand1 / Operand2 -- or 0.0")]
-    operator = bpy.props.EnumProperty(name = "Operator", items = operator_items, default = "Add")
+    operator = bpy.props.EnumProperty(name = "Operator", items = operator_items, default = "Add", update = nodePropertyChanged)
         
     def draw_buttons(self, context, layout):
         layout.prop(self, "operator")
@@ -10,6 +10,7 @@ class mn_DecomposeMatrix(Node, AnimationNode):
     bl_label = "Decompose Matrix"
     outputUseParameterName = "useOutput"
     isDetermined = True
+    readOnlyInputs = ["Matrix"]
     
     def init(self, context):
         forbidCompiling()
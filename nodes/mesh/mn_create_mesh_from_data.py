@@ -3,11 +3,13 @@ from bpy.types import Node
 from ... mn_node_base import AnimationNode
 from ... mn_execution import nodePropertyChanged, nodeTreeChanged, allowCompiling, forbidCompiling
 from ... data_structures.mesh import *
+from ... utils.mn_mesh_utils import *
 import bmesh
 
 class mn_CreateMeshFromData(Node, AnimationNode):
     bl_idname = "mn_CreateMeshFromData"
     bl_label = "Create Mesh"
+    readOnlyInputs = ["Mesh Data"]
     
     errorMessage = bpy.props.StringProperty(default = "")
     
@@ -28,24 +30,38 @@ class mn_CreateMeshFromData(Node, AnimationNode):
         
     def execute(self, meshData):
         try:
-            bm = getBMeshFromMeshData(meshData)
-            self.errorMessage = ""
+            if self.isOnlyUsedBySetMesh(): mesh = getCheckedMeshData(meshData)
+            else: mesh = getBMeshFromMeshData(meshData)
+            if self.errorMessage != "": self.errorMessage = ""
         except IndexError as e:
-            bm = bmesh.new()
+            mesh = bmesh.new()
             self.errorMessage = "Missing vertices"
-        return bm
-            
-def getBMeshFromMeshData(meshData):
-    bm = bmesh.new()
-    for co in meshData.vertices:
-        bm.verts.new(co)
+        return mesh
         
-    # for Blender Version >= 2.73
-    try: bm.verts.ensure_lookup_table()
-    except: pass
+    # Set Mesh writes the mesh data directly into the object mesh,
+    # so the bmesh is only created when another node needs it
+    def isOnlyUsedBySetMesh(self):
+        links = self.outputs["Mesh"].links
+        return len(links) > 0 and all(link.to_node.bl_idname == "mn_SetMeshOnObject" for link in links)
+            
+# the returned mesh data is backed by the arrays, so they are only converted once
+def getCheckedMeshData(meshData):
+    locationArray = meshData.getLocationArray()
+    edgeArray = meshData.getEdgeArray()
+    polygonArrays = meshData.getPolygonArrays()
+    if not hasValidIndices(len(locationArray) // 3, edgeArray, polygonArrays[2]):
+        raise IndexError("vertex index out of range")
+    return MeshData.fromArrays(locationArray, edgeArray, polygonArrays)
     
-    for edgeIndices in meshData.edges:
-        bm.edges.new((bm.verts[edgeIndices[0]], bm.verts[edgeIndices[1]]))
-    for polygonIndices in meshData.polygons:
-        bm.faces.new(tuple(bm.verts[index] for index in polygonIndices))
+# the data is written into a temporary mesh in bulk, which is much faster
+# than creating every vertex, edge and polygon of the bmesh on its own
+def getBMeshFromMeshData(meshData):
+    meshData = getCheckedMeshData(meshData)
+    mesh = bpy.data.meshes.new("AN Temporary Mesh")
+    try:
+        writeMeshArrays(mesh, meshData.locationArray, meshData.edgeArray, meshData.polygonArrays)
+        bm = bmesh.new()
+        bm.from_mesh(mesh)
+    finally:
+        bpy.data.meshes.remove(mesh)
     return bm
\ No newline at end of file
@@ -7,6 +7,7 @@ from ... mn_execution import allowCompiling, forbidCompiling, nodePropertyChange
 class mn_EdgesOfPolygons(Node, AnimationNode):
     bl_idname = "mn_EdgesOfPolygons"
     bl_label = "Edges of Polygons"
+    readOnlyInputs = ["Polygons"]
     
     def init(self, context):
         forbidCompiling()
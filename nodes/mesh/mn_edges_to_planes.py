@@ -7,6 +7,7 @@ from ... mn_execution import allowCompiling, forbidCompiling, nodePropertyChange
 class mn_EdgesToPlanes(Node, AnimationNode):
     bl_idname = "mn_EdgesToPlanes"
     bl_label = "Edges to Planes"
+    readOnlyInputs = ["Vertices", "Edges", "Up Vector"]
     
     calculateDirection = bpy.props.BoolProperty(name = "Calculate Direction", default = False, update = nodePropertyChanged, description = "Calculate a rectangle instead of a parallelogram (takes more time)")
     
@@ -7,6 +7,7 @@ from ... mn_execution import allowCompiling, forbidCompiling
 class mn_FindCloseVertices(Node, AnimationNode):
     bl_idname = "mn_FindCloseVertices"
     bl_label = "Find Close Vertices"
+    readOnlyInputs = ["Vertices"]
     
     def init(self, context):
         forbidCompiling()
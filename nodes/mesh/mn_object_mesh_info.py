@@ -4,8 +4,9 @@ from ... mn_node_base import AnimationNode
 from ... mn_execution import nodePropertyChanged, allowCompiling, forbidCompiling
 from ... data_structures.mesh import *
 from ... mn_cache import *
+from ... utils.mn_mesh_utils import *
 
-cacheIdentifier = "Object Mesh Data"
+cacheNamespace = getCacheNamespace("Object Mesh Data", maxSize = 500 * 1024 * 1024)
 
 class mn_ObjectMeshInfo(Node, AnimationNode):
     bl_idname = "mn_ObjectMeshInfo"
@@ -40,7 +41,8 @@ class mn_ObjectMeshInfo(Node, AnimationNode):
         if getattr(object, "type", None) != "MESH":
             return [], [], MeshData()
         
-        cache = self.getInitializedCache()
+        identifier = object.name + str(self.applyModifiers)
+        validityKey = getObjectDataIdentity(object)
         
         polygons = []
         vertices = []
@@ -50,61 +52,46 @@ class mn_ObjectMeshInfo(Node, AnimationNode):
         else:
             mesh = object.data
         
+        # reading the weights is the only part that can't be done in bulk
+        useGroupWeights = len(object.vertex_groups) > 0
         if useOutput["Polygons"]:
-            polygons = cacheFunctionResult(cache, object.name + "POLYGONS", getPolygonsFromMesh, [mesh], self.usePerObjectCache)
+            polygons = cacheFunctionResult(cacheNamespace, identifier + "POLYGONS", getPolygonsFromMesh, [mesh, useGroupWeights], self.usePerObjectCache, validityKey)
         if useOutput["Vertices"]:
-            vertices = cacheFunctionResult(cache, object.name + "VERTICES", getVerticesFromMesh, [mesh], self.usePerObjectCache)
+            vertices = cacheFunctionResult(cacheNamespace, identifier + "VERTICES", getVerticesFromMesh, [mesh, useGroupWeights], self.usePerObjectCache, validityKey)
         if useOutput["Mesh Data"]:
-            meshData = cacheFunctionResult(cache, object.name + "MESH_DATA", getMeshDataFromMesh, [mesh], self.usePerObjectCache)
+            meshData = cacheFunctionResult(cacheNamespace, identifier + "MESH_DATA", getMeshDataFromMesh, [mesh, identifier], self.usePerObjectCache, validityKey)
             
         if self.applyModifiers:
             bpy.data.meshes.remove(mesh)
             
         return polygons, vertices, meshData
         
-    def getInitializedCache(self):
-        cache = getLongTimeCache(cacheIdentifier)
-        if cache is None:
-            cache = {}
-            setLongTimeCache(cacheIdentifier, cache)
-        return cache
         
-        
-def getPolygonsFromMesh(mesh):
+def getPolygonsFromMesh(mesh, useGroupWeights = True):
+    vertices = getVerticesFromMesh(mesh, useGroupWeights)
+    loopStarts, loopTotals, loopVertexIndices = getPolygonLoopArrays(mesh)
+    areas = getPolygonAttributeArray(mesh, "area")
+    centers = vectorsFromArray(getPolygonAttributeArray(mesh, "center", 3))
+    normals = vectorsFromArray(getPolygonAttributeArray(mesh, "normal", 3))
+    materialIndices = getPolygonAttributeArray(mesh, "material_index", typeCode = "i")
+    
     polygons = []
-    for polygon in mesh.polygons:
-        vertices = []
-        for vertexIndex in polygon.vertices:
-            vertices.append(Vertex.fromMeshVertex(mesh.vertices[vertexIndex]))
-        polygons.append(Polygon(vertices, polygon.area, polygon.center.copy(), polygon.normal.copy(), polygon.material_index))
+    for start, total, area, center, normal, materialIndex in zip(loopStarts, loopTotals, areas, centers, normals, materialIndices):
+        polygonVertices = [vertices[index].copy() for index in loopVertexIndices[start:start + total]]
+        polygons.append(Polygon(polygonVertices, area, center, normal, materialIndex))
     return polygons
     
     
-def getVerticesFromMesh(mesh):
-    vertices = []
-    for vertex in mesh.vertices:
-        vertices.append(Vertex.fromMeshVertex(vertex))
-    return vertices
-    
+def getVerticesFromMesh(mesh, useGroupWeights = True):
+    locations = vectorsFromArray(getVertexAttributeArray(mesh, "co"))
+    normals = vectorsFromArray(getVertexAttributeArray(mesh, "normal"))
+    if useGroupWeights:
+        groupWeights = [[groupWeight.weight for groupWeight in vertex.groups] for vertex in mesh.vertices]
+    else:
+        groupWeights = [[] for i in range(len(mesh.vertices))]
+    return [Vertex(location, normal, weights) for location, normal, weights in zip(locations, normals, groupWeights)]
     
-def getMeshDataFromMesh(mesh):
-    vertices = getVertexLocationsFromMesh(mesh)
-    edges = getEdgesIndicesFromMesh(mesh)
-    polygons = getPolygonsIndicesFromMesh(mesh)
-    return MeshData(vertices, edges, polygons)
     
-def getVertexLocationsFromMesh(mesh):
-    return [vertex.co.copy() for vertex in mesh.vertices]
-    
-def getEdgesIndicesFromMesh(mesh):
-    edgesIndices = []
-    for edge in mesh.edges:
-        edgesIndices.append((edge.vertices[0], edge.vertices[1]))
-    return edgesIndices
-    
-def getPolygonsIndicesFromMesh(mesh):
-    polygonsIndices = []
-    for polygon in mesh.polygons:
-        polygonsIndices.append(polygon.vertices[:])
-    return polygonsIndices
-
+def getMeshDataFromMesh(mesh, identifier):
+    edgeArray, polygonArrays = getMeshTopologyArrays(mesh, identifier)
+    return MeshData.fromArrays(getVertexAttributeArray(mesh, "co"), edgeArray, polygonArrays)
@@ -0,0 +1,39 @@
+import bpy
+from bpy.types import Node
+from ... mn_node_base import AnimationNode
+from ... mn_execution import nodePropertyChanged, allowCompiling, forbidCompiling
+from ... data_structures.mesh import *
+from ... utils.mn_mesh_utils import setMeshArraysOnObject, hasValidIndices
+
+class mn_SetMeshDataOnObject(Node, AnimationNode):
+    bl_idname = "mn_SetMeshDataOnObject"
+    bl_label = "Set Mesh Data"
+    readOnlyInputs = ["Mesh Data"]
+    
+    def init(self, context):
+        forbidCompiling()
+        socket = self.inputs.new("mn_ObjectSocket", "Object")
+        socket.showName = False
+        socket.createObject = True
+        self.inputs.new("mn_MeshDataSocket", "Mesh Data")
+        self.outputs.new("mn_ObjectSocket", "Object")
+        allowCompiling()
+        
+    def getInputSocketNames(self):
+        return {"Object" : "object",
+                "Mesh Data" : "meshData"}
+    def getOutputSocketNames(self):
+        return {"Object" : "object"}
+        
+    # only the vertex locations are written when the topology didn't change
+    def execute(self, object, meshData):
+        if getattr(object, "type", None) != "MESH": return object
+        if object.mode != "OBJECT": return object
+        
+        locationArray = meshData.getLocationArray()
+        edgeArray = meshData.getEdgeArray()
+        polygonArrays = meshData.getPolygonArrays()
+        if not hasValidIndices(len(locationArray) // 3, edgeArray, polygonArrays[2]): return object
+        
+        setMeshArraysOnObject(object, locationArray, edgeArray, polygonArrays)
+        return object
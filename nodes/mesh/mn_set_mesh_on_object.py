@@ -3,10 +3,12 @@ from bpy.types import Node
 from ... mn_node_base import AnimationNode
 from ... mn_execution import nodePropertyChanged, allowCompiling, forbidCompiling
 from ... data_structures.mesh import *
+from ... utils.mn_mesh_utils import setMeshArraysOnObject
 
 class mn_SetMeshOnObject(Node, AnimationNode):
     bl_idname = "mn_SetMeshOnObject"
     bl_label = "Set Mesh"
+    readOnlyInputs = ["Mesh"]
     
     def init(self, context):
         forbidCompiling()
@@ -26,11 +28,13 @@ class mn_SetMeshOnObject(Node, AnimationNode):
     def getOutputSocketNames(self):
         return {"Object" : "object"}
         
+    # Create Mesh passes its mesh data on when it is only used by Set Mesh nodes
     def execute(self, object, bm):
         if object is None: return object
         if object.type == "MESH":
             if object.mode != "OBJECT":
                 bpy.ops.object.mode_set(mode = "OBJECT")
             if object.mode == "OBJECT":
-                bm.to_mesh(object.data)
+                if isinstance(bm, MeshData): setMeshArraysOnObject(object, bm.getLocationArray(), bm.getEdgeArray(), bm.getPolygonArrays())
+                else: bm.to_mesh(object.data)
         return object
\ No newline at end of file
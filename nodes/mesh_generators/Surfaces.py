@@ -4,20 +4,12 @@ import mathutils
 from mathutils import *
 from math import *
 
-from . import DelaunayVoronoi
+from . import Triangulation
+from ... utils.mn_expression_utils import getExpression
 
 # utility properties & functions
 defaultResolutionSynthesis = 16
 
-# list of safe functions for eval()
-safe_list = ['math', 'acos', 'asin', 'atan', 'atan2', 'ceil', 'cos', 'cosh',
-             'degrees', 'e', 'exp', 'fabs', 'floor', 'fmod', 'frexp', 'hypot',
-             'ldexp', 'log', 'log10', 'modf', 'pi', 'pow', 'radians',
-             'sin', 'sinh', 'sqrt', 'tan', 'tanh']
-
-# use the list to filter the local namespace
-safe_dict = dict((k, globals().get(k, None)) for k in safe_list)
-
 # A very simple "bridge" tool.
 # Connects two equally long vertex rows with faces.
 # Returns a list of the new faces (list of  lists)
@@ -94,21 +86,8 @@ class VoronoiSurface:
         self.ybuff = ybuff
 
     def Calculate(self):
-        rvVertices = []
-        rvFaces = []
-        
-        rawVertices, rawFacesDict = DelaunayVoronoi.computeVoronoiDiagram(self.locations, self.xbuff, self.ybuff, polygonsOutput=True, formatOutput=True, closePoly=False)
-        
-        for rawVert in rawVertices: 
-            rvVertices.append(mathutils.Vector((rawVert[0], rawVert[1], 0.0)))    # TODO: is it possible to keep/calc z?
-            
-        # need to remove possible doubles, for now
-        for key, val in rawFacesDict.items(): 
-            newVal = []
-            for currI in val:
-                if not currI in newVal: newVal.append(currI)
-            if len(newVal) >= 3: rvFaces.append(newVal)
-
+        rawVertices, rvFaces = Triangulation.computeVoronoiCells(self.locations, self.xbuff, self.ybuff)
+        rvVertices = [mathutils.Vector((rawVert[0], rawVert[1], 0.0)) for rawVert in rawVertices]    # TODO: is it possible to keep/calc z?
         return rvVertices, rvFaces
 
         
@@ -124,26 +103,25 @@ class HeightFunctionCartesianSurface:
         rvVertices = []
         rvFaces = []
         
-        try: expr_args = (compile(self.equation, __file__, 'eval'), {"__builtins__": None}, safe_dict)
-        except: return rvVertices, rvFaces
+        expression = getExpression(self.equation, ["x", "y"])
+        if expression is None: return rvVertices, rvFaces
 
         delta_x = (self.endX - self.startX) / float(resX - 1)
         delta_y = (self.endY - self.startY) / float(resY - 1)
+        listX = [self.startX + row_x * delta_x for row_x in range(resX)]
+        listY = [self.startY + row_y * delta_y for row_y in range(resY)]
+        
+        try: listZ = expression.evaluateGrid(listX, listY)
+        except: return [], []
         
         edgeloop_prev = []
         for row_x in range(resX):
             edgeloop_cur = []
-            x = self.startX + row_x * delta_x
+            x = listX[row_x]
 
             for row_y in range(resY):
-                y = self.startY + row_y * delta_y
-                z = 0.0
-
-                safe_dict['x'] = x
-                safe_dict['y'] = y
-
-                try: z = float(eval(*expr_args))
-                except: return [], []
+                y = listY[row_y]
+                z = listZ[row_x * resY + row_y]
 
                 edgeloop_cur.append(len(rvVertices))
                 rvVertices.append(Vector((x, y, z)))
@@ -170,26 +148,25 @@ class HeightFunctionPolarSurface:
         rvVertices = []
         rvFaces = []
         
-        try: expr_args = (compile(self.equation, __file__, 'eval'), {"__builtins__": None}, safe_dict)
-        except: return rvVertices, rvFaces
+        expression = getExpression(self.equation, ["r", "a"])
+        if expression is None: return rvVertices, rvFaces
 
         delta_r = (self.endR - self.startR) / float(resR - 1)
         delta_a = (self.endA - self.startA) / float(resA - 1)
+        listR = [self.startR + row_r * delta_r for row_r in range(resR)]
+        listA = [self.startA + row_a * delta_a for row_a in range(resA)]
+        
+        try: listZ = expression.evaluateGrid(listR, listA)
+        except: return [], []
         
         edgeloop_prev = []
         for row_r in range(resR):
             edgeloop_cur = []
-            r = self.startR + row_r * delta_r
+            r = listR[row_r]
 
             for row_a in range(resA):
-                a = self.startA + row_a * delta_a
-                z = 0.0
-
-                safe_dict['r'] = r
-                safe_dict['a'] = a
-
-                try: z = float(eval(*expr_args))
-                except: return [], []
+                a = listA[row_a]
+                z = listZ[row_r * resA + row_a]
 
                 x = r * cos(a)
                 y = r * sin(a)
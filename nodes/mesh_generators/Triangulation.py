@@ -0,0 +1,318 @@
+from math import sqrt, atan2, isfinite
+
+try:
+    import scipy.spatial
+    QhullDelaunay = scipy.spatial.Delaunay
+    QhullError = getattr(scipy.spatial, "QhullError", None) or scipy.spatial.qhull.QhullError
+except ImportError: QhullDelaunay = None
+
+# Delaunay triangulation and clipped Voronoi cells of 2D points (only x and y are used)
+#
+# Without SciPy the triangulation is built with an incremental Bowyer-Watson algorithm.
+# The triangles are stored in flat lists: triangle t has the vertices
+# vertices[3t], vertices[3t+1], vertices[3t+2] in counter clockwise order and
+# neighbors[3t+i] is the triangle on the other side of the edge opposite to vertex i.
+
+class TriangulationError(Exception):
+    pass
+
+
+# delaunay
+###############################
+
+# returns a list of counter clockwise index triples, duplicate points are ignored
+def computeDelaunayTriangles(points):
+    points = [(point[0], point[1]) for point in points]
+    if len(points) < 3: raise TriangulationError("At least 3 points are needed")
+    if not all(isfinite(x) and isfinite(y) for x, y in points): raise TriangulationError("Points must be finite")
+    if QhullDelaunay is not None:
+        return computeDelaunayTrianglesWithQhull(points)
+    return computeDelaunayTrianglesIncremental(points)
+
+def computeDelaunayTrianglesWithQhull(points):
+    try: delaunay = QhullDelaunay(points)
+    except (QhullError, ValueError) as e: raise TriangulationError(str(e))
+    triangles = []
+    for a, b, c in delaunay.simplices.tolist():
+        if orientation(points[a], points[b], points[c]) < 0: b, c = c, b
+        triangles.append((a, b, c))
+    return triangles
+
+def computeDelaunayTrianglesIncremental(points):
+    triangulation = IncrementalTriangulation(points, getSpatialOrder(points))
+    triangulation.insertAll()
+    return triangulation.getTriangles()
+
+# the hull edges are connected with one vertex at infinity, these ghost triangles contain
+# everything on the outer side of their edge, so that points outside of the hull need no special case
+class IncrementalTriangulation:
+    def __init__(self, points, order):
+        self.points = points
+        self.ghost = len(points)
+        a, b, c = self.findFirstTriangle(order)
+        if orientation(points[a], points[b], points[c]) < 0: b, c = c, b
+
+        ghost = self.ghost
+        self.vertices = [a, b, c,  c, b, ghost,  a, c, ghost,  b, a, ghost]
+        self.neighbors = [1, 2, 3,  3, 2, 0,  1, 3, 0,  2, 1, 0]
+        self.alive = [True] * 4
+        self.lastTriangle = 0
+        self.remainingOrder = [index for index in order if index not in (a, b, c)]
+
+    def findFirstTriangle(self, order):
+        points = self.points
+        a = order[0]
+        b = next((index for index in order if points[index] != points[a]), None)
+        if b is not None:
+            for c in order:
+                if orientation(points[a], points[b], points[c]) != 0: return a, b, c
+        raise TriangulationError("All points are on one line")
+
+    def insertAll(self):
+        for index in self.remainingOrder:
+            self.insert(index)
+
+    def insert(self, index):
+        point = self.points[index]
+        triangle = self.locate(point)
+        for vertex in self.vertices[triangle * 3:triangle * 3 + 3]:
+            if vertex != self.ghost and self.points[vertex] == point: return
+
+        cavity = self.findCavity(triangle, point)
+        boundary = self.findCavityBoundary(cavity)
+        self.fillCavity(cavity, boundary, index)
+
+    # walk from the last created triangle towards the point
+    def locate(self, point):
+        points, vertices, neighbors, ghost = self.points, self.vertices, self.neighbors, self.ghost
+        triangle = self.lastTriangle
+        if ghost in vertices[triangle * 3:triangle * 3 + 3]:
+            if self.contains(triangle, point): return triangle
+            triangle = neighbors[triangle * 3 + vertices.index(ghost, triangle * 3, triangle * 3 + 3) % 3]
+        for step in range(len(self.alive)):
+            offset = triangle * 3
+            for i in range(3):
+                a = points[vertices[offset + (i + 1) % 3]]
+                b = points[vertices[offset + (i + 2) % 3]]
+                if orientation(a, b, point) < 0:
+                    triangle = neighbors[offset + i]
+                    break
+            else:
+                return triangle
+            if ghost in vertices[triangle * 3:triangle * 3 + 3]: return triangle
+        return self.locateLinear(point)
+
+    def locateLinear(self, point):
+        for triangle, alive in enumerate(self.alive):
+            if alive and self.contains(triangle, point): return triangle
+        raise TriangulationError("Point could not be located")
+
+    def contains(self, triangle, point):
+        a, b, c = self.vertices[triangle * 3:triangle * 3 + 3]
+        ghost, points = self.ghost, self.points
+        if ghost in (a, b, c):
+            a, b = getHullEdge(a, b, c, ghost)
+            return orientation(points[a], points[b], point) > 0
+        a, b, c = points[a], points[b], points[c]
+        return orientation(a, b, point) >= 0 and orientation(b, c, point) >= 0 and orientation(c, a, point) >= 0
+
+    # all triangles whose circumcircle contains the point
+    def findCavity(self, triangle, point):
+        neighbors = self.neighbors
+        cavity = {triangle}
+        stack = [triangle]
+        while len(stack) > 0:
+            current = stack.pop()
+            for i in range(3):
+                neighbor = neighbors[current * 3 + i]
+                if neighbor in cavity: continue
+                if self.inCircumcircle(neighbor, point):
+                    cavity.add(neighbor)
+                    stack.append(neighbor)
+        return cavity
+
+    # the circle of a ghost triangle is the half plane outside of its hull edge
+    def inCircumcircle(self, triangle, point):
+        a, b, c = self.vertices[triangle * 3:triangle * 3 + 3]
+        ghost, points = self.ghost, self.points
+        if ghost in (a, b, c):
+            a, b = getHullEdge(a, b, c, ghost)
+            return isBeyondHullEdge(points[a], points[b], point)
+        return inCircumcircle(points[a], points[b], points[c], point)
+
+    # the counter clockwise edges of the cavity with the triangles outside of it
+    def findCavityBoundary(self, cavity):
+        vertices, neighbors = self.vertices, self.neighbors
+        boundary = []
+        for triangle in cavity:
+            offset = triangle * 3
+            for i in range(3):
+                neighbor = neighbors[offset + i]
+                if neighbor in cavity: continue
+                a = vertices[offset + (i + 1) % 3]
+                b = vertices[offset + (i + 2) % 3]
+                for j in range(3):
+                    if neighbors[neighbor * 3 + j] == triangle: neighborSlot = neighbor * 3 + j
+                boundary.append((a, b, neighbor, neighborSlot))
+        return boundary
+
+    # connect every boundary edge with the new point, the slots of removed triangles are reused
+    def fillCavity(self, cavity, boundary, index):
+        vertices, neighbors, alive = self.vertices, self.neighbors, self.alive
+        freeTriangles = list(cavity)
+        while len(freeTriangles) < len(boundary):
+            freeTriangles.append(len(alive))
+            alive.append(True)
+            vertices.extend((-1, -1, -1))
+            neighbors.extend((-1, -1, -1))
+        for triangle in freeTriangles[len(boundary):]:
+            alive[triangle] = False
+
+        triangleByFirstVertex = {}
+        for triangle, (a, b, neighbor, neighborSlot) in zip(freeTriangles, boundary):
+            offset = triangle * 3
+            vertices[offset:offset + 3] = (a, b, index)
+            neighbors[offset + 2] = neighbor
+            neighbors[neighborSlot] = triangle
+            triangleByFirstVertex[a] = triangle
+        for triangle in freeTriangles[:len(boundary)]:
+            nextTriangle = triangleByFirstVertex[vertices[triangle * 3 + 1]]
+            neighbors[triangle * 3] = nextTriangle
+            neighbors[nextTriangle * 3 + 1] = triangle
+        self.lastTriangle = freeTriangles[0]
+
+    def getTriangles(self):
+        vertices, ghost = self.vertices, self.ghost
+        triangles = []
+        for triangle, alive in enumerate(self.alive):
+            if not alive: continue
+            vertexIndices = tuple(vertices[triangle * 3:triangle * 3 + 3])
+            if ghost not in vertexIndices: triangles.append(vertexIndices)
+        return triangles
+
+# the edge of a ghost triangle in the order of the triangle
+def getHullEdge(a, b, c, ghost):
+    if c == ghost: return a, b
+    if a == ghost: return b, c
+    return c, a
+
+def isBeyondHullEdge(a, b, point):
+    side = orientation(a, b, point)
+    if side != 0: return side > 0
+    # on the line of the edge, then only points on the edge itself count
+    return ((point[0] - a[0]) * (b[0] - a[0]) + (point[1] - a[1]) * (b[1] - a[1]) > 0 and
+            (point[0] - b[0]) * (a[0] - b[0]) + (point[1] - b[1]) * (a[1] - b[1]) > 0)
+
+# points that are close in space are inserted after each other, so that the walks stay short
+def getSpatialOrder(points):
+    xs = [point[0] for point in points]
+    ys = [point[1] for point in points]
+    minX, minY = min(xs), min(ys)
+    cellAmount = max(int(sqrt(len(points) / 2)), 1)
+    cellWidth = max(max(xs) - minX, 1e-9) / cellAmount
+    cellHeight = max(max(ys) - minY, 1e-9) / cellAmount
+
+    def getSortKey(index):
+        column = min(int((xs[index] - minX) / cellWidth), cellAmount - 1)
+        row = min(int((ys[index] - minY) / cellHeight), cellAmount - 1)
+        if row % 2 == 1: column = cellAmount - 1 - column
+        return (row, column, xs[index] if row % 2 == 0 else -xs[index])
+    return sorted(range(len(points)), key = getSortKey)
+
+def orientation(a, b, c):
+    return (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+
+# the triangle a, b, c has to be counter clockwise
+def inCircumcircle(a, b, c, d):
+    adx, ady = a[0] - d[0], a[1] - d[1]
+    bdx, bdy = b[0] - d[0], b[1] - d[1]
+    cdx, cdy = c[0] - d[0], c[1] - d[1]
+    return ((adx * adx + ady * ady) * (bdx * cdy - cdx * bdy) -
+            (bdx * bdx + bdy * bdy) * (adx * cdy - cdx * ady) +
+            (cdx * cdx + cdy * cdy) * (adx * bdy - bdx * ady)) > 0
+
+
+# voronoi
+###############################
+
+# the cells are clipped by the bounding box of the points, which gets
+# bigger by the buffer values (percent of the width and height)
+# returns a list of (x, y) tuples and a list of cells with indices into it
+def computeVoronoiCells(points, bufferX = 0, bufferY = 0):
+    points = [(point[0], point[1]) for point in points]
+    triangles = computeDelaunayTriangles(points)
+    box = getClipBox(points, bufferX, bufferY)
+    scale = max(box[2] - box[0], box[3] - box[1], 1e-9)
+    vertices = []
+    vertexIndices = {}
+
+    def getVertexIndex(vertex):
+        key = (round(vertex[0] / scale, 9), round(vertex[1] / scale, 9))
+        if key not in vertexIndices:
+            vertexIndices[key] = len(vertices)
+            vertices.append(vertex)
+        return vertexIndices[key]
+
+    neighbors = [set() for point in points]
+    adjacentTriangles = [[] for point in points]
+    circumcenterIndices = []
+    for triangleIndex, (a, b, c) in enumerate(triangles):
+        neighbors[a].update((b, c))
+        neighbors[b].update((a, c))
+        neighbors[c].update((a, b))
+        for index in (a, b, c): adjacentTriangles[index].append(triangleIndex)
+        center = getCircumcenter(points[a], points[b], points[c])
+        if box[0] <= center[0] <= box[2] and box[1] <= center[1] <= box[3]:
+            circumcenterIndices.append(getVertexIndex(center))
+        else: circumcenterIndices.append(-1)
+
+    cells = []
+    for index, point in enumerate(points):
+        triangleIndices = adjacentTriangles[index]
+        if len(triangleIndices) == 0: continue
+        # the cell of an inner site is the polygon of the circumcenters around it
+        isInner = len(triangleIndices) == len(neighbors[index])
+        if isInner and all(circumcenterIndices[triangle] != -1 for triangle in triangleIndices):
+            polygon = [vertices[circumcenterIndices[triangle]] for triangle in triangleIndices]
+            order = sorted(range(len(polygon)), key = lambda i: atan2(polygon[i][1] - point[1], polygon[i][0] - point[0]))
+            cell = [circumcenterIndices[triangleIndices[i]] for i in order]
+        else:
+            polygon = [(box[0], box[1]), (box[2], box[1]), (box[2], box[3]), (box[0], box[3])]
+            for neighbor in neighbors[index]:
+                polygon = clipPolygonByBisector(polygon, point, points[neighbor])
+            cell = [getVertexIndex(vertex) for vertex in polygon]
+        cell = [vertexIndex for i, vertexIndex in enumerate(cell) if vertexIndex not in cell[:i]]
+        if len(cell) >= 3: cells.append(cell)
+    return vertices, cells
+
+def getCircumcenter(a, b, c):
+    bx, by = b[0] - a[0], b[1] - a[1]
+    cx, cy = c[0] - a[0], c[1] - a[1]
+    d = 2 * (bx * cy - by * cx)
+    lengthB, lengthC = bx * bx + by * by, cx * cx + cy * cy
+    return (a[0] + (cy * lengthB - by * lengthC) / d, a[1] + (bx * lengthC - cx * lengthB) / d)
+
+def getClipBox(points, bufferX, bufferY):
+    xs = [point[0] for point in points]
+    ys = [point[1] for point in points]
+    minX, maxX, minY, maxY = min(xs), max(xs), min(ys), max(ys)
+    width, height = maxX - minX, maxY - minY
+    return (minX - width * bufferX / 100, minY - height * bufferY / 100,
+            maxX + width * bufferX / 100, maxY + height * bufferY / 100)
+
+# keeps the part of the convex polygon that is closer to the site than to the other point
+def clipPolygonByBisector(polygon, site, other):
+    normalX, normalY = other[0] - site[0], other[1] - site[1]
+    limit = (normalX * (site[0] + other[0]) + normalY * (site[1] + other[1])) / 2
+    distances = [normalX * x + normalY * y - limit for x, y in polygon]
+    clipped = []
+    for i, vertex in enumerate(polygon):
+        nextIndex = (i + 1) % len(polygon)
+        distance, nextDistance = distances[i], distances[nextIndex]
+        if distance <= 0: clipped.append(vertex)
+        if (distance < 0 < nextDistance) or (nextDistance < 0 < distance):
+            factor = distance / (distance - nextDistance)
+            nextVertex = polygon[nextIndex]
+            clipped.append((vertex[0] + (nextVertex[0] - vertex[0]) * factor,
+                            vertex[1] + (nextVertex[1] - vertex[1]) * factor))
+    return clipped
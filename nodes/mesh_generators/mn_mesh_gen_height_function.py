@@ -4,6 +4,7 @@ import mathutils
 from ... mn_node_base import AnimationNode
 from ... mn_execution import nodePropertyChanged, allowCompiling, forbidCompiling
 
+from ... utils.mn_expression_utils import getExpression
 from . import Surfaces
 
 # utility properties & functions
@@ -49,8 +50,7 @@ class mn_MeshGenerationHeightFunctionNode(Node, AnimationNode):
                 "Polygon Indices" : "polygons"}
 
     def canExecute(self, equation, resXR, resYA, startXR, endXR, startYA, endYA):
-        try: self.expr_args = (compile(equation, __file__, 'eval'), {"__builtins__": None}, Surfaces.safe_dict)
-        except: return False
+        if getExpression(equation, self.getArgumentNames()) is None: return False
         
         if resXR < 2: return False
         if resYA < 2: return False
@@ -60,6 +60,10 @@ class mn_MeshGenerationHeightFunctionNode(Node, AnimationNode):
             
         return True
 
+    def getArgumentNames(self):
+        if self.coordinates == "Polar": return ["r", "a"]
+        return ["x", "y"]
+
     def execute(self, equation, resXR, resYA, startXR, endXR, startYA, endYA):
         vertices = []
         polygons = []
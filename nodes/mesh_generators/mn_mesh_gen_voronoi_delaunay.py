@@ -5,10 +5,13 @@ from ... mn_node_base import AnimationNode
 from ... mn_execution import nodePropertyChanged, nodeTreeChanged, allowCompiling, forbidCompiling
 
 from . import Surfaces
-from . import DelaunayVoronoi
+from . import Triangulation
 
 defaultBuffer = 0.0
 
+# the messages are not stored in a property, because changing it during the execution would update the tree
+errorMessages = {}
+
 class mn_MeshGenerationVoronoiDelaunayNode(Node, AnimationNode):
     bl_idname = "mn_MeshGenerationVoronoiDelaunayNode"
     bl_label = "Generate Voronoi/Delaunay"
@@ -27,6 +30,9 @@ class mn_MeshGenerationVoronoiDelaunayNode(Node, AnimationNode):
         
     def draw_buttons(self, context, layout):
         layout.prop(self, "mode")
+        errorMessage = errorMessages.get((self.id_data.name, self.name), "")
+        if errorMessage != "":
+            layout.label(errorMessage, icon = "ERROR")
 
     def init(self, context):
         forbidCompiling()
@@ -54,6 +60,7 @@ class mn_MeshGenerationVoronoiDelaunayNode(Node, AnimationNode):
     def execute(self, worldLocations, bufferX, bufferY):
         vertices = []
         polygons = []
+        errorMessages.pop((self.id_data.name, self.name), None)
         if not self.canExecute(worldLocations, bufferX, bufferY):
             return vertices, polygons
 
@@ -63,10 +70,10 @@ class mn_MeshGenerationVoronoiDelaunayNode(Node, AnimationNode):
                 if bufferY < 0.0: bufferY = 0.0
                 voronoiSurface = Surfaces.VoronoiSurface(worldLocations, bufferX, bufferY)
                 vertices, polygons = voronoiSurface.Calculate()
-                return vertices, polygons
             if self.mode == "Delaunay":
-                polygons = DelaunayVoronoi.computeDelaunayTriangulation(worldLocations)
-                return worldLocations, polygons
-        except: pass
+                polygons = Triangulation.computeDelaunayTriangles(worldLocations)
+                vertices = worldLocations
+        except Triangulation.TriangulationError as e:
+            errorMessages[(self.id_data.name, self.name)] = str(e)
 
         return vertices, polygons
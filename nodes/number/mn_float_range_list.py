@@ -1,6 +1,7 @@
 import bpy
 from bpy.types import Node
 from ... mn_node_base import AnimationNode
+from ... utils.mn_batch_math import floatRange
 from ... mn_execution import nodePropertyChanged, allowCompiling, forbidCompiling
 
 class mn_FloatRangeListNode(Node, AnimationNode):
@@ -23,7 +24,4 @@ class mn_FloatRangeListNode(Node, AnimationNode):
         return {"List" : "list"}
         
     def execute(self, amount, start, step):
-        list = []
-        for i in range(amount):
-            list.append(start + i * step)
-        return list
+        return floatRange(amount, start, step)
@@ -1,6 +1,7 @@
 import bpy, random
 from bpy.types import Node
 from ... mn_cache import getUniformRandom
+from ... utils.mn_batch_math import uniformRandom
 from ... mn_node_base import AnimationNode
 from ... mn_execution import nodePropertyChanged, allowCompiling, forbidCompiling
 
@@ -30,6 +31,9 @@ class mn_RandomNumberNode(Node, AnimationNode):
     def execute(self, seed, minValue, maxValue):
         return getUniformRandom(seed + 1193 * self.additionalSeed, minValue, maxValue)
         
+    def executeBatch(self, seed, minValue, maxValue):
+        return uniformRandom(seed, minValue, maxValue, seedOffset = 1193 * self.additionalSeed)
+        
     def copy(self, node):
         self.additionalSeed = int(random.random()*1000)
         
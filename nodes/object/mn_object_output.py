@@ -6,6 +6,7 @@ from ... mn_execution import nodePropertyChanged, nodeTreeChanged, allowCompilin
 class mn_ObjectTransformsOutput(Node, AnimationNode):
     bl_idname = "mn_ObjectTransformsOutput"
     bl_label = "Transforms Output"
+    readOnlyInputs = ["Location", "Rotation", "Scale"]
     
     def checkedPropertiesChanged(self, context):
         self.updateSocketVisibility()
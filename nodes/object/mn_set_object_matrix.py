@@ -11,6 +11,7 @@ outputItems = [	("BASIS", "Basis", ""),
 class mn_ObjectMatrixOutputNode(Node, AnimationNode):
     bl_idname = "mn_ObjectMatrixOutputNode"
     bl_label = "Object Matrix Output"
+    readOnlyInputs = ["Matrix"]
     
     outputType = bpy.props.EnumProperty(items = outputItems, update = nodeTreeChanged, default = "WORLD")
     
@@ -4,6 +4,7 @@ from ... mn_node_base import AnimationNode
 from ... mn_execution import nodePropertyChanged, nodeTreeChanged, allowCompiling, forbidCompiling
 from ... mn_utils import *
 from ... utils.mn_fcurve_utils import *
+from ... utils.mn_sound_utils import canBakeSpectrum, bakeSpectrum, getSpectrumFilePath, spectrumFileExists, loadSpectrum, getSpectrumAtFrame
 from ... nodes.mn_node_helper import *
 from ... mn_cache import *
 
@@ -13,6 +14,8 @@ class mn_BakedSoundPropertyGroup(bpy.types.PropertyGroup):
     path = bpy.props.StringProperty(name = "Path", default = "")
     propertyName = bpy.props.StringProperty(name = "Property Path", default = "")
 
+soundCombinations = [(0, 50), (50, 150), (150, 300), (300, 500), (500, 1000), (1000, 2000), (2000, 4000), (4000, 10000), (10000, 20000)]
+
 class mn_SoundBakeNode(Node, AnimationNode):
     bl_idname = "mn_SoundBakeNode"
     bl_label = "Sound Bake"
@@ -20,6 +23,7 @@ class mn_SoundBakeNode(Node, AnimationNode):
     bakedSound = bpy.props.CollectionProperty(type = mn_BakedSoundPropertyGroup)
     soundObjectName = bpy.props.StringProperty()
     filePath = bpy.props.StringProperty()
+    spectrumPath = bpy.props.StringProperty()
     setSyncMode = bpy.props.BoolProperty(name = "Set Audio Sync Mode", default = True)
     
     def init(self, context):
@@ -45,12 +49,20 @@ class mn_SoundBakeNode(Node, AnimationNode):
         loadSound = row.operator("mn.set_sound_in_sequence_editor", "Load Sound")
         loadSound.filePath = self.filePath
         
+        if self.spectrumPath != "" and not spectrumFileExists(self.spectrumPath):
+            layout.label("Missing spectrum: " + self.spectrumPath, icon = "ERROR")
+        
         layout.separator()
         
     def draw_buttons_ext(self, context, layout):
         layout.prop(self, "setSyncMode")
         
     def getStrengthList(self, frame):
+        if self.spectrumPath != "":
+            spectrum = loadSpectrum(self.spectrumPath)
+            if spectrum is None: return [0.0] * len(self.bakedSound)
+            return getSpectrumAtFrame(spectrum, frame)
+        
         identifier = self.id_data.name + self.name
         nodeCache = getLongTimeCache(identifier)
         intFrame = math.floor(max(frame, 0))
@@ -109,15 +121,9 @@ class mn_SoundBakeNode(Node, AnimationNode):
         scene.frame_current = 1
         soundObject = self.getSoundObject()
         self.removeSoundCurves(soundObject)
-        soundCombinations = [(0, 50), (50, 150), (150, 300), (300, 500), (500, 1000), (1000, 2000), (2000, 4000), (4000, 10000), (10000, 20000)]
-        wm = bpy.context.window_manager
-        wm.progress_begin(0.0, len(soundCombinations) - 1.0)
-        wm.progress_update(0.0)
-        for index, (low, high) in enumerate(soundCombinations):
-            self.bakeIndividualSound(soundObject, self.filePath, low, high)
-            wm.progress_update(index + 1.0)
-        wm.progress_end()
         soundObject.hide = True
+        if canBakeSpectrum(): self.bakeSpectrum()
+        else: self.bakeSoundCurves(soundObject)
         self.name = re.sub(r"\W+", "", os.path.basename(self.filePath))
         loadSound(self.filePath)
         if self.setSyncMode:
@@ -126,6 +132,29 @@ class mn_SoundBakeNode(Node, AnimationNode):
         allowCompiling()
         nodeTreeChanged()
         
+    # all bands are calculated in one pass over the decoded sound and stored in a file next to the saved .blend
+    def bakeSpectrum(self):
+        self.spectrumPath = getSpectrumFilePath(self.id_data.name + " " + self.name)
+        fps = bpy.context.scene.render.fps / bpy.context.scene.render.fps_base
+        bakeSpectrum(bpy.path.abspath(self.filePath), self.spectrumPath, fps, soundCombinations)
+        for low, high in soundCombinations:
+            item = self.bakedSound.add()
+            item.low = low
+            item.high = high
+            item.path = self.filePath
+        self.clearCache()
+        
+    def bakeSoundCurves(self, soundObject):
+        self.spectrumPath = ""
+        wm = bpy.context.window_manager
+        wm.progress_begin(0.0, len(soundCombinations) - 1.0)
+        wm.progress_update(0.0)
+        for index, (low, high) in enumerate(soundCombinations):
+            self.bakeIndividualSound(soundObject, self.filePath, low, high)
+            wm.progress_update(index + 1.0)
+        wm.progress_end()
+        soundObject.hide = True
+        
     def getSoundObject(self):
         soundObject = bpy.data.objects.get(self.soundObjectName)
         if soundObject is None:
@@ -171,6 +200,7 @@ class mn_SoundBakeNode(Node, AnimationNode):
         
     def copy(self, node):
         self.soundObjectName = ""
+        self.spectrumPath = ""
         self.bakedSound.clear()
         
     def free(self):
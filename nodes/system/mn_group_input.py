@@ -18,8 +18,13 @@ class mn_GroupInput(Node, AnimationNode):
             self.groupName = self.getNotUsedGroupName(prefix = self.groupName)
             self.nameIsChanging = False
     
+    def cacheSettingsChanged(self, context):
+        nodeTreeChanged()
+    
     groupName = bpy.props.StringProperty(default = "Group", update = groupNameChanged)
     nameIsChanging = bpy.props.BoolProperty(default = False)
+    cacheResults = bpy.props.BoolProperty(name = "Cache Results", default = False, update = cacheSettingsChanged, description = "Reuse the outputs of earlier calls with the same inputs (only when the group has no side effects)")
+    cacheSize = bpy.props.IntProperty(name = "Cache Size", default = 1000, min = 1, update = cacheSettingsChanged, description = "Maximal amount of remembered results")
     
     def init(self, context):
         forbidCompiling()
@@ -37,6 +42,10 @@ class mn_GroupInput(Node, AnimationNode):
         row = layout.row(align = True)
         row.prop(self, "groupName", text = "")
         
+    def draw_buttons_ext(self, context, layout):
+        layout.prop(self, "cacheResults")
+        if self.cacheResults: layout.prop(self, "cacheSize")
+        
     def update(self):
         forbidCompiling()
         socket = self.outputs.get(newInputSocketName)
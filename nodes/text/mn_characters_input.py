@@ -6,6 +6,7 @@ from ... mn_execution import nodePropertyChanged, allowCompiling, forbidCompilin
 class mn_CharactersNode(Node, AnimationNode):
     bl_idname = "mn_CharactersNode"
     bl_label = "Characters"
+    isDetermined = True
     
     def init(self, context):
         forbidCompiling()
@@ -9,6 +9,7 @@ from ... utils.mn_node_utils import *
 class mn_CombineStringsNode(Node, AnimationNode):
     bl_idname = "mn_CombineStringsNode"
     bl_label = "Combine Texts"
+    isDetermined = True
     
     def init(self, context):
         forbidCompiling()
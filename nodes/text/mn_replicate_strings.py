@@ -6,6 +6,7 @@ from ... mn_execution import nodePropertyChanged, allowCompiling, forbidCompilin
 class mn_ReplicateStringsNode(Node, AnimationNode):
     bl_idname = "mn_ReplicateStringsNode"
     bl_label = "Replicate Text"
+    isDetermined = True
     
     def init(self, context):
         forbidCompiling()
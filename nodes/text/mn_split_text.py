@@ -1,7 +1,7 @@
 import bpy, re
 from bpy.types import Node
 from ... mn_node_base import AnimationNode
-from ... mn_execution import nodeTreeChanged, allowCompiling, forbidCompiling
+from ... mn_execution import nodePropertyChanged, nodeTreeChanged, allowCompiling, forbidCompiling
 from ... mn_utils import *
 
 splitTypes = [
@@ -13,12 +13,14 @@ splitTypes = [
 class mn_SplitText(Node, AnimationNode):
     bl_idname = "mn_SplitText"
     bl_label = "Split Text"
+    isDetermined = True
     
     def splitTypeChanges(self, context):
         self.setHideProperty()
+        nodePropertyChanged(self, context)
     
     splitType = bpy.props.EnumProperty(name = "Split Type", default = "Regexp", items = splitTypes, update = splitTypeChanges)
-    keepDelimiters = bpy.props.BoolProperty(default = False)
+    keepDelimiters = bpy.props.BoolProperty(default = False, update = nodePropertyChanged)
     
     def init(self, context):
         forbidCompiling()
@@ -6,6 +6,7 @@ from ... mn_execution import nodePropertyChanged, allowCompiling, forbidCompilin
 class mn_StringAnalyzeNode(Node, AnimationNode):
     bl_idname = "mn_StringAnalyzeNode"
     bl_label = "Text Analyze"
+    isDetermined = True
     
     def init(self, context):
         forbidCompiling()
@@ -6,6 +6,7 @@ from ... mn_execution import nodePropertyChanged, allowCompiling, forbidCompilin
 class mn_StringInputNode(Node, AnimationNode):
     bl_idname = "mn_StringInputNode"
     bl_label = "Text Input"
+    isDetermined = True
     
     def init(self, context):
         forbidCompiling()
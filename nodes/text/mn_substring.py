@@ -6,6 +6,7 @@ from ... mn_execution import nodePropertyChanged, allowCompiling, forbidCompilin
 class mn_SubstringNode(Node, AnimationNode):
     bl_idname = "mn_SubstringNode"
     bl_label = "Trim Text"
+    isDetermined = True
     
     ignoreLength =  bpy.props.BoolProperty(default = False, update = nodePropertyChanged)
     
@@ -2,11 +2,13 @@ import bpy
 import mathutils
 from bpy.types import Node
 from ... mn_node_base import AnimationNode
+from ... utils.mn_batch_math import combineVectors
 from ... mn_execution import nodePropertyChanged, nodeTreeChanged, allowCompiling, forbidCompiling
 
 class mn_CombineVectorList(Node, AnimationNode):
     bl_idname = "mn_CombineVectorList"
     bl_label = "Combine Vector List"
+    readOnlyInputs = ["List X", "List Y", "List Z"]
     
     def init(self, context):
         forbidCompiling()
@@ -31,14 +33,8 @@ class mn_CombineVectorList(Node, AnimationNode):
         return True
 
     def execute(self, listX, listY, listZ):
-        vectorList = []
         if not self.canExecute(listX, listY, listZ):
-            return vectorList
+            return []
             
-        try:
-            lenLists = len(listX)
-            for iLists in range(lenLists):
-                vectorList.append(mathutils.Vector((listX[iLists], listY[iLists], listZ[iLists])))
-        except: pass
-        
-        return vectorList
+        try: return combineVectors(listX, listY, listZ)
+        except: return []
@@ -9,6 +9,7 @@ items = [("X", "X", ""), ("Y", "Y", ""), ("Z", "Z", "")]
 class mn_DirectionToRotation(Node, AnimationNode):
     bl_idname = "mn_DirectionToRotation"
     bl_label = "Direction to Rotation"
+    isDetermined = True
     
     trackAxis = bpy.props.EnumProperty(items = items, update = nodeTreeChanged, default = "Z")
     upAxis = bpy.props.EnumProperty(items = items, update = nodeTreeChanged, default = "X")
@@ -1,6 +1,7 @@
 import bpy, random
 from bpy.types import Node
 from ... mn_cache import getUniformRandom
+from ... utils.mn_batch_math import uniformRandom, combineVectors
 from ... mn_node_base import AnimationNode
 from ... mn_execution import nodePropertyChanged, allowCompiling, forbidCompiling
 from mathutils import Vector
@@ -34,6 +35,14 @@ class mn_RandomVectorNode(Node, AnimationNode):
                 getUniformRandom(seed + 754 + addSeed, -max, max),
                 getUniformRandom(seed + 2345 + addSeed, -max, max)))
                 
+    def executeBatch(self, seed, maxValues):
+        maxList = [value / 2 for value in maxValues]
+        minList = [-value for value in maxList]
+        addSeed = 1193 * self.additionalSeed
+        return combineVectors(uniformRandom(seed, minList, maxList, seedOffset = addSeed),
+                uniformRandom(seed, minList, maxList, seedOffset = 754 + addSeed),
+                uniformRandom(seed, minList, maxList, seedOffset = 2345 + addSeed))
+                
     def copy(self, node):
         self.additionalSeed = int(random.random()*1000)
         
@@ -7,6 +7,7 @@ class mn_SeparateVector(Node, AnimationNode):
     bl_idname = "mn_SeparateVector"
     bl_label = "Separate Vector"
     isDetermined = True
+    readOnlyInputs = ["Vector"]
     
     def init(self, context):
         forbidCompiling()
@@ -2,11 +2,13 @@ import bpy
 import mathutils
 from bpy.types import Node
 from ... mn_node_base import AnimationNode
+from ... utils.mn_batch_math import separateVectors
 from ... mn_execution import nodePropertyChanged, nodeTreeChanged, allowCompiling, forbidCompiling
 
 class mn_SeparateVectorList(Node, AnimationNode):
     bl_idname = "mn_SeparateVectorList"
     bl_label = "Separate Vector List"
+    readOnlyInputs = ["Vector List"]
     
     def init(self, context):
         forbidCompiling()
@@ -25,17 +27,5 @@ class mn_SeparateVectorList(Node, AnimationNode):
                 "List Z" : "listZ"}
 
     def execute(self, vectorList):
-        listX = []
-        listY = []
-        listZ = []
-            
-        try:
-            lenList = len(vectorList)
-            for iList in range(lenList):
-                v = vectorList[iList]
-                listX.append(v.x)
-                listY.append(v.y)
-                listZ.append(v.z)
-        except: pass
-        
-        return listX, listY, listZ
+        try: return separateVectors(vectorList)
+        except: return [], [], []
@@ -7,6 +7,7 @@ class mn_TransfromVector(Node, AnimationNode):
     bl_idname = "mn_TransfromVector"
     bl_label = "Transform Vector"
     isDetermined = True
+    readOnlyInputs = ["Vector", "Matrix"]
     
     def init(self, context):
         forbidCompiling()
@@ -8,6 +8,7 @@ class mn_VectorDistanceNode(Node, AnimationNode):
     bl_idname = "mn_VectorDistanceNode"
     bl_label = "Vector Distance"
     isDetermined = True
+    readOnlyInputs = ["A", "B"]
     
     def init(self, context):
         forbidCompiling()
@@ -6,6 +6,7 @@ from ... mn_execution import nodePropertyChanged, nodeTreeChanged, allowCompilin
 class mn_VectorFromValue(Node, AnimationNode):
     bl_idname = "mn_VectorFromValue"
     bl_label = "Vector from Value"
+    isDetermined = True
     node_category = "Math"
     
     def init(self, context):
@@ -8,6 +8,7 @@ class mn_VectorLengthNode(Node, AnimationNode):
     bl_idname = "mn_VectorLengthNode"
     bl_label = "Vector Length"
     isDetermined = True
+    readOnlyInputs = ["Vector"]
     
     def init(self, context):
         forbidCompiling()
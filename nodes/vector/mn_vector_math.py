@@ -12,6 +12,7 @@ class mn_VectorMathNode(Node, AnimationNode):
     bl_idname = "mn_VectorMathNode"
     bl_label = "Vector Math"
     isDetermined = True
+    readOnlyInputs = ["A", "B"]
     
     mathTypes = [
         ("ADD", "Add", ""),
@@ -0,0 +1,137 @@
+import math
+from mathutils import Vector
+from .. mn_cache import randomNumberCache, randomNumberCacheSize
+
+try: import numpy
+except ImportError: numpy = None
+
+# every operation has a per element implementation and one that works on whole numpy arrays,
+# the arrays only pay off when the lists are long enough to hide the conversion
+
+minimalBatchLength = 100
+
+def useBatch(list):
+    return numpy is not None and len(list) >= minimalBatchLength
+
+
+# 2D coordinates
+################################
+
+def cartesianToPolar(listX, listY):
+    if useBatch(listX): return cartesianToPolarBatched(listX, listY)
+    return cartesianToPolarPerElement(listX, listY)
+
+def cartesianToPolarPerElement(listX, listY):
+    listRadius = [math.sqrt(x*x + y*y) for x, y in zip(listX, listY)]
+    listAzimuth = [math.atan2(y, x) for x, y in zip(listX, listY)]
+    return listRadius, listAzimuth
+
+def cartesianToPolarBatched(listX, listY):
+    x, y = toArrays(listX, listY)
+    return numpy.hypot(x, y).tolist(), numpy.arctan2(y, x).tolist()
+
+
+def polarToCartesian(listRadius, listAzimuth):
+    if useBatch(listRadius): return polarToCartesianBatched(listRadius, listAzimuth)
+    return polarToCartesianPerElement(listRadius, listAzimuth)
+
+def polarToCartesianPerElement(listRadius, listAzimuth):
+    listX = [math.cos(azimuth) * radius for radius, azimuth in zip(listRadius, listAzimuth)]
+    listY = [math.sin(azimuth) * radius for radius, azimuth in zip(listRadius, listAzimuth)]
+    return listX, listY
+
+def polarToCartesianBatched(listRadius, listAzimuth):
+    radius, azimuth = toArrays(listRadius, listAzimuth)
+    return (numpy.cos(azimuth) * radius).tolist(), (numpy.sin(azimuth) * radius).tolist()
+
+
+# 3D coordinates
+################################
+
+# the elevation of the origin is 0
+def cartesianToSpherical(listX, listY, listZ):
+    if useBatch(listX): return cartesianToSphericalBatched(listX, listY, listZ)
+    return cartesianToSphericalPerElement(listX, listY, listZ)
+
+def cartesianToSphericalPerElement(listX, listY, listZ):
+    listRadius = [math.sqrt(x*x + y*y + z*z) for x, y, z in zip(listX, listY, listZ)]
+    listAzimuth = [math.atan2(y, x) for x, y in zip(listX, listY)]
+    listElevation = [math.asin(z / radius) if radius != 0 else 0.0 for z, radius in zip(listZ, listRadius)]
+    return listRadius, listAzimuth, listElevation
+
+def cartesianToSphericalBatched(listX, listY, listZ):
+    x, y, z = toArrays(listX, listY, listZ)
+    radius = numpy.sqrt(x*x + y*y + z*z)
+    with numpy.errstate(divide = "ignore", invalid = "ignore"):
+        elevation = numpy.where(radius != 0, numpy.arcsin(z / radius), 0.0)
+    return radius.tolist(), numpy.arctan2(y, x).tolist(), elevation.tolist()
+
+
+def sphericalToCartesian(listRadius, listAzimuth, listElevation):
+    if useBatch(listRadius): return sphericalToCartesianBatched(listRadius, listAzimuth, listElevation)
+    return sphericalToCartesianPerElement(listRadius, listAzimuth, listElevation)
+
+def sphericalToCartesianPerElement(listRadius, listAzimuth, listElevation):
+    listX, listY, listZ = [], [], []
+    for radius, azimuth, elevation in zip(listRadius, listAzimuth, listElevation):
+        cosElevation = math.cos(elevation)
+        listX.append(radius * cosElevation * math.cos(azimuth))
+        listY.append(radius * cosElevation * math.sin(azimuth))
+        listZ.append(radius * math.sin(elevation))
+    return listX, listY, listZ
+
+def sphericalToCartesianBatched(listRadius, listAzimuth, listElevation):
+    radius, azimuth, elevation = toArrays(listRadius, listAzimuth, listElevation)
+    radiusXY = radius * numpy.cos(elevation)
+    return (radiusXY * numpy.cos(azimuth)).tolist(), (radiusXY * numpy.sin(azimuth)).tolist(), (radius * numpy.sin(elevation)).tolist()
+
+
+# cylindrical coordinates only convert x and y like polar coordinates,
+# z is copied, because the nodes don't get their own copy of the read-only input
+def cartesianToCylindrical(listX, listY, listZ):
+    return cartesianToPolar(listX, listY) + (list(listZ), )
+
+def cylindricalToCartesian(listRadius, listAzimuth, listZ):
+    return polarToCartesian(listRadius, listAzimuth) + (list(listZ), )
+
+
+# vectors and ranges
+################################
+
+def combineVectors(listX, listY, listZ):
+    return list(map(Vector, zip(listX, listY, listZ)))
+
+def separateVectors(vectorList):
+    if len(vectorList) == 0: return [], [], []
+    listX, listY, listZ = map(list, zip(*vectorList))
+    return listX, listY, listZ
+
+def floatRange(amount, start, step):
+    if numpy is not None and amount >= minimalBatchLength:
+        return (start + numpy.arange(amount, dtype = float) * step).tolist()
+    return [start + i * step for i in range(amount)]
+
+
+# random numbers
+################################
+
+# the same values as getUniformRandom for every seed + seedOffset
+def uniformRandom(seeds, listMin, listMax, seedOffset = 0):
+    if useBatch(seeds): return uniformRandomBatched(seeds, listMin, listMax, seedOffset)
+    return uniformRandomPerElement(seeds, listMin, listMax, seedOffset)
+
+def uniformRandomPerElement(seeds, listMin, listMax, seedOffset):
+    return [min + randomNumberCache[(seed + seedOffset) % randomNumberCacheSize] * (max - min) for seed, min, max in zip(seeds, listMin, listMax)]
+
+randomNumberArray = None
+def uniformRandomBatched(seeds, listMin, listMax, seedOffset):
+    global randomNumberArray
+    if randomNumberArray is None: randomNumberArray = numpy.array(randomNumberCache)
+    length = min(len(seeds), len(listMin), len(listMax))
+    indices = (numpy.array(seeds[:length], dtype = numpy.int64) + seedOffset) % randomNumberCacheSize
+    minValues, maxValues = toArrays(listMin[:length], listMax[:length])
+    return (minValues + randomNumberArray[indices] * (maxValues - minValues)).tolist()
+
+
+def toArrays(*lists):
+    return tuple(numpy.array(list, dtype = float) for list in lists)
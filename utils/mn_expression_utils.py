@@ -0,0 +1,101 @@
+import ast, math
+from itertools import product
+
+try: import numpy
+except ImportError: numpy = None
+
+# math functions which can be used in expressions
+mathNames = ['math', 'acos', 'asin', 'atan', 'atan2', 'ceil', 'cos', 'cosh',
+             'degrees', 'e', 'exp', 'fabs', 'floor', 'fmod', 'frexp', 'hypot',
+             'ldexp', 'log', 'log10', 'modf', 'pi', 'pow', 'radians',
+             'sin', 'sinh', 'sqrt', 'tan', 'tanh']
+mathNamespace = dict((name, getattr(math, name)) for name in mathNames if name != "math")
+mathNamespace["math"] = math
+mathNamespace["__builtins__"] = None
+
+# numpy functions behaving like the math functions with the same name
+numpyNames = { 'acos' : 'arccos', 'asin' : 'arcsin', 'atan' : 'arctan', 'atan2' : 'arctan2',
+               'ceil' : 'ceil', 'cos' : 'cos', 'cosh' : 'cosh', 'degrees' : 'degrees', 'e' : 'e',
+               'exp' : 'exp', 'fabs' : 'fabs', 'floor' : 'floor', 'fmod' : 'fmod', 'hypot' : 'hypot',
+               'log10' : 'log10', 'pi' : 'pi', 'pow' : 'power', 'radians' : 'radians',
+               'sin' : 'sin', 'sinh' : 'sinh', 'sqrt' : 'sqrt', 'tan' : 'tan', 'tanh' : 'tanh' }
+if numpy is not None:
+    numpyNamespace = dict((name, getattr(numpy, numpyName)) for name, numpyName in numpyNames.items())
+    numpyNamespace["__builtins__"] = None
+
+
+class ExpressionError(Exception):
+    pass
+
+# an expression is parsed and validated once and then used like a normal function,
+# arrays are evaluated in one pass with numpy when it only uses the math functions numpy has as well
+class Expression:
+    def __init__(self, source, argumentNames):
+        self.source = source
+        self.argumentNames = argumentNames
+        tree = ast.parse(source, "<expression>", "eval")
+        usedNames, attributeNames = getUsedNames(tree)
+        # the line break keeps a trailing comment from hiding the closing bracket
+        code = compile("lambda " + ", ".join(argumentNames) + ": (" + source + "\n)", "<expression>", "eval")
+
+        for name in usedNames | attributeNames:
+            if name.startswith("_"): raise ExpressionError("Private names are not allowed: " + name)
+        unknownNames = usedNames - set(mathNames) - set(argumentNames)
+        unknownNames.update("math." + name for name in getMathAttributeNames(tree) if not hasattr(math, name))
+        if len(unknownNames) > 0:
+            raise ExpressionError("Unknown names: " + ", ".join(sorted(unknownNames)))
+
+        self.function = eval(code, mathNamespace)
+        self.numpyFunction = None
+        if numpy is not None and usedNames.issubset(set(numpyNames) | set(argumentNames)):
+            self.numpyFunction = eval(code, numpyNamespace)
+
+    def evaluate(self, *arguments):
+        return float(self.function(*arguments))
+
+    # the first argument list changes slowest, like in nested loops
+    def evaluateGrid(self, *argumentLists):
+        if self.numpyFunction is not None:
+            samples = self.evaluateGridWithNumpy(argumentLists)
+            if samples is not None: return samples
+        function = self.function
+        return [float(function(*arguments)) for arguments in product(*argumentLists)]
+
+    # returns None when the result differs from the per sample evaluation, then
+    # that one is used to get the same errors (e.g. division by zero) as before
+    def evaluateGridWithNumpy(self, argumentLists):
+        arrays = [numpy.array(arguments, dtype = float) for arguments in argumentLists]
+        grids = numpy.meshgrid(*arrays, indexing = "ij")
+        try:
+            with numpy.errstate(all = "ignore"):
+                result = numpy.asarray(self.numpyFunction(*grids), dtype = float)
+        except: return None
+        if not numpy.all(numpy.isfinite(result)): return None
+        return numpy.broadcast_to(result, grids[0].shape).ravel().tolist()
+
+# attribute names (e.g. u.real) are not looked up in the namespace
+def getUsedNames(tree):
+    names = set(node.id for node in ast.walk(tree) if isinstance(node, ast.Name))
+    attributeNames = set(node.attr for node in ast.walk(tree) if isinstance(node, ast.Attribute))
+    return names, attributeNames
+
+# e.g. sin in math.sin
+def getMathAttributeNames(tree):
+    return set(node.attr for node in ast.walk(tree) if isinstance(node, ast.Attribute)
+               and isinstance(node.value, ast.Name) and node.value.id == "math")
+
+
+# cache
+################################
+
+expressionCache = {}
+maxCachedExpressions = 200
+
+# returns None when the expression is invalid
+def getExpression(source, argumentNames):
+    key = (source, tuple(argumentNames))
+    if key not in expressionCache:
+        if len(expressionCache) >= maxCachedExpressions: expressionCache.clear()
+        try: expressionCache[key] = Expression(source, argumentNames)
+        except: expressionCache[key] = None
+    return expressionCache[key]
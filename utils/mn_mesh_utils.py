@@ -0,0 +1,159 @@
+import bpy
+from array import array
+from mathutils import Vector
+from .. mn_cache import getCacheNamespace
+
+# bulk mesh access
+################################
+
+# foreach_get copies the data directly into the array when the types match
+
+def getVertexAttributeArray(mesh, attribute, size = 3):
+    values = array("f", [0.0]) * (len(mesh.vertices) * size)
+    mesh.vertices.foreach_get(attribute, values)
+    return values
+
+def getPolygonAttributeArray(mesh, attribute, size = 1, typeCode = "f"):
+    values = array(typeCode, [0]) * (len(mesh.polygons) * size)
+    mesh.polygons.foreach_get(attribute, values)
+    return values
+
+def getEdgeIndexArray(mesh):
+    indices = array("i", [0]) * (len(mesh.edges) * 2)
+    mesh.edges.foreach_get("vertices", indices)
+    return indices
+
+def getPolygonLoopArrays(mesh):
+    loopStarts = getPolygonAttributeArray(mesh, "loop_start", typeCode = "i")
+    loopTotals = getPolygonAttributeArray(mesh, "loop_total", typeCode = "i")
+    loopVertexIndices = array("i", [0]) * len(mesh.loops)
+    mesh.loops.foreach_get("vertex_index", loopVertexIndices)
+    return loopStarts, loopTotals, loopVertexIndices
+
+# the mesh has to be empty and the indices valid
+def writeMeshArrays(mesh, locationArray, edgeArray, polygonArrays):
+    loopStarts, loopTotals, loopVertexIndices = polygonArrays
+    mesh.vertices.add(len(locationArray) // 3)
+    mesh.vertices.foreach_set("co", locationArray)
+    mesh.edges.add(len(edgeArray) // 2)
+    mesh.edges.foreach_set("vertices", edgeArray)
+    mesh.loops.add(len(loopVertexIndices))
+    mesh.loops.foreach_set("vertex_index", loopVertexIndices)
+    mesh.polygons.add(len(loopStarts))
+    mesh.polygons.foreach_set("loop_start", loopStarts)
+    mesh.polygons.foreach_set("loop_total", loopTotals)
+    mesh.validate()
+    mesh.update(calc_edges = True)
+    
+def hasValidIndices(vertexAmount, *indexArrays):
+    for indices in indexArrays:
+        if len(indices) > 0 and (max(indices) >= vertexAmount or min(indices) < 0): return False
+    return True
+
+
+# topology cache
+################################
+
+# an unchanged topology keeps the same arrays, so that later nodes can
+# recognize it by identity and don't have to convert or compare it again
+meshTopologies = getCacheNamespace("Mesh Topology")
+
+def getMeshTopologyArrays(mesh, identifier):
+    edgeArray = getEdgeIndexArray(mesh)
+    polygonArrays = getPolygonLoopArrays(mesh)
+    topology = meshTopologies.get(identifier)
+    if topology is not None and isSameTopology(topology, edgeArray, polygonArrays):
+        return topology
+    topology = (edgeArray, polygonArrays)
+    meshTopologies.set(identifier, topology)
+    return topology
+    
+def isSameTopology(topology, edgeArray, polygonArrays):
+    if not isSameArray(topology[0], edgeArray): return False
+    return all(isSameArray(a, b) for a, b in zip(topology[1], polygonArrays))
+
+
+# write to objects
+################################
+
+# the topology that was written last into a mesh, to only update the locations when it stays the same,
+# a freed mesh can leave its pointer to a new one, so the entries are identified by name and pointer
+def getMeshKey(mesh):
+    return (mesh.name, mesh.as_pointer())
+def isRemovedMesh(meshKey):
+    mesh = bpy.data.meshes.get(meshKey[0])
+    return mesh is None or mesh.as_pointer() != meshKey[1]
+    
+writtenTopologies = getCacheNamespace("Written Mesh Topology", isStale = isRemovedMesh)
+
+def setMeshArraysOnObject(object, locationArray, edgeArray, polygonArrays):
+    mesh = object.data
+    if hasWrittenTopology(mesh, len(locationArray) // 3, edgeArray, polygonArrays):
+        mesh.vertices.foreach_set("co", locationArray)
+        mesh.update()
+    else:
+        replaceObjectMesh(object, locationArray, edgeArray, polygonArrays)
+        
+def replaceObjectMesh(object, locationArray, edgeArray, polygonArrays):
+    oldMesh = object.data
+    name = oldMesh.name
+    mesh = bpy.data.meshes.new(name)
+    writeMeshArrays(mesh, locationArray, edgeArray, polygonArrays)
+    for material in oldMesh.materials:
+        mesh.materials.append(material)
+    object.data = mesh
+    if oldMesh.users == 0:
+        writtenTopologies.remove(getMeshKey(oldMesh))
+        bpy.data.meshes.remove(oldMesh)
+        mesh.name = name
+    writtenTopologies.set(getMeshKey(mesh), (edgeArray, polygonArrays, getTopologyChecksum(mesh)))
+    
+def hasWrittenTopology(mesh, vertexAmount, edgeArray, polygonArrays):
+    meshKey = getMeshKey(mesh)
+    topology = writtenTopologies.get(meshKey)
+    if topology is None: return False
+    writtenEdgeArray, writtenPolygonArrays, checksum = topology
+    if len(mesh.vertices) != vertexAmount: return False
+    if not isSameTopology((writtenEdgeArray, writtenPolygonArrays), edgeArray, polygonArrays): return False
+    # the mesh could have been changed by someone else, even with the same amount of elements
+    if mesh.is_editmode or getTopologyChecksum(mesh) != checksum:
+        writtenTopologies.remove(meshKey)
+        return False
+    return True
+    
+def getTopologyChecksum(mesh):
+    loopStarts, loopTotals, loopVertexIndices = getPolygonLoopArrays(mesh)
+    return hash((len(mesh.vertices), getEdgeIndexArray(mesh).tobytes(), loopStarts.tobytes(), loopTotals.tobytes(), loopVertexIndices.tobytes()))
+    
+def isSameArray(a, b):
+    return a is b or a == b
+
+
+# array conversion
+################################
+
+def vectorsFromArray(values):
+    return [Vector(values) for values in tuplesFromArray(values, 3)]
+
+def tuplesFromArray(values, size):
+    iterator = iter(values)
+    return list(zip(*[iterator] * size))
+
+def polygonIndicesFromLoopArrays(loopStarts, loopTotals, loopVertexIndices):
+    return [tuple(loopVertexIndices[start:start + total]) for start, total in zip(loopStarts, loopTotals)]
+
+def arrayFromVectors(vectors):
+    return array("f", [value for vector in vectors for value in vector])
+
+def arrayFromTuples(tuples):
+    return array("i", [index for element in tuples for index in element])
+
+def loopArraysFromPolygonIndices(polygons):
+    loopTotals = array("i", [len(polygon) for polygon in polygons])
+    loopStarts = array("i", [0]) * len(polygons)
+    start = 0
+    for i, total in enumerate(loopTotals):
+        loopStarts[i] = start
+        start += total
+    loopVertexIndices = arrayFromTuples(polygons)
+    return loopStarts, loopTotals, loopVertexIndices
@@ -0,0 +1,100 @@
+import bpy, os
+
+try: import aud
+except ImportError: aud = None
+
+try: import numpy
+except ImportError: numpy = None
+
+from .. mn_cache import getCacheNamespace
+
+# a baked spectrum is a (frames, bands) float32 array with the amplitude of each frequency band,
+# the first row belongs to frame 1 where the sound starts in the sequence editor
+
+# the spectrum is stored next to the .blend, so unsaved files can't use it
+def canBakeSpectrum():
+    if bpy.data.filepath == "": return False
+    return aud is not None and numpy is not None and hasattr(aud.Factory, "data")
+
+
+# analysis
+###############################
+
+# the samples are delivered in the specs of the audio device
+def decodeSound(filePath):
+    data = numpy.asarray(aud.Factory(filePath).data(), dtype = numpy.float32)
+    if data.ndim == 2: data = data.mean(axis = 1)
+    return data, aud.device().rate
+
+framesPerChunk = 256
+
+# every frame gets a hann window of two frames length around it, the amplitudes are
+# calculated from the power of the frequencies in each band (sinusoids keep their amplitude)
+def calculateBandAmplitudes(samples, sampleRate, framesPerSecond, bands):
+    samplesPerFrame = sampleRate / framesPerSecond
+    frameAmount = int(len(samples) / samplesPerFrame) + 1
+    windowSize = 1 << int(numpy.ceil(numpy.log2(max(samplesPerFrame * 2, 2))))
+    window = numpy.hanning(windowSize).astype(numpy.float32)
+    normalization = 4.0 / (windowSize * float(numpy.sum(window * window)))
+
+    frequencies = numpy.fft.rfftfreq(windowSize, 1.0 / sampleRate)
+    bandStarts = numpy.searchsorted(frequencies, [low for low, high in bands])
+    bandEnds = numpy.searchsorted(frequencies, [high for low, high in bands])
+
+    padded = numpy.concatenate((numpy.zeros(windowSize // 2, numpy.float32), samples, numpy.zeros(windowSize, numpy.float32)))
+    frameStarts = (numpy.arange(frameAmount) * samplesPerFrame).astype(int)
+    offsets = numpy.arange(windowSize)
+
+    amplitudes = numpy.zeros((frameAmount, len(bands)), dtype = numpy.float32)
+    # chunks keep the windowed copies of the samples small for long sounds
+    for start in range(0, frameAmount, framesPerChunk):
+        starts = frameStarts[start:start + framesPerChunk]
+        power = numpy.abs(numpy.fft.rfft(padded[starts[:, None] + offsets] * window, axis = 1)) ** 2
+        cumulativePower = numpy.concatenate((numpy.zeros((len(starts), 1)), numpy.cumsum(power, axis = 1)), axis = 1)
+        bandPower = cumulativePower[:, bandEnds] - cumulativePower[:, bandStarts]
+        amplitudes[start:start + len(starts)] = numpy.sqrt(bandPower * normalization)
+    return amplitudes
+
+def bakeSpectrum(soundPath, spectrumPath, framesPerSecond, bands):
+    spectrumPath = bpy.path.abspath(spectrumPath)
+    samples, sampleRate = decodeSound(soundPath)
+    amplitudes = calculateBandAmplitudes(samples, sampleRate, framesPerSecond, bands)
+    # a mapped old version would block the file on some systems
+    spectrumCache.remove(spectrumPath)
+    numpy.save(spectrumPath, amplitudes)
+
+
+# access
+###############################
+
+# the baked files are mapped into memory, so that only the used frames are read from disk
+spectrumCache = getCacheNamespace("Sound Spectra")
+
+# the path is relative to the .blend, so that both can be moved together
+def getSpectrumFilePath(name):
+    blendName = bpy.path.display_name_from_filepath(bpy.data.filepath)
+    return bpy.path.relpath(os.path.join(bpy.path.abspath("//"), bpy.path.clean_name(blendName + " " + name) + ".npy"))
+
+def spectrumFileExists(path):
+    return os.path.isfile(bpy.path.abspath(path))
+
+# returns None when there is no baked spectrum
+def loadSpectrum(path):
+    if path == "" or numpy is None: return None
+    path = bpy.path.abspath(path)
+    try: modificationTime = os.path.getmtime(path)
+    except OSError: return None
+    spectrum = spectrumCache.get(path, modificationTime)
+    if spectrum is None:
+        spectrum = numpy.load(path, mmap_mode = "r")
+        spectrumCache.set(path, spectrum, modificationTime)
+    return spectrum
+
+def getSpectrumAtFrame(spectrum, frame):
+    if len(spectrum) == 0: return [0.0] * spectrum.shape[1]
+    position = min(max(frame - 1, 0), len(spectrum) - 1)
+    lower = int(position)
+    upper = min(lower + 1, len(spectrum) - 1)
+    influence = position - lower
+    if influence == 0: return spectrum[lower].tolist()
+    return (spectrum[lower] * (1 - influence) + spectrum[upper] * influence).tolist()